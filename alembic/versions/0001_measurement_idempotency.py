@@ -0,0 +1,87 @@
+"""measurement idempotency
+
+Clave natural (sensor_id, timestamp) en measurements y tabla
+ingestion_requests para la cabecera Idempotency-Key.
+
+Las bases creadas con create_all() ya traen ambos cambios; en bases
+existentes create_all() no altera tablas, así que esta revisión elimina
+los duplicados (se conserva el id más bajo) antes de crear el índice único.
+
+Revision ID: 0001_measurement_idempotency
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_measurement_idempotency'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+UNIQUE_NAME = "uq_measurements_sensor_timestamp"
+
+
+def _unique_names(inspector, table: str) -> set:
+    names = {u["name"] for u in inspector.get_unique_constraints(table)}
+    # MySQL reporta los UNIQUE también como índices
+    names |= {i["name"] for i in inspector.get_indexes(table) if i.get("unique")}
+    return names
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if "measurements" in tables and UNIQUE_NAME not in _unique_names(inspector, "measurements"):
+        # 1. Eliminar duplicados conservando la primera lectura
+        if bind.dialect.name == "mysql":
+            op.execute(
+                "DELETE m1 FROM measurements m1 "
+                "JOIN measurements m2 "
+                "ON m1.sensor_id = m2.sensor_id "
+                "AND m1.timestamp = m2.timestamp "
+                "AND m1.id > m2.id"
+            )
+        else:
+            op.execute(
+                "DELETE FROM measurements WHERE id NOT IN ("
+                "SELECT MIN(id) FROM measurements GROUP BY sensor_id, timestamp)"
+            )
+
+        # 2. Clave natural
+        with op.batch_alter_table("measurements") as batch_op:
+            batch_op.create_unique_constraint(UNIQUE_NAME, ["sensor_id", "timestamp"])
+
+    if "ingestion_requests" not in tables:
+        op.create_table(
+            "ingestion_requests",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("idempotency_key", sa.String(length=100), nullable=False),
+            sa.Column("endpoint", sa.String(length=100), nullable=False),
+            sa.Column("response", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("idempotency_key"),
+        )
+        op.create_index("ix_ingestion_requests_id", "ingestion_requests", ["id"])
+        op.create_index("ix_ingestion_requests_created_at", "ingestion_requests", ["created_at"])
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if "ingestion_requests" in tables:
+        op.drop_table("ingestion_requests")
+
+    if "measurements" in tables and UNIQUE_NAME in _unique_names(inspector, "measurements"):
+        with op.batch_alter_table("measurements") as batch_op:
+            batch_op.drop_constraint(UNIQUE_NAME, type_="unique")
@@ -0,0 +1,59 @@
+"""hot path indexes
+
+Índices compuestos para las consultas más frecuentes. Las lecturas de
+measurements por sensor (últimas N y rangos de tiempo) usan el índice
+único (sensor_id, timestamp) creado en 0001_measurement_idempotency.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_measurement_idempotency
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_path_indexes'
+down_revision = '0001_measurement_idempotency'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("measurements", "ix_measurements_timestamp", ["timestamp"]),
+    ("alerts", "ix_alerts_created_at", ["created_at"]),
+    ("alerts", "ix_alerts_zone_created_at", ["zone_id", "created_at"]),
+    ("notifications", "ix_notifications_user_created_at", ["user_id", "created_at"]),
+    ("notifications", "ix_notifications_user_is_read", ["user_id", "is_read"]),
+    ("automation_logs", "ix_automation_logs_created_at", ["created_at"]),
+    ("automation_rules", "ix_automation_rules_zone_active_priority", ["zone_id", "is_active", "priority"]),
+    ("threshold_configs", "ix_threshold_configs_sensor_active", ["sensor_id", "is_active"]),
+    ("images", "ix_images_camera_captured_at", ["camera_id", "captured_at"]),
+    ("reports", "ix_reports_created_at", ["created_at"]),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set:
+    return {i["name"] for i in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    # Las bases creadas con create_all() ya tienen estos índices
+    for table, name, columns in INDEXES:
+        if table in tables and name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table, name, _ in reversed(INDEXES):
+        if table in tables and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,52 @@
+"""measurement rollups
+
+Tabla measurement_rollups (agregados 1m / 1h / 1d por sensor).
+Tras aplicarla, poblar el histórico con:
+    python -m app.commands.rollups backfill
+
+Revision ID: 0003_measurement_rollups
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_measurement_rollups'
+down_revision = '0002_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    if "measurement_rollups" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "measurement_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sensor_id", sa.Integer(), sa.ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("resolution", sa.String(length=3), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("value_sum", sa.Float(), nullable=False),
+        sa.Column("value_sum_sq", sa.Float(), nullable=False),
+        sa.Column("value_min", sa.Float(), nullable=False),
+        sa.Column("value_max", sa.Float(), nullable=False),
+        sa.Column("value_first", sa.Float(), nullable=False),
+        sa.Column("first_at", sa.DateTime(), nullable=False),
+        sa.Column("value_last", sa.Float(), nullable=False),
+        sa.Column("last_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("sensor_id", "resolution", "bucket_start", name="uq_measurement_rollups_bucket"),
+    )
+    op.create_index("ix_measurement_rollups_id", "measurement_rollups", ["id"])
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    if "measurement_rollups" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("measurement_rollups")
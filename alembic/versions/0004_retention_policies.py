@@ -0,0 +1,56 @@
+"""retention policies
+
+Tabla retention_policies (plazos de conservación de mediciones crudas y
+de cada resolución de measurement_rollups). Se aplican con:
+    python -m app.commands.retention run
+
+Revision ID: 0004_retention_policies
+Revises: 0003_measurement_rollups
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_retention_policies'
+down_revision = '0003_measurement_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    if "retention_policies" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "retention_policies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=150), nullable=False),
+        sa.Column("sensor_type", sa.String(length=100), nullable=True),
+        sa.Column(
+            "zone_id",
+            sa.Integer(),
+            sa.ForeignKey("cultivation_zones.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("raw_retention_days", sa.Integer(), nullable=True),
+        sa.Column("rollup_1m_retention_days", sa.Integer(), nullable=True),
+        sa.Column("rollup_1h_retention_days", sa.Integer(), nullable=True),
+        sa.Column("rollup_1d_retention_days", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("last_run_raw_deleted", sa.Integer(), nullable=True),
+        sa.Column("last_run_rollups_deleted", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_retention_policies_id", "retention_policies", ["id"])
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    if "retention_policies" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("retention_policies")
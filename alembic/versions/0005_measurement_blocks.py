@@ -0,0 +1,48 @@
+"""measurement blocks
+
+Tabla measurement_blocks (lecturas de un sensor por hora comprimidas
+en un BLOB). Tras aplicarla, compactar el histórico con:
+    python -m app.commands.blocks compact
+
+Revision ID: 0005_measurement_blocks
+Revises: 0004_retention_policies
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_measurement_blocks'
+down_revision = '0004_retention_policies'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    if "measurement_blocks" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "measurement_blocks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sensor_id", sa.Integer(), sa.ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("block_start", sa.DateTime(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("first_at", sa.DateTime(), nullable=False),
+        sa.Column("last_at", sa.DateTime(), nullable=False),
+        sa.Column("value_min", sa.Float(), nullable=False),
+        sa.Column("value_max", sa.Float(), nullable=False),
+        sa.Column("data", sa.LargeBinary(length=2**24 - 1), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("sensor_id", "block_start", name="uq_measurement_blocks_sensor_start"),
+    )
+    op.create_index("ix_measurement_blocks_id", "measurement_blocks", ["id"])
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    if "measurement_blocks" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("measurement_blocks")
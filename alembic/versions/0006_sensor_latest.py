@@ -0,0 +1,56 @@
+"""sensor latest
+
+Tabla sensor_latest (última lectura de cada sensor), poblada desde
+measurements con la lectura más reciente de cada sensor.
+
+Revision ID: 0006_sensor_latest
+Revises: 0005_measurement_blocks
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_sensor_latest'
+down_revision = '0005_measurement_blocks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    if "sensor_latest" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "sensor_latest",
+        sa.Column(
+            "sensor_id",
+            sa.Integer(),
+            sa.ForeignKey("sensors.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("unit", sa.String(length=20), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # Una lectura por sensor: (sensor_id, timestamp) es único en measurements
+    op.execute(
+        "INSERT INTO sensor_latest (sensor_id, value, unit, status, timestamp) "
+        "SELECT m.sensor_id, m.value, m.unit, m.status, m.timestamp "
+        "FROM measurements m "
+        "JOIN (SELECT sensor_id, MAX(timestamp) AS newest FROM measurements "
+        "      WHERE timestamp IS NOT NULL GROUP BY sensor_id) latest "
+        "ON latest.sensor_id = m.sensor_id AND latest.newest = m.timestamp"
+    )
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    if "sensor_latest" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("sensor_latest")
@@ -0,0 +1,55 @@
+"""keyset pagination indexes
+
+Índices (created_at, id) para los listados paginados por cursor de las
+tablas que crecen con el número de explotaciones. alerts, reports,
+notifications y automation_logs ya tienen índice sobre created_at
+(InnoDB añade la clave primaria a cada índice secundario).
+
+Revision ID: 0007_keyset_pagination_indexes
+Revises: 0006_sensor_latest
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_keyset_pagination_indexes'
+down_revision = '0006_sensor_latest'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("sensors", "ix_sensors_created_at_id", ["created_at", "id"]),
+    ("devices", "ix_devices_created_at_id", ["created_at", "id"]),
+    ("actuators", "ix_actuators_created_at_id", ["created_at", "id"]),
+    ("cameras", "ix_cameras_created_at_id", ["created_at", "id"]),
+    ("images", "ix_images_created_at_id", ["created_at", "id"]),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set:
+    return {i["name"] for i in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    # Las bases creadas con create_all() ya tienen estos índices
+    for table, name, columns in INDEXES:
+        if table in tables and name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table, name, _ in reversed(INDEXES):
+        if table in tables and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
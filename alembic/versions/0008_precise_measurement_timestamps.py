@@ -0,0 +1,55 @@
+"""precise measurement timestamps
+
+measurements.timestamp y sensor_latest.timestamp con microsegundos en
+MySQL (DATETIME(6)). Hasta esta revisión ambas columnas son DATETIME de
+precisión de segundo: el índice único (sensor_id, timestamp) funde las
+lecturas de más de 1 Hz de un sensor y la deduplicación de la ingesta no
+reconoce los duplicados. Las bases creadas con create_all() ya traen
+DATETIME(6) y se dejan como están. En otros motores no hace nada.
+
+Revision ID: 0008_precise_measurement_timestamps
+Revises: 0007_keyset_pagination_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_precise_measurement_timestamps'
+down_revision = '0007_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+# tabla → DEFAULT de la columna timestamp
+COLUMNS = {
+    "measurements": " DEFAULT CURRENT_TIMESTAMP(6)",
+    "sensor_latest": "",
+}
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        return
+
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+    for table, default in COLUMNS.items():
+        if table not in tables:
+            continue
+        column = next(c for c in inspector.get_columns(table) if c["name"] == "timestamp")
+        if getattr(column["type"], "fsp", None) == 6:
+            continue
+        null = "NULL" if column["nullable"] else "NOT NULL"
+        op.execute(f"ALTER TABLE {table} MODIFY `timestamp` DATETIME(6) {null}{default}")
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    # No se vuelve a DATETIME: truncar a segundos puede violar el índice
+    # único (sensor_id, timestamp) y perdería la precisión guardada.
+    pass
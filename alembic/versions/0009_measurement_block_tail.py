@@ -0,0 +1,42 @@
+"""measurement block tail
+
+Columna measurement_blocks.tail: estado del codificador Gorilla tras el
+último punto del bloque, para añadir lecturas nuevas sin decodificar y
+volver a codificar la hora entera. Los bloques existentes quedan con
+NULL y se completan la primera vez que se fusionan (o con
+python -m app.commands.blocks compact).
+
+Revision ID: 0009_measurement_block_tail
+Revises: 0008_precise_measurement_timestamps
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_measurement_block_tail'
+down_revision = '0008_precise_measurement_timestamps'
+branch_labels = None
+depends_on = None
+
+
+def _columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if "measurement_blocks" not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns("measurement_blocks")}
+
+
+def upgrade() -> None:
+    """Apply the upgrade migrations."""
+    columns = _columns()
+    if columns and "tail" not in columns:
+        op.add_column("measurement_blocks", sa.Column("tail", sa.LargeBinary(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Revert the upgrade migrations."""
+    if "tail" in _columns():
+        op.drop_column("measurement_blocks", "tail")
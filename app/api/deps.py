@@ -1,11 +1,13 @@
-from typing import Generator
+from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.session import get_db as _get_db
 from app.core.security import oauth2_scheme, decode_access_token
 from app.models.user import User
+from app.utils.pagination import CursorParams
 
 
 # -----------------------
@@ -54,3 +56,17 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
             detail="Usuario inactivo",
         )
     return current_user
+
+
+# -----------------------
+# PAGINACIÓN
+# -----------------------
+def get_cursor_params(
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    limit: int = Query(
+        default=settings.PAGINATION_DEFAULT_LIMIT,
+        ge=1,
+        le=settings.PAGINATION_MAX_LIMIT,
+    ),
+) -> CursorParams:
+    return CursorParams(limit=limit, cursor=cursor)
@@ -14,6 +14,7 @@ from app.api.v1.cameras import router as cameras_router
 from app.api.v1.images import router as images_router
 from app.api.v1.automation import router as automation_router
 from app.api.v1.threshold_config import router as threshold_router
+from app.api.v1.retention_policies import router as retention_router
 from app.api.v1.cooperatives import router as cooperatives_router
 from app.api.v1.reports import router as reports_router
 from app.api.v1.notifications import router as notifications_router
@@ -34,6 +35,7 @@ api_router.include_router(cameras_router)
 api_router.include_router(images_router)
 api_router.include_router(automation_router)
 api_router.include_router(threshold_router)
+api_router.include_router(retention_router)
 api_router.include_router(cooperatives_router)
 api_router.include_router(reports_router)
 api_router.include_router(notifications_router)
@@ -1,15 +1,14 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.actuator import Actuator as ActuatorModel
 from app.schemas.actuator import (
     Actuator as ActuatorSchema,
     ActuatorCreate,
     ActuatorUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/actuators",
@@ -20,12 +19,18 @@ router = APIRouter(
 # -----------------------
 # LISTAR TODOS
 # -----------------------
-@router.get("/", response_model=List[ActuatorSchema])
+@router.get("/", response_model=CursorPage[ActuatorSchema])
 def list_actuators(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(ActuatorModel).all()
+    return paginate_keyset(
+        db.query(ActuatorModel),
+        page,
+        (ActuatorModel.created_at, ActuatorModel.id),
+        total_mode="exact",
+    )
 
 
 # -----------------------
@@ -55,7 +60,7 @@ def create_actuator(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = ActuatorModel(**actuator_in.dict())
+    obj = ActuatorModel(**actuator_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -79,7 +84,7 @@ def update_actuator(
             detail="Actuador no encontrado",
         )
 
-    data = actuator_in.dict(exclude_unset=True)
+    data = actuator_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
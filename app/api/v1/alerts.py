@@ -1,31 +1,42 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.alert import Alert as AlertModel
 from app.schemas.alert import (
     Alert as AlertSchema,
     AlertCreate,
     AlertUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+from app.utils.serialization import PageSerializer
 
 router = APIRouter(
     prefix="/alerts",
     tags=["alerts"],
 )
 
+# Listado desde tuplas de columnas, sin objetos ORM (ver app.utils.serialization)
+PAGE_SERIALIZER = PageSerializer(AlertModel, AlertSchema)
+
 
 # -----------------------
 # LISTAR TODAS LAS ALERTAS
 # -----------------------
-@router.get("/", response_model=List[AlertSchema])
+@router.get("/", response_model=CursorPage[AlertSchema])
 def list_alerts(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(AlertModel).order_by(AlertModel.created_at.desc()).all()
+    result = paginate_keyset(
+        PAGE_SERIALIZER.query(db),
+        page,
+        (AlertModel.created_at, AlertModel.id),
+        descending=True,
+        total_mode="estimated",
+    )
+    return PAGE_SERIALIZER.response(result)
 
 
 # -----------------------
@@ -55,7 +66,7 @@ def create_alert(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    data = alert_in.dict(exclude_unset=True)
+    data = alert_in.model_dump(exclude_unset=True)
     obj = AlertModel(**data)
     db.add(obj)
     db.commit()
@@ -80,7 +91,7 @@ def update_alert(
             detail="Alerta no encontrada",
         )
 
-    data = alert_in.dict(exclude_unset=True)
+    data = alert_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
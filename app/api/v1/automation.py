@@ -1,9 +1,7 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.automation_rule import AutomationRule as AutomationRuleModel
 from app.models.automation_log import AutomationLog as AutomationLogModel
 from app.schemas.automation_rule import (
@@ -16,6 +14,7 @@ from app.schemas.automation_log import (
     AutomationLogCreate,
     AutomationLogUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/automation",
@@ -27,12 +26,18 @@ router = APIRouter(
 # =======================
 
 
-@router.get("/rules", response_model=List[AutomationRuleSchema])
+@router.get("/rules", response_model=CursorPage[AutomationRuleSchema])
 def list_rules(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(AutomationRuleModel).order_by(AutomationRuleModel.priority.asc()).all()
+    return paginate_keyset(
+        db.query(AutomationRuleModel),
+        page,
+        (AutomationRuleModel.priority, AutomationRuleModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/rules/{rule_id}", response_model=AutomationRuleSchema)
@@ -56,7 +61,7 @@ def create_rule(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = AutomationRuleModel(**rule_in.dict())
+    obj = AutomationRuleModel(**rule_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -77,7 +82,7 @@ def update_rule(
             detail="Regla no encontrada",
         )
 
-    data = rule_in.dict(exclude_unset=True)
+    data = rule_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -108,18 +113,19 @@ def delete_rule(
 # =======================
 
 
-@router.get("/logs", response_model=List[AutomationLogSchema])
+@router.get("/logs", response_model=CursorPage[AutomationLogSchema])
 def list_logs(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
-    limit: int = 100,
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    q = (
-        db.query(AutomationLogModel)
-        .order_by(AutomationLogModel.created_at.desc())
-        .limit(limit)
+    return paginate_keyset(
+        db.query(AutomationLogModel),
+        page,
+        (AutomationLogModel.created_at, AutomationLogModel.id),
+        descending=True,
+        total_mode="estimated",
     )
-    return q.all()
 
 
 @router.get("/logs/{log_id}", response_model=AutomationLogSchema)
@@ -143,7 +149,7 @@ def create_log(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = AutomationLogModel(**log_in.dict())
+    obj = AutomationLogModel(**log_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -164,7 +170,7 @@ def update_log(
             detail="Log no encontrado",
         )
 
-    data = log_in.dict(exclude_unset=True)
+    data = log_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -1,9 +1,7 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.camera import Camera as CameraModel
 from app.models.image import Image as ImageModel
 from app.schemas.camera import (
@@ -12,6 +10,7 @@ from app.schemas.camera import (
     CameraUpdate,
 )
 from app.schemas.image import Image as ImageSchema
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/cameras",
@@ -19,12 +18,18 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[CameraSchema])
+@router.get("/", response_model=CursorPage[CameraSchema])
 def list_cameras(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(CameraModel).all()
+    return paginate_keyset(
+        db.query(CameraModel),
+        page,
+        (CameraModel.created_at, CameraModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{camera_id}", response_model=CameraSchema)
@@ -48,7 +53,7 @@ def create_camera(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = CameraModel(**camera_in.dict())
+    obj = CameraModel(**camera_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -69,7 +74,7 @@ def update_camera(
             detail="Cámara no encontrada",
         )
 
-    data = camera_in.dict(exclude_unset=True)
+    data = camera_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -98,12 +103,12 @@ def delete_camera(
 # -----------------------
 # IMÁGENES DE UNA CÁMARA
 # -----------------------
-@router.get("/{camera_id}/images", response_model=List[ImageSchema])
+@router.get("/{camera_id}/images", response_model=CursorPage[ImageSchema])
 def list_camera_images(
     camera_id: int,
-    limit: int = 50,
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
     camera = db.query(CameraModel).filter(CameraModel.id == camera_id).first()
     if not camera:
@@ -112,10 +117,10 @@ def list_camera_images(
             detail="Cámara no encontrada",
         )
 
-    q = (
-        db.query(ImageModel)
-        .filter(ImageModel.camera_id == camera_id)
-        .order_by(ImageModel.captured_at.desc())
-        .limit(limit)
+    return paginate_keyset(
+        db.query(ImageModel).filter(ImageModel.camera_id == camera_id),
+        page,
+        (ImageModel.captured_at, ImageModel.id),
+        descending=True,
+        total_mode="estimated",
     )
-    return q.all()
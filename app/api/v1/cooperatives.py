@@ -1,15 +1,14 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.cooperative import Cooperative as CooperativeModel
 from app.schemas.cooperative import (
     Cooperative as CooperativeSchema,
     CooperativeCreate,
     CooperativeUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/cooperatives",
@@ -17,12 +16,18 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[CooperativeSchema])
+@router.get("/", response_model=CursorPage[CooperativeSchema])
 def list_cooperatives(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(CooperativeModel).all()
+    return paginate_keyset(
+        db.query(CooperativeModel),
+        page,
+        (CooperativeModel.created_at, CooperativeModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{coop_id}", response_model=CooperativeSchema)
@@ -46,7 +51,7 @@ def create_cooperative(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = CooperativeModel(**coop_in.dict())
+    obj = CooperativeModel(**coop_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -67,7 +72,7 @@ def update_cooperative(
             detail="Cooperativa no encontrada",
         )
 
-    data = coop_in.dict(exclude_unset=True)
+    data = coop_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
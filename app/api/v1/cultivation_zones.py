@@ -1,10 +1,15 @@
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.cultivation_zone import CultivationZone as ZoneModel
+from app.models.sensor import Sensor as SensorModel
 from app.schemas.cultivation_zone import (
     CultivationZone as ZoneSchema,
     CultivationZoneCreate,
@@ -12,6 +17,13 @@ from app.schemas.cultivation_zone import (
 )
 from app.crud.crud_parcel import parcel as crud_parcel
 from app.crud.crud_cultivation_zone import cultivation_zone as crud_cultivation_zone
+from app.schemas.sensor_latest import SensorLatest as SensorLatestSchema
+from app.services.archive_service import measurement_archive
+from app.services.device_service import zone_sensor_cache
+from app.services.export_service import MEDIA_TYPES, MeasurementExporter
+from app.services.latest_service import LatestService
+from app.services.measurement_service import to_utc_naive
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/zones",
@@ -19,12 +31,18 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[ZoneSchema])
+@router.get("/", response_model=CursorPage[ZoneSchema])
 def list_zones(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(ZoneModel).all()
+    return paginate_keyset(
+        db.query(ZoneModel),
+        page,
+        (ZoneModel.created_at, ZoneModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{zone_id}", response_model=ZoneSchema)
@@ -42,6 +60,74 @@ def get_zone(
     return obj
 
 
+# -----------------------
+# ESTADO ACTUAL DE LA ZONA
+# -----------------------
+@router.get("/{zone_id}/latest", response_model=List[SensorLatestSchema])
+def get_zone_latest(
+    zone_id: int,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Última lectura de cada sensor de la zona, desde sensor_latest y su
+    caché en proceso, sin consultar measurements.
+    """
+    if not db.query(ZoneModel.id).filter(ZoneModel.id == zone_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Zona no encontrada",
+        )
+    return LatestService(db).get(sorted(zone_sensor_cache.get(db, zone_id)))
+
+
+# -----------------------
+# EXPORTAR EL HISTÓRICO DE LA ZONA
+# -----------------------
+@router.get("/{zone_id}/measurements/export")
+def export_zone_measurements(
+    zone_id: int,
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Lecturas de todos los sensores de la zona en [from, to), sensor a
+    sensor y en orden cronológico dentro de cada uno, como CSV o NDJSON
+    en streaming.
+    """
+    if not db.query(ZoneModel.id).filter(ZoneModel.id == zone_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Zona no encontrada",
+        )
+
+    sensor_ids = sorted(zone_sensor_cache.get(db, zone_id))
+    units = {}
+    if sensor_ids:
+        units = dict(
+            db.query(SensorModel.id, SensorModel.unit).filter(SensorModel.id.in_(sensor_ids)).all()
+        )
+    exporter = MeasurementExporter(
+        SessionLocal,
+        sensor_ids,
+        start=to_utc_naive(start) if start else None,
+        end=to_utc_naive(end) if end else None,
+        batch_size=settings.MEASUREMENTS_EXPORT_BATCH_SIZE,
+        archive=measurement_archive,
+        units=units,
+    )
+    return StreamingResponse(
+        exporter.stream(export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="zone-{zone_id}-measurements.{export_format}"'
+        },
+    )
+
+
 @router.post("/", response_model=ZoneSchema, status_code=status.HTTP_201_CREATED)
 def create_zone(
     zone_in: CultivationZoneCreate,
@@ -75,7 +161,7 @@ def update_zone(
             detail="Zona no encontrada",
         )
 
-    data = zone_in.dict(exclude_unset=True)
+    data = zone_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -1,17 +1,23 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.device import Device as DeviceModel
 from app.schemas.device import (
     Device as DeviceSchema,
     DeviceCreate,
     DeviceUpdate,
+    DeviceReadingsIn,
+    DeviceReadingsResult,
+)
+from app.services.device_service import (
+    DeviceService,
+    DeviceWithoutZoneError,
+    SensorsOutsideZoneError,
 )
 from app.crud.crud_device import device as crud_device
 from app.crud.crud_cultivation_zone import cultivation_zone as crud_cultivation_zone
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/devices",
@@ -19,12 +25,18 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[DeviceSchema])
+@router.get("/", response_model=CursorPage[DeviceSchema])
 def list_devices(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return crud_device.get_multi(db)
+    return paginate_keyset(
+        db.query(DeviceModel),
+        page,
+        (DeviceModel.created_at, DeviceModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{device_id}", response_model=DeviceSchema)
@@ -93,4 +105,40 @@ def delete_device(
         )
 
     crud_device.remove(db, id=device_id)
-    return {"message": "Device deleted successfully"}
\ No newline at end of file
+    return {"message": "Device deleted successfully"}
+
+
+# -----------------------
+# LECTURAS DEL GATEWAY (UN ENVÍO POR CICLO)
+# -----------------------
+@router.post("/{device_id}/readings", response_model=DeviceReadingsResult)
+def create_device_readings(
+    device_id: int,
+    payload: DeviceReadingsIn,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Recibe las lecturas de todos los sensores de la zona del gateway,
+    las inserta y actualiza last_seen/is_online en la misma transacción.
+    Sustituye un POST /measurements/ por sensor más el PUT de presencia.
+    """
+    obj = crud_device.get(db, id=device_id)
+    if not obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Device not found",
+        )
+
+    try:
+        return DeviceService(db).ingest_readings(obj, payload)
+    except DeviceWithoutZoneError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El dispositivo no tiene zona asignada",
+        )
+    except SensorsOutsideZoneError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Sensores fuera de la zona del dispositivo: {exc.sensor_ids}",
+        )
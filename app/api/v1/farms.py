@@ -1,18 +1,26 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.farm import Farm
 from app.schemas.farm import Farm as FarmSchema, FarmCreate, FarmUpdate
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(prefix="/farms", tags=["farms"])
 
 
-@router.get("/", response_model=List[FarmSchema])
-def list_farms(db: Session = Depends(get_db), _: any = Depends(get_current_active_user)):
-    return db.query(Farm).all()
+@router.get("/", response_model=CursorPage[FarmSchema])
+def list_farms(
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
+):
+    return paginate_keyset(
+        db.query(Farm),
+        page,
+        (Farm.created_at, Farm.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{farm_id}", response_model=FarmSchema)
@@ -29,7 +37,7 @@ def create_farm(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = Farm(**farm_in.dict())
+    obj = Farm(**farm_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -47,7 +55,7 @@ def update_farm(
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Farm no encontrada")
 
-    data = farm_in.dict(exclude_unset=True)
+    data = farm_in.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(obj, k, v)
     db.commit()
@@ -1,28 +1,39 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.image import Image as ImageModel
 from app.schemas.image import (
     Image as ImageSchema,
     ImageCreate,
     ImageUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+from app.utils.serialization import PageSerializer
 
 router = APIRouter(
     prefix="/images",
     tags=["images"],
 )
 
+# Listado desde tuplas de columnas, sin objetos ORM (ver app.utils.serialization)
+PAGE_SERIALIZER = PageSerializer(ImageModel, ImageSchema)
+
 
-@router.get("/", response_model=List[ImageSchema])
+@router.get("/", response_model=CursorPage[ImageSchema])
 def list_images(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(ImageModel).all()
+    result = paginate_keyset(
+        PAGE_SERIALIZER.query(db),
+        page,
+        (ImageModel.created_at, ImageModel.id),
+        descending=True,
+        total_mode="estimated",
+    )
+    return PAGE_SERIALIZER.response(result)
 
 
 @router.get("/{image_id}", response_model=ImageSchema)
@@ -46,7 +57,7 @@ def create_image(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = ImageModel(**image_in.dict(exclude_unset=True))
+    obj = ImageModel(**image_in.model_dump(exclude_unset=True))
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -67,7 +78,7 @@ def update_image(
             detail="Imagen no encontrada",
         )
 
-    data = image_in.dict(exclude_unset=True)
+    data = image_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
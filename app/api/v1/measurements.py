@@ -1,34 +1,245 @@
-from typing import List
+from datetime import datetime, timedelta
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.cultivation_zone import CultivationZone as ZoneModel
 from app.models.measurement import Measurement as MeasurementModel
+from app.models.sensor import Sensor as SensorModel
 from app.schemas.measurement import (
     Measurement as MeasurementSchema,
     MeasurementCreate,
     MeasurementUpdate,
+    MeasurementBulkResult,
+    MeasurementStreamResult,
+    MeasurementBinaryResult,
+    MeasurementQueued,
+    WriteBufferMetrics,
+    MeasurementMatrix,
 )
+from app.services.aggregation_service import (
+    InvalidBucketError,
+    parse_aggregations,
+    parse_bucket,
+)
+from app.services.archive_service import measurement_archive
+from app.services.arrow_export_service import ARROW_MEDIA_TYPES, ArrowMeasurementExporter
+from app.services.block_service import BlockService
+from app.services.device_service import zone_sensor_cache
+from app.services.idempotency_service import IdempotencyService
+from app.services.latest_service import LatestService
+from app.services.matrix_service import MatrixService, axis_length
+from app.services.measurement_service import (
+    MeasurementService,
+    MeasurementStreamIngestor,
+    to_utc_naive,
+)
+from app.services.rollup_service import RollupService
+from app.services.write_buffer import BufferFullError, measurement_write_buffer
+from app.utils import measurement_codec
+from app.utils.columnar import to_columns
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+from app.utils.serialization import PageSerializer
 
 router = APIRouter(
     prefix="/measurements",
     tags=["measurements"],
 )
 
+# Listado desde tuplas de columnas, sin objetos ORM (ver app.utils.serialization)
+PAGE_SERIALIZER = PageSerializer(MeasurementModel, MeasurementSchema)
+
+# Cabecera opcional para que los reintentos de un gateway sean idempotentes
+IDEMPOTENCY_KEY_HEADER = Header(default=None, alias="Idempotency-Key", max_length=100)
+
 
-@router.get("/", response_model=List[MeasurementSchema])
+@router.get("/", response_model=CursorPage[MeasurementSchema])
 def list_measurements(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
-    limit: int = 200,
+    page: CursorParams = Depends(get_cursor_params),
+    response_format: Literal["json", "columnar"] = Query(default="json", alias="format"),
 ):
-    q = (
-        db.query(MeasurementModel)
-        .order_by(MeasurementModel.timestamp.desc())
-        .limit(limit)
+    """
+    Mediciones más recientes primero, paginadas por cursor. Con
+    `format=columnar` la página lleva un array por campo en lugar de
+    `items`; unit, status y sensor_id salen como escalar si son comunes
+    a todas las filas.
+    """
+    keys = (MeasurementModel.timestamp, MeasurementModel.id)
+    if response_format == "json":
+        return PAGE_SERIALIZER.response(
+            paginate_keyset(
+                PAGE_SERIALIZER.query(db), page, keys, descending=True, total_mode="estimated"
+            )
+        )
+
+    # Tuplas, sin objetos ORM ni esquemas por fila
+    names = ("id", "sensor_id", "timestamp", "value", "unit", "status")
+    result = paginate_keyset(
+        db.query(*(getattr(MeasurementModel, name) for name in names)),
+        page,
+        keys,
+        descending=True,
+        total_mode="estimated",
+    )
+    rows = result.pop("items")
+    return JSONResponse(
+        {**to_columns(rows, names, hoist=("sensor_id", "unit", "status")), **result}
+    )
+
+
+# -----------------------
+# MATRIZ MULTISENSOR ALINEADA
+# -----------------------
+@router.get("/matrix", response_model=MeasurementMatrix)
+def get_measurement_matrix(
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    bucket: str = Query(..., description="30s, 5m, 1h, 1d…"),
+    ids: Optional[List[str]] = Query(default=None, description="ids separados por comas o repetidos"),
+    zone_id: Optional[int] = None,
+    agg: str = Query(default="avg", description="una de avg, min, max, sum, count"),
+    fill: Literal["none", "ffill", "linear"] = "none",
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Series de varios sensores (`ids` o todos los de `zone_id`) sobre un
+    eje de tiempo común: `timestamps` tiene el inicio de cada intervalo
+    de [from, to) y cada serie un valor por intervalo en el mismo orden.
+    Los intervalos sin lecturas van a null o se rellenan según `fill`
+    (ffill: último valor; linear: interpolación, sin extrapolar).
+    """
+    if (ids is None) == (zone_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Indicar 'ids' o 'zone_id' (solo uno de los dos)",
+        )
+    try:
+        bucket_seconds = parse_bucket(bucket)
+        aggregations = parse_aggregations(agg)
+    except InvalidBucketError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if len(aggregations) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'agg' admite una sola agregación en la matriz",
+        )
+
+    start, end = to_utc_naive(start), to_utc_naive(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' debe ser posterior a 'from'",
+        )
+
+    if zone_id is not None:
+        if not db.query(ZoneModel.id).filter(ZoneModel.id == zone_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Zona no encontrada",
+            )
+        sensor_ids = sorted(zone_sensor_cache.get(db, zone_id))
+    else:
+        try:
+            sensor_ids = list(
+                dict.fromkeys(int(part) for value in ids for part in value.split(",") if part.strip())
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="'ids' debe ser una lista de enteros",
+            )
+
+    units = {}
+    if sensor_ids:
+        units = dict(
+            db.query(SensorModel.id, SensorModel.unit).filter(SensorModel.id.in_(sensor_ids)).all()
+        )
+    unknown = [sensor_id for sensor_id in sensor_ids if sensor_id not in units]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sensores no encontrados: {', '.join(map(str, unknown))}",
+        )
+
+    buckets = axis_length(start, end, bucket_seconds)
+    max_cells = settings.MEASUREMENTS_MATRIX_MAX_CELLS
+    if buckets > settings.MEASUREMENTS_MAX_BUCKETS or buckets * len(sensor_ids) > max_cells:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"La matriz supera {settings.MEASUREMENTS_MAX_BUCKETS} intervalos o "
+                f"{max_cells} celdas; usar un 'bucket' mayor o menos sensores"
+            ),
+        )
+
+    return MatrixService(
+        db,
+        use_rollups=settings.MEASUREMENT_ROLLUPS_ENABLED,
+        archive=measurement_archive,
+    ).matrix(
+        sensor_ids,
+        start,
+        end,
+        bucket_seconds,
+        aggregation=aggregations[0],
+        fill=fill,
+        units=units,
+    )
+
+
+@router.get("/export")
+def export_measurements(
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    export_format: Literal["arrow", "parquet"] = Query(default="arrow", alias="format"),
+    farm_id: Optional[int] = None,
+    parcel_id: Optional[int] = None,
+    zone_id: Optional[int] = None,
+    sensor_id: Optional[int] = None,
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Lecturas de [from, to) con sensor_id, zone_id y parcel_id como stream
+    IPC de Arrow (`format=arrow`) o Parquet (`format=parquet`), filtradas
+    opcionalmente por granja, parcela, zona o sensor. Se leen por
+    ventanas de MEASUREMENTS_ARROW_CHUNK_HOURS y se envían lote a lote.
+    """
+    start = to_utc_naive(start) if start else None
+    end = to_utc_naive(end) if end else None
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' debe ser posterior a 'from'",
+        )
+
+    exporter = ArrowMeasurementExporter(
+        SessionLocal,
+        start=start,
+        end=end,
+        farm_id=farm_id,
+        parcel_id=parcel_id,
+        zone_id=zone_id,
+        sensor_id=sensor_id,
+        chunk=timedelta(hours=settings.MEASUREMENTS_ARROW_CHUNK_HOURS),
+        batch_size=settings.MEASUREMENTS_ARROW_BATCH_SIZE,
+        archive=measurement_archive,
+    )
+    return StreamingResponse(
+        exporter.stream(export_format),
+        media_type=ARROW_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="measurements.{export_format}"'},
     )
-    return q.all()
 
 
 @router.get("/{measurement_id}", response_model=MeasurementSchema)
@@ -50,19 +261,251 @@ def get_measurement(
     return obj
 
 
-@router.post("/", response_model=MeasurementSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=MeasurementSchema,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        202: {"model": MeasurementQueued, "description": "Encolada (write-behind)"},
+        503: {"description": "Buffer de ingesta lleno; reintentar tras Retry-After"},
+    },
+)
 def create_measurement(
     m_in: MeasurementCreate,
+    response: Response,
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = MeasurementModel(**m_in.dict(exclude_unset=True))
+    if settings.MEASUREMENTS_WRITE_BEHIND_ENABLED:
+        return _enqueue_measurement(m_in, db)
+
+    service = MeasurementService(db)
+    if not service.existing_sensor_ids([m_in.sensor_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sensor no encontrado",
+        )
+
+    row = MeasurementService.to_row(m_in)
+
+    # Reintento de una lectura ya guardada: devolverla sin duplicar (200)
+    existing = _find_measurement(db, row["sensor_id"], row["timestamp"])
+    if existing:
+        response.status_code = status.HTTP_200_OK
+        return existing
+
+    obj = MeasurementModel(**row)
     db.add(obj)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        existing = _find_measurement(db, row["sensor_id"], row["timestamp"])
+        if not existing:
+            raise
+        response.status_code = status.HTTP_200_OK
+        return existing
+
+    # Rollups, bloques, última lectura, umbrales y reglas en la misma transacción
+    service.update_rollups([row])
+    service.update_blocks([row])
+    current = service.update_latest([row])
+    service.evaluate([obj], current=[obj] if current else [])
     db.commit()
     db.refresh(obj)
     return obj
 
 
+def _find_measurement(db: Session, sensor_id: int, timestamp) -> Optional[MeasurementModel]:
+    return (
+        db.query(MeasurementModel)
+        .filter(MeasurementModel.sensor_id == sensor_id)
+        .filter(MeasurementModel.timestamp == timestamp)
+        .first()
+    )
+
+
+def _replay(db: Session, key: Optional[str], endpoint: str) -> Optional[JSONResponse]:
+    """Respuesta guardada para un reintento con la misma Idempotency-Key."""
+    if not key:
+        return None
+    stored = IdempotencyService(db).get_response(key, endpoint)
+    if stored is None:
+        return None
+    return JSONResponse(content=stored, headers={"Idempotent-Replayed": "true"})
+
+
+def _remember(db: Session, key: Optional[str], endpoint: str, result: BaseModel) -> None:
+    if key:
+        IdempotencyService(db).save_response(key, endpoint, result.model_dump(mode="json"))
+
+
+@router.post("/bulk", response_model=MeasurementBulkResult)
+def create_measurements_bulk(
+    items: List[Any] = Body(...),
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Ingesta en lote: recibe una lista de MeasurementCreate y la escribe
+    con un único INSERT multi-fila en una sola transacción.
+    Cada elemento se valida por separado, así que un elemento inválido
+    (también uno que no es un objeto) se reporta como rechazado sin
+    descartar el resto del lote.
+    Las lecturas ya guardadas (mismo sensor_id y timestamp) se cuentan
+    como duplicadas; con Idempotency-Key un reintento repite la respuesta.
+    """
+    replay = _replay(db, idempotency_key, "measurements.bulk")
+    if replay:
+        return replay
+
+    if len(items) > settings.MEASUREMENTS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.MEASUREMENTS_BULK_MAX_ITEMS} mediciones por lote",
+        )
+
+    result = MeasurementService(db).ingest_bulk(items)
+    _remember(db, idempotency_key, "measurements.bulk", result)
+    return result
+
+
+@router.post("/stream", response_model=MeasurementStreamResult)
+async def create_measurements_stream(
+    request: Request,
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Ingesta NDJSON en streaming (Content-Type: application/x-ndjson).
+    El cuerpo se lee por trozos y se escribe en la tabla measurements
+    cada MEASUREMENTS_STREAM_CHUNK_SIZE líneas, sin cargarlo entero en
+    memoria. Al terminar devuelve el resumen y los errores por línea.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("application/x-ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Se esperaba Content-Type application/x-ndjson",
+        )
+
+    replay = await run_in_threadpool(_replay, db, idempotency_key, "measurements.stream")
+    if replay:
+        return replay
+
+    ingestor = MeasurementStreamIngestor(
+        MeasurementService(db),
+        chunk_size=settings.MEASUREMENTS_STREAM_CHUNK_SIZE,
+        max_line_bytes=settings.MEASUREMENTS_STREAM_MAX_LINE_BYTES,
+        max_errors=settings.MEASUREMENTS_STREAM_MAX_ERRORS,
+    )
+
+    async for data in request.stream():
+        ingestor.feed(data)
+        while ingestor.ready():
+            # La escritura es síncrona: no bloquear el event loop
+            await run_in_threadpool(ingestor.flush)
+
+    ingestor.close()
+    while ingestor.ready():
+        await run_in_threadpool(ingestor.flush)
+    await run_in_threadpool(ingestor.flush)
+
+    result = ingestor.result()
+    await run_in_threadpool(_remember, db, idempotency_key, "measurements.stream", result)
+    return result
+
+
+def _enqueue_measurement(m_in: MeasurementCreate, db: Session) -> JSONResponse:
+    """
+    Camino write-behind: valida el sensor y encola la fila sin esperar
+    el commit. Responde 202, o 503 con Retry-After si la cola está llena.
+    """
+    service = MeasurementService(db)
+    if not service.existing_sensor_ids([m_in.sensor_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sensor no encontrado",
+        )
+
+    try:
+        depth = measurement_write_buffer.submit([service.to_row(m_in)])
+    except BufferFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Buffer de ingesta lleno, reintente más tarde",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    queued = MeasurementQueued(sensor_id=m_in.sensor_id, queue_depth=depth)
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=queued.model_dump())
+
+
+@router.get("/buffer/metrics", response_model=WriteBufferMetrics)
+def get_write_buffer_metrics(
+    _: any = Depends(get_current_active_user),
+):
+    """Métricas del buffer write-behind para dimensionarlo."""
+    return measurement_write_buffer.metrics()
+
+
+@router.post("/binary", response_model=MeasurementBinaryResult)
+async def create_measurements_binary(
+    request: Request,
+    unit: Optional[str] = None,
+    status_value: Optional[str] = Query(default=None, alias="status"),
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Ingesta binaria compacta (Content-Type: application/octet-stream).
+    El cuerpo es una secuencia de registros de 16 bytes
+    (sensor_id u32, epoch_ms u64, value f32, little-endian); ver
+    app.utils.measurement_codec. unit y status se aplican a todo el lote.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith(measurement_codec.MEDIA_TYPE):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Se esperaba Content-Type {measurement_codec.MEDIA_TYPE}",
+        )
+
+    replay = await run_in_threadpool(_replay, db, idempotency_key, "measurements.binary")
+    if replay:
+        return replay
+
+    # Se rechaza antes de leer: por Content-Length si viene, y si no
+    # (chunked) en cuanto lo leído pasa del máximo
+    max_bytes = settings.MEASUREMENTS_BINARY_MAX_RECORDS * measurement_codec.RECORD_SIZE
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Máximo {settings.MEASUREMENTS_BINARY_MAX_RECORDS} registros por envío",
+    )
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    body = bytearray()
+    async for data in request.stream():
+        body += data
+        if len(body) > max_bytes:
+            raise too_large
+    payload = bytes(body)
+
+    try:
+        measurement_codec.record_count(payload)
+    except measurement_codec.InvalidPayloadError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    service = MeasurementService(db)
+    result = await run_in_threadpool(service.ingest_binary, payload, unit, status_value)
+    await run_in_threadpool(_remember, db, idempotency_key, "measurements.binary", result)
+    return result
+
+
 @router.put("/{measurement_id}", response_model=MeasurementSchema)
 def update_measurement(
     measurement_id: int,
@@ -81,10 +524,15 @@ def update_measurement(
             detail="Medición no encontrada",
         )
 
-    data = m_in.dict(exclude_unset=True)
+    previous = (obj.sensor_id, obj.timestamp)
+    data = m_in.model_dump(exclude_unset=True)
+    if data.get("timestamp") is not None:
+        data["timestamp"] = to_utc_naive(data["timestamp"])
     for field, value in data.items():
         setattr(obj, field, value)
 
+    db.flush()
+    _rebuild_derived(db, [previous, (obj.sensor_id, obj.timestamp)])
     db.commit()
     db.refresh(obj)
     return obj
@@ -107,5 +555,17 @@ def delete_measurement(
             detail="Medición no encontrada",
         )
 
+    point = (obj.sensor_id, obj.timestamp)
     db.delete(obj)
+    db.flush()
+    _rebuild_derived(db, [point])
     db.commit()
+
+
+def _rebuild_derived(db: Session, points) -> None:
+    """Una edición o un borrado invalida los intervalos, bloques y última lectura que tocaba."""
+    LatestService(db).refresh(sensor_id for sensor_id, _ in points)
+    if settings.MEASUREMENT_ROLLUPS_ENABLED:
+        RollupService(db).rebuild_at(points)
+    if settings.MEASUREMENT_BLOCKS_ENABLED:
+        BlockService(db).rebuild_at(points)
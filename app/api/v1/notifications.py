@@ -1,9 +1,7 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.notification import Notification as NotificationModel
 from app.models.user import User
 from app.schemas.notification import (
@@ -11,27 +9,35 @@ from app.schemas.notification import (
     NotificationCreate,
     NotificationUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+from app.utils.serialization import PageSerializer
 
 router = APIRouter(
     prefix="/notifications",
     tags=["notifications"],
 )
 
+# Listado desde tuplas de columnas, sin objetos ORM (ver app.utils.serialization)
+PAGE_SERIALIZER = PageSerializer(NotificationModel, NotificationSchema)
+
 
 # -----------------------
 # LISTAR NOTIFICACIONES DEL USUARIO ACTUAL
 # -----------------------
-@router.get("/", response_model=List[NotificationSchema])
+@router.get("/", response_model=CursorPage[NotificationSchema])
 def list_my_notifications(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return (
-        db.query(NotificationModel)
-        .filter(NotificationModel.user_id == current_user.id)
-        .order_by(NotificationModel.created_at.desc())
-        .all()
+    result = paginate_keyset(
+        PAGE_SERIALIZER.query(db).filter(NotificationModel.user_id == current_user.id),
+        page,
+        (NotificationModel.created_at, NotificationModel.id),
+        descending=True,
+        total_mode="estimated",
     )
+    return PAGE_SERIALIZER.response(result)
 
 
 # -----------------------
@@ -68,7 +74,7 @@ def create_notification(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_active_user),
 ):
-    obj = NotificationModel(**n_in.dict(exclude_unset=True))
+    obj = NotificationModel(**n_in.model_dump(exclude_unset=True))
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -99,7 +105,7 @@ def update_notification(
             detail="Notificación no encontrada",
         )
 
-    data = n_in.dict(exclude_unset=True)
+    data = n_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -1,18 +1,26 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.parcel import Parcel
 from app.schemas.parcel import Parcel as ParcelSchema, ParcelCreate, ParcelUpdate
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(prefix="/parcels", tags=["parcels"])
 
 
-@router.get("/", response_model=List[ParcelSchema])
-def list_parcels(db: Session = Depends(get_db), _: any = Depends(get_current_active_user)):
-    return db.query(Parcel).all()
+@router.get("/", response_model=CursorPage[ParcelSchema])
+def list_parcels(
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
+):
+    return paginate_keyset(
+        db.query(Parcel),
+        page,
+        (Parcel.created_at, Parcel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{parcel_id}", response_model=ParcelSchema)
@@ -29,7 +37,7 @@ def create_parcel(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = Parcel(**parcel_in.dict())
+    obj = Parcel(**parcel_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -47,7 +55,7 @@ def update_parcel(
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parcel no encontrada")
 
-    data = parcel_in.dict(exclude_unset=True)
+    data = parcel_in.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(obj, k, v)
     db.commit()
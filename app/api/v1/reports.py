@@ -1,9 +1,7 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.report import Report as ReportModel
 from app.models.user import User
 from app.schemas.report import (
@@ -11,6 +9,7 @@ from app.schemas.report import (
     ReportCreate,
     ReportUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/reports",
@@ -18,12 +17,19 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[ReportSchema])
+@router.get("/", response_model=CursorPage[ReportSchema])
 def list_reports(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(ReportModel).order_by(ReportModel.created_at.desc()).all()
+    return paginate_keyset(
+        db.query(ReportModel),
+        page,
+        (ReportModel.created_at, ReportModel.id),
+        descending=True,
+        total_mode="estimated",
+    )
 
 
 @router.get("/{report_id}", response_model=ReportSchema)
@@ -47,7 +53,7 @@ def create_report(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    data = r_in.dict(exclude_unset=True)
+    data = r_in.model_dump(exclude_unset=True)
     # Si no viene created_by_id, lo seteamos al usuario actual
     if data.get("created_by_id") is None:
         data["created_by_id"] = current_user.id
@@ -73,7 +79,7 @@ def update_report(
             detail="Reporte no encontrado",
         )
 
-    data = r_in.dict(exclude_unset=True)
+    data = r_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
@@ -0,0 +1,126 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
+from app.core.config import settings
+from app.models.retention_policy import RetentionPolicy as RetentionPolicyModel
+from app.schemas.retention_policy import (
+    RetentionPolicy as RetentionPolicySchema,
+    RetentionPolicyCreate,
+    RetentionPolicyUpdate,
+    RetentionRunResult,
+)
+from app.services.archive_service import measurement_archive
+from app.services.retention_service import RetentionService
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+
+router = APIRouter(
+    prefix="/retention-policies",
+    tags=["retention_policies"],
+)
+
+
+@router.get("/", response_model=CursorPage[RetentionPolicySchema])
+def list_retention_policies(
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
+):
+    return paginate_keyset(
+        db.query(RetentionPolicyModel),
+        page,
+        (RetentionPolicyModel.created_at, RetentionPolicyModel.id),
+        total_mode="exact",
+    )
+
+
+@router.get("/{policy_id}", response_model=RetentionPolicySchema)
+def get_retention_policy(
+    policy_id: int,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    obj = db.query(RetentionPolicyModel).filter(RetentionPolicyModel.id == policy_id).first()
+    if not obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Política de retención no encontrada",
+        )
+    return obj
+
+
+@router.post("/", response_model=RetentionPolicySchema, status_code=status.HTTP_201_CREATED)
+def create_retention_policy(
+    p_in: RetentionPolicyCreate,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    obj = RetentionPolicyModel(**p_in.model_dump(exclude_unset=True))
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+@router.put("/{policy_id}", response_model=RetentionPolicySchema)
+def update_retention_policy(
+    policy_id: int,
+    p_in: RetentionPolicyUpdate,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    obj = db.query(RetentionPolicyModel).filter(RetentionPolicyModel.id == policy_id).first()
+    if not obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Política de retención no encontrada",
+        )
+
+    data = p_in.model_dump(exclude_unset=True)
+    for field, value in data.items():
+        setattr(obj, field, value)
+
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_retention_policy(
+    policy_id: int,
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    obj = db.query(RetentionPolicyModel).filter(RetentionPolicyModel.id == policy_id).first()
+    if not obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Política de retención no encontrada",
+        )
+
+    db.delete(obj)
+    db.commit()
+
+
+# -----------------------
+# EJECUCIÓN MANUAL
+# -----------------------
+@router.post("/run", response_model=RetentionRunResult)
+def run_retention_policies(
+    policy_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Aplica las políticas activas ahora mismo y devuelve las filas
+    eliminadas. Normalmente lo hace `python -m app.commands.retention`.
+    """
+    service = RetentionService(
+        db,
+        batch_size=settings.RETENTION_BATCH_SIZE,
+        pause_ms=settings.RETENTION_BATCH_PAUSE_MS,
+        archive=measurement_archive,
+    )
+    return service.run(policy_id=policy_id)
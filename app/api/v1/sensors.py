@@ -1,9 +1,13 @@
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.sensor import Sensor as SensorModel
 from app.models.measurement import Measurement as MeasurementModel
 from app.schemas.sensor import (
@@ -11,7 +15,31 @@ from app.schemas.sensor import (
     SensorCreate,
     SensorUpdate,
 )
-from app.schemas.measurement import Measurement as MeasurementSchema
+from app.schemas.measurement import (
+    Measurement as MeasurementSchema,
+    MeasurementBucket,
+    MeasurementPoint,
+)
+from app.schemas.sensor_latest import SensorLatest as SensorLatestSchema
+from app.schemas.measurement_rollup import (
+    MeasurementRollup as MeasurementRollupSchema,
+    MeasurementRollupRebuildResult,
+)
+from app.services.aggregation_service import (
+    AggregationService,
+    InvalidBucketError,
+    parse_aggregations,
+    parse_bucket,
+)
+from app.services.archive_service import measurement_archive
+from app.services.device_service import zone_sensor_cache
+from app.services.downsampling_service import DownsamplingService, SeriesTooLargeError
+from app.services.export_service import MEDIA_TYPES, MeasurementExporter
+from app.services.latest_service import LatestService, sensor_latest_cache
+from app.services.measurement_service import to_utc_naive
+from app.services.rollup_service import RollupService
+from app.utils.columnar import to_columns
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/sensors",
@@ -22,12 +50,38 @@ router = APIRouter(
 # -----------------------
 # LISTAR TODOS
 # -----------------------
-@router.get("/", response_model=List[SensorSchema])
+@router.get("/", response_model=CursorPage[SensorSchema])
 def list_sensors(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
+):
+    return paginate_keyset(
+        db.query(SensorModel),
+        page,
+        (SensorModel.created_at, SensorModel.id),
+        total_mode="exact",
+    )
+
+
+# -----------------------
+# ÚLTIMA LECTURA DE VARIOS SENSORES
+# -----------------------
+@router.get("/latest", response_model=List[SensorLatestSchema])
+def list_sensors_latest(
+    ids: List[str] = Query(..., description="ids separados por comas o repetidos"),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
 ):
-    return db.query(SensorModel).all()
+    """Lectura actual de cada sensor pedido; se omiten los que aún no tienen lecturas."""
+    try:
+        sensor_ids = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'ids' debe ser una lista de enteros",
+        )
+    return LatestService(db).get(sensor_ids)
 
 
 # -----------------------
@@ -57,10 +111,11 @@ def create_sensor(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = SensorModel(**sensor_in.dict())
+    obj = SensorModel(**sensor_in.model_dump())
     db.add(obj)
     db.commit()
     db.refresh(obj)
+    zone_sensor_cache.invalidate(obj.zone_id)
     return obj
 
 
@@ -81,12 +136,15 @@ def update_sensor(
             detail="Sensor no encontrado",
         )
 
-    data = sensor_in.dict(exclude_unset=True)
+    previous_zone_id = obj.zone_id
+    data = sensor_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
     db.commit()
     db.refresh(obj)
+    zone_sensor_cache.invalidate(previous_zone_id)
+    zone_sensor_cache.invalidate(obj.zone_id)
     return obj
 
 
@@ -106,8 +164,11 @@ def delete_sensor(
             detail="Sensor no encontrado",
         )
 
+    zone_id = obj.zone_id
     db.delete(obj)
     db.commit()
+    zone_sensor_cache.invalidate(zone_id)
+    sensor_latest_cache.invalidate([sensor_id])
 
 
 # -----------------------
@@ -115,25 +176,292 @@ def delete_sensor(
 # -----------------------
 @router.get(
     "/{sensor_id}/measurements",
-    response_model=List[MeasurementSchema],
+    response_model=Union[List[MeasurementSchema], List[MeasurementBucket], List[MeasurementPoint]],
 )
 def list_sensor_measurements(
     sensor_id: int,
-    limit: int = 50,
+    limit: int = Query(default=50, ge=1, le=10000),
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    bucket: Optional[str] = Query(default=None, description="30s, 5m, 1h, 1d…"),
+    agg: str = Query(default="avg", description="avg,min,max,sum,count"),
+    max_points: Optional[int] = Query(default=None, ge=3, le=10000, description="reducir con LTTB"),
+    response_format: Literal["json", "columnar"] = Query(default="json", alias="format"),
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
+    """
+    Mediciones más recientes primero, opcionalmente en [from, to). Si la
+    base de datos no llega a limit y hay archivo frío, se completa con
+    las lecturas archivadas (más antiguas que las de la base de datos).
+
+    Con `bucket` devuelve un intervalo por fila en orden cronológico, con
+    las agregaciones de `agg`, calculado en SQL (desde measurement_rollups
+    cuando el intervalo es múltiplo de 1m, 1h o 1d).
+
+    Con `max_points` devuelve como mucho ese número de puntos
+    (timestamp, value) en orden cronológico, elegidos con LTTB sobre
+    todas las lecturas del rango: conserva la forma y los picos. Si el
+    rango tiene más de MEASUREMENTS_DOWNSAMPLE_MAX_RAW_ROWS lecturas se
+    parte de la media por minuto de los rollups de 1m (o de los bloques
+    comprimidos); sin ninguno de los dos responde 400.
+
+    Con `format=columnar` cualquiera de los tres modos devuelve un array
+    por campo ({"timestamp": [...], "value": [...]}) con sensor_id y los
+    campos comunes a todas las filas (unit, status) una sola vez.
+    """
     sensor = db.query(SensorModel).filter(SensorModel.id == sensor_id).first()
     if not sensor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sensor no encontrado",
         )
+    start = to_utc_naive(start) if start else None
+    end = to_utc_naive(end) if end else None
 
-    q = (
-        db.query(MeasurementModel)
-        .filter(MeasurementModel.sensor_id == sensor_id)
-        .order_by(MeasurementModel.timestamp.desc())
-        .limit(limit)
+    columnar = response_format == "columnar"
+    if bucket is not None:
+        return _bucketed_measurements(db, sensor, bucket, agg, start, end, columnar)
+    if max_points is not None:
+        downsampling = DownsamplingService(
+            db,
+            archive=measurement_archive,
+            max_raw_rows=settings.MEASUREMENTS_DOWNSAMPLE_MAX_RAW_ROWS,
+        )
+        try:
+            if not columnar:
+                return downsampling.points(sensor_id, max_points, start=start, end=end)
+            timestamps, values = downsampling.reduced(sensor_id, max_points, start=start, end=end)
+        except SeriesTooLargeError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        return JSONResponse(
+            {
+                "sensor_id": sensor_id,
+                "unit": sensor.unit,
+                **to_columns(zip(timestamps, values), ("timestamp", "value")),
+            }
+        )
+    if columnar:
+        return JSONResponse(_columnar_measurements(db, sensor, limit, start, end))
+
+    q = db.query(MeasurementModel).filter(MeasurementModel.sensor_id == sensor_id)
+    if start is not None:
+        q = q.filter(MeasurementModel.timestamp >= start)
+    if end is not None:
+        q = q.filter(MeasurementModel.timestamp < end)
+    rows = q.order_by(MeasurementModel.timestamp.desc()).limit(limit).all()
+
+    if measurement_archive is None or len(rows) >= limit:
+        return rows
+
+    archived = measurement_archive.read(
+        sensor_id,
+        start=start,
+        end=rows[-1].timestamp if rows else end,
+        limit=limit - len(rows),
+        descending=True,
     )
-    return q.all()
+    return rows + [
+        MeasurementSchema(
+            id=a.id,
+            value=a.value,
+            unit=sensor.unit,
+            sensor_id=sensor_id,
+            timestamp=a.timestamp,
+        )
+        for a in archived
+    ]
+
+
+# -----------------------
+# EXTRA: EXPORTAR EL HISTÓRICO DEL SENSOR
+# -----------------------
+@router.get("/{sensor_id}/measurements/export")
+def export_sensor_measurements(
+    sensor_id: int,
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Todas las lecturas del sensor en [from, to), en orden cronológico,
+    como CSV o NDJSON en streaming (incluye el archivo frío si lo hay).
+    La memoria del servidor no depende del número de filas.
+    """
+    sensor = db.query(SensorModel).filter(SensorModel.id == sensor_id).first()
+    if not sensor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sensor no encontrado",
+        )
+
+    exporter = MeasurementExporter(
+        SessionLocal,
+        [sensor_id],
+        start=to_utc_naive(start) if start else None,
+        end=to_utc_naive(end) if end else None,
+        batch_size=settings.MEASUREMENTS_EXPORT_BATCH_SIZE,
+        archive=measurement_archive,
+        units={sensor_id: sensor.unit},
+    )
+    return StreamingResponse(
+        exporter.stream(export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="sensor-{sensor_id}-measurements.{export_format}"'
+        },
+    )
+
+
+def _columnar_measurements(
+    db: Session,
+    sensor: SensorModel,
+    limit: int,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Dict[str, Any]:
+    """Las mismas lecturas que el modo por defecto, leídas como tuplas y en columnas."""
+    q = db.query(
+        MeasurementModel.timestamp,
+        MeasurementModel.value,
+        MeasurementModel.unit,
+        MeasurementModel.status,
+    ).filter(MeasurementModel.sensor_id == sensor.id)
+    if start is not None:
+        q = q.filter(MeasurementModel.timestamp >= start)
+    if end is not None:
+        q = q.filter(MeasurementModel.timestamp < end)
+    rows = q.order_by(MeasurementModel.timestamp.desc()).limit(limit).all()
+
+    if measurement_archive is not None and len(rows) < limit:
+        archived = measurement_archive.read(
+            sensor.id,
+            start=start,
+            end=rows[-1][0] if rows else end,
+            limit=limit - len(rows),
+            descending=True,
+        )
+        rows += [(a.timestamp, a.value, sensor.unit, None) for a in archived]
+
+    return {
+        "sensor_id": sensor.id,
+        **to_columns(rows, ("timestamp", "value", "unit", "status"), hoist=("unit", "status")),
+    }
+
+
+def _bucketed_measurements(
+    db: Session,
+    sensor: SensorModel,
+    bucket: str,
+    agg: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    columnar: bool = False,
+) -> Union[List[MeasurementBucket], JSONResponse]:
+    try:
+        bucket_seconds = parse_bucket(bucket)
+        aggregations = parse_aggregations(agg)
+    except InvalidBucketError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    max_buckets = settings.MEASUREMENTS_MAX_BUCKETS
+    if start is not None and end is not None:
+        if end <= start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'to' debe ser posterior a 'from'",
+            )
+        if (end - start).total_seconds() / bucket_seconds > max_buckets:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El rango da más de {max_buckets} intervalos; usar un 'bucket' mayor",
+            )
+
+    service = AggregationService(
+        db,
+        use_rollups=settings.MEASUREMENT_ROLLUPS_ENABLED,
+        archive=measurement_archive,
+    )
+    if columnar:
+        columns = service.columns(
+            sensor.id, bucket_seconds, aggregations, start=start, end=end, limit=max_buckets
+        )
+        return JSONResponse({"sensor_id": sensor.id, "unit": sensor.unit, **columns})
+    return service.buckets(
+        sensor.id,
+        bucket_seconds,
+        aggregations,
+        start=start,
+        end=end,
+        limit=max_buckets,
+    )
+
+
+# -----------------------
+# EXTRA: AGREGADOS (ROLLUPS) DEL SENSOR
+# -----------------------
+@router.get(
+    "/{sensor_id}/rollups",
+    response_model=List[MeasurementRollupSchema],
+)
+def list_sensor_rollups(
+    sensor_id: int,
+    resolution: Literal["1m", "1h", "1d"] = "1h",
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Agregados por intervalo (count, sum, min, max, first, last, media y
+    desviación) sin recorrer las mediciones crudas.
+    """
+    sensor = db.query(SensorModel).filter(SensorModel.id == sensor_id).first()
+    if not sensor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sensor no encontrado",
+        )
+
+    return RollupService(db).query(
+        sensor_id,
+        resolution,
+        start=to_utc_naive(start) if start else None,
+        end=to_utc_naive(end) if end else None,
+        limit=limit,
+    )
+
+
+@router.post(
+    "/{sensor_id}/rollups/rebuild",
+    response_model=MeasurementRollupRebuildResult,
+)
+def rebuild_sensor_rollups(
+    sensor_id: int,
+    start: datetime = Query(alias="from"),
+    end: datetime = Query(alias="to"),
+    db: Session = Depends(get_db),
+    _: any = Depends(get_current_active_user),
+):
+    """
+    Recalcula los agregados del rango (ampliado a días UTC completos) desde
+    las mediciones. Los días anteriores al corte de retención de las
+    mediciones crudas se saltan (skipped_days).
+    """
+    sensor = db.query(SensorModel).filter(SensorModel.id == sensor_id).first()
+    if not sensor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sensor no encontrado",
+        )
+    start, end = to_utc_naive(start), to_utc_naive(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' debe ser posterior a 'from'",
+        )
+
+    return RollupService(db).rebuild(start, end, sensor_id=sensor_id)
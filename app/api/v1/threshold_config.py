@@ -1,15 +1,14 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.threshold_config import ThresholdConfig as ThresholdModel
 from app.schemas.threshold_config import (
     ThresholdConfig as ThresholdSchema,
     ThresholdConfigCreate,
     ThresholdConfigUpdate,
 )
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(
     prefix="/threshold-configs",
@@ -17,12 +16,18 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[ThresholdSchema])
+@router.get("/", response_model=CursorPage[ThresholdSchema])
 def list_threshold_configs(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(ThresholdModel).all()
+    return paginate_keyset(
+        db.query(ThresholdModel),
+        page,
+        (ThresholdModel.created_at, ThresholdModel.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{config_id}", response_model=ThresholdSchema)
@@ -46,7 +51,7 @@ def create_threshold_config(
     db: Session = Depends(get_db),
     _: any = Depends(get_current_active_user),
 ):
-    obj = ThresholdModel(**t_in.dict(exclude_unset=True))
+    obj = ThresholdModel(**t_in.model_dump(exclude_unset=True))
     db.add(obj)
     db.commit()
     db.refresh(obj)
@@ -67,7 +72,7 @@ def update_threshold_config(
             detail="Configuración de umbral no encontrada",
         )
 
-    data = t_in.dict(exclude_unset=True)
+    data = t_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(obj, field, value)
 
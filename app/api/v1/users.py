@@ -1,21 +1,26 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, get_cursor_params
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
+from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/", response_model=List[UserSchema])
+@router.get("/", response_model=CursorPage[UserSchema])
 def list_users(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_active_user),
+    page: CursorParams = Depends(get_cursor_params),
 ):
-    return db.query(User).all()
+    return paginate_keyset(
+        db.query(User),
+        page,
+        (User.created_at, User.id),
+        total_mode="exact",
+    )
 
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -41,7 +46,7 @@ def update_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
 
-    data = obj_in.dict(exclude_unset=True)
+    data = obj_in.model_dump(exclude_unset=True)
     for field, value in data.items():
         if field == "password" and value:
             from app.core.security import get_password_hash
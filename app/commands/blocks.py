@@ -0,0 +1,90 @@
+"""
+Compacta measurements en measurement_blocks (un BLOB por sensor y hora).
+
+    python -m app.commands.blocks compact                      # todo el histórico
+    python -m app.commands.blocks compact --sensor-id 3
+    python -m app.commands.blocks compact --from 2026-01-01 --to 2026-02-01
+
+Regenera hora a hora y sensor a sensor, con un commit por hora: se puede
+interrumpir y relanzar. Las horas anteriores al corte de retención de
+cada sensor no se regeneran: sus mediciones crudas pueden estar ya
+purgadas y los bloques son lo que queda. Con MEASUREMENT_BLOCKS_ENABLED
+las lecturas nuevas se añaden a sus bloques al insertarse.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from app.db.session import SessionLocal
+from app.models.measurement import Measurement
+from app.models.sensor import Sensor
+from app.services.block_service import BlockService
+from app.services.retention_service import RetentionService
+from app.services.measurement_service import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+
+def compact(
+    sensor_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> None:
+    db = SessionLocal()
+    try:
+        if sensor_id is not None:
+            sensor_ids = [sensor_id]
+        else:
+            sensor_ids = [s for (s,) in db.query(Sensor.id).order_by(Sensor.id).all()]
+
+        service = BlockService(db)
+        cutoffs = RetentionService(db).raw_cutoffs(sensor_ids)
+        for current in sensor_ids:
+            first, last = (
+                db.query(func.min(Measurement.timestamp), func.max(Measurement.timestamp))
+                .filter(Measurement.sensor_id == current)
+                .one()
+            )
+            if first is None:
+                continue
+
+            # El rango es semiabierto: +1 µs para incluir la última lectura
+            range_start = max(start, first) if start else first
+            cutoff = cutoffs.get(current)
+            if cutoff is not None:
+                range_start = max(range_start, cutoff)
+            range_end = min(end, last + timedelta(microseconds=1)) if end else last + timedelta(microseconds=1)
+            if range_end <= range_start:
+                continue
+
+            blocks = service.rebuild(range_start, range_end, sensor_id=current)
+            logger.info("sensor %s: %s bloques", current, blocks)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bloques comprimidos de mediciones (measurement_blocks)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("compact", help="genera los bloques desde measurements")
+    cmd.add_argument("--sensor-id", type=int, default=None)
+    cmd.add_argument("--from", dest="start", type=datetime.fromisoformat, default=None)
+    cmd.add_argument("--to", dest="end", type=datetime.fromisoformat, default=None)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "compact":
+        compact(
+            sensor_id=args.sensor_id,
+            start=to_utc_naive(args.start) if args.start else None,
+            end=to_utc_naive(args.end) if args.end else None,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Exporta measurements (con sensor_id, zone_id y parcel_id) a un fichero
+Arrow IPC (stream) o Parquet.
+
+    python -m app.commands.export parquet mediciones.parquet --from 2026-01-01 --to 2026-02-01
+    python -m app.commands.export arrow zona3.arrows --zone-id 3
+    python -m app.commands.export parquet granja1.parquet --farm-id 1 --chunk-hours 6
+
+Lee por ventanas de --chunk-hours y escribe lote a lote, como
+GET /api/v1/measurements/export: la memoria no depende del tamaño.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.archive_service import measurement_archive
+from app.services.arrow_export_service import ArrowMeasurementExporter
+from app.services.measurement_service import to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+
+def export(path: str, fmt: str, exporter: ArrowMeasurementExporter) -> int:
+    written = 0
+    with open(path, "wb") as out:
+        for chunk in exporter.stream(fmt):
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Exportación de mediciones a Arrow IPC o Parquet")
+    parser.add_argument("format", choices=["arrow", "parquet"])
+    parser.add_argument("output", help="fichero de salida")
+    parser.add_argument("--from", dest="start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--to", dest="end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--farm-id", type=int, default=None)
+    parser.add_argument("--parcel-id", type=int, default=None)
+    parser.add_argument("--zone-id", type=int, default=None)
+    parser.add_argument("--sensor-id", type=int, default=None)
+    parser.add_argument("--chunk-hours", type=int, default=settings.MEASUREMENTS_ARROW_CHUNK_HOURS)
+    parser.add_argument("--batch-size", type=int, default=settings.MEASUREMENTS_ARROW_BATCH_SIZE)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    exporter = ArrowMeasurementExporter(
+        SessionLocal,
+        start=to_utc_naive(args.start) if args.start else None,
+        end=to_utc_naive(args.end) if args.end else None,
+        farm_id=args.farm_id,
+        parcel_id=args.parcel_id,
+        zone_id=args.zone_id,
+        sensor_id=args.sensor_id,
+        chunk=timedelta(hours=args.chunk_hours),
+        batch_size=args.batch_size,
+        archive=measurement_archive,
+    )
+    written = export(args.output, args.format, exporter)
+    logger.info("%s: %s bytes", args.output, written)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Particionado mensual de measurements (solo MySQL).
+
+    python -m app.commands.partitions status
+    python -m app.commands.partitions enable                     # conversión única
+    python -m app.commands.partitions maintain                   # crear futuras + expirar
+    python -m app.commands.partitions maintain --retention-months 12 --archive
+
+`enable` reescribe la tabla: lanzarlo en una ventana de mantenimiento.
+`maintain` está pensado para un cron diario; crear y quitar particiones
+no recorre filas. Sin --retention-months se usa
+MEASUREMENTS_PARTITION_RETENTION_MONTHS (0 = no expirar).
+"""
+import argparse
+import logging
+from typing import List, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.partition_service import (
+    MeasurementPartitionService,
+    PartitioningNotSupportedError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def status() -> None:
+    db = SessionLocal()
+    try:
+        partitions = MeasurementPartitionService(db).partitions()
+        if not partitions:
+            logger.info("measurements no está particionada")
+        for partition in partitions:
+            bound = f"{partition.upper_bound:%Y-%m-%d}" if partition.upper_bound else "MAXVALUE"
+            logger.info("%-10s < %-10s ~%s filas", partition.name, bound, partition.rows)
+    finally:
+        db.close()
+
+
+def enable(months_ahead: int) -> None:
+    db = SessionLocal()
+    try:
+        statements = MeasurementPartitionService(db).enable(months_ahead)
+        if not statements:
+            logger.info("measurements ya estaba particionada")
+    finally:
+        db.close()
+
+
+def maintain(months_ahead: int, retention_months: int, archive: bool) -> None:
+    db = SessionLocal()
+    try:
+        service = MeasurementPartitionService(db)
+        if not service.is_partitioned():
+            logger.warning("measurements no está particionada; ejecutar antes `enable`")
+            return
+
+        created = service.ensure_future(months_ahead)
+        logger.info("particiones creadas: %s", ", ".join(created) or "-")
+
+        if retention_months > 0:
+            expired = service.expire(retention_months, archive=archive)
+            logger.info(
+                "particiones %s: %s",
+                "archivadas" if archive else "eliminadas",
+                ", ".join(expired) or "-",
+            )
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Particiones mensuales de measurements")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="lista las particiones y sus filas estimadas")
+
+    cmd = sub.add_parser("enable", help="particiona la tabla por meses (reescribe la tabla)")
+    cmd.add_argument("--months-ahead", type=int, default=settings.MEASUREMENTS_PARTITION_MONTHS_AHEAD)
+
+    cmd = sub.add_parser("maintain", help="crea las particiones futuras y expira las antiguas")
+    cmd.add_argument("--months-ahead", type=int, default=settings.MEASUREMENTS_PARTITION_MONTHS_AHEAD)
+    cmd.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.MEASUREMENTS_PARTITION_RETENTION_MONTHS,
+    )
+    cmd.add_argument(
+        "--archive",
+        action="store_true",
+        help="mover cada partición expirada a measurements_archive_<partición> en lugar de borrarla",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    try:
+        if args.command == "status":
+            status()
+        elif args.command == "enable":
+            enable(args.months_ahead)
+        elif args.command == "maintain":
+            maintain(args.months_ahead, args.retention_months, args.archive)
+    except PartitioningNotSupportedError as exc:
+        parser.exit(1, f"{exc}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Aplica las políticas de retención (retention_policies) a measurements y
+measurement_rollups.
+
+    python -m app.commands.retention run                 # una pasada (cron)
+    python -m app.commands.retention run --policy-id 2
+    python -m app.commands.retention run --loop          # cada RETENTION_INTERVAL_MINUTES
+
+Borra en lotes de RETENTION_BATCH_SIZE filas con un commit por lote, así
+que se puede interrumpir en cualquier momento.
+"""
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.archive_service import measurement_archive
+from app.services.retention_service import RetentionService
+
+logger = logging.getLogger(__name__)
+
+
+def run(policy_id: Optional[int] = None) -> None:
+    db = SessionLocal()
+    try:
+        service = RetentionService(
+            db,
+            batch_size=settings.RETENTION_BATCH_SIZE,
+            pause_ms=settings.RETENTION_BATCH_PAUSE_MS,
+            archive=measurement_archive,
+        )
+        result = service.run(policy_id=policy_id)
+        logger.info(
+            "retención: %s mediciones y %s agregados eliminados en %.1f s",
+            result.raw_deleted,
+            result.rollups_deleted,
+            (result.finished_at - result.started_at).total_seconds(),
+        )
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Políticas de retención de mediciones")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("run", help="elimina los datos fuera de plazo")
+    cmd.add_argument("--policy-id", type=int, default=None)
+    cmd.add_argument("--loop", action="store_true", help="repetir cada RETENTION_INTERVAL_MINUTES")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "run":
+        while True:
+            try:
+                run(policy_id=args.policy_id)
+            except Exception:
+                if not args.loop:
+                    raise
+                logger.exception("fallo aplicando la retención; se reintenta en la próxima pasada")
+            if not args.loop:
+                break
+            time.sleep(settings.RETENTION_INTERVAL_MINUTES * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Construye measurement_rollups a partir del histórico de measurements.
+
+    python -m app.commands.rollups backfill                      # todo el histórico
+    python -m app.commands.rollups backfill --sensor-id 3
+    python -m app.commands.rollups backfill --from 2026-01-01 --to 2026-02-01
+
+Recalcula día a día (UTC) y sensor a sensor, con un commit por día:
+se puede interrumpir y relanzar sin dejar agregados a medias.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from app.db.session import SessionLocal
+from app.models.measurement import Measurement
+from app.models.sensor import Sensor
+from app.services.measurement_service import to_utc_naive
+from app.services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(
+    sensor_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> None:
+    db = SessionLocal()
+    try:
+        if sensor_id is not None:
+            sensor_ids = [sensor_id]
+        else:
+            sensor_ids = [s for (s,) in db.query(Sensor.id).order_by(Sensor.id).all()]
+
+        service = RollupService(db)
+        for current in sensor_ids:
+            first, last = (
+                db.query(func.min(Measurement.timestamp), func.max(Measurement.timestamp))
+                .filter(Measurement.sensor_id == current)
+                .one()
+            )
+            if first is None:
+                continue
+
+            # El rango es semiabierto: +1 µs para incluir la última lectura
+            range_start = max(start, first) if start else first
+            range_end = min(end, last + timedelta(microseconds=1)) if end else last + timedelta(microseconds=1)
+            if range_end <= range_start:
+                continue
+
+            result = service.rebuild(range_start, range_end, sensor_id=current)
+            logger.info("sensor %s: %s mediciones → %s", current, result.measurements, result.buckets)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Agregados de mediciones (measurement_rollups)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("backfill", help="recalcula los agregados desde measurements")
+    cmd.add_argument("--sensor-id", type=int, default=None)
+    cmd.add_argument("--from", dest="start", type=datetime.fromisoformat, default=None)
+    cmd.add_argument("--to", dest="end", type=datetime.fromisoformat, default=None)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "backfill":
+        backfill(
+            sensor_id=args.sensor_id,
+            start=to_utc_naive(args.start) if args.start else None,
+            end=to_utc_naive(args.end) if args.end else None,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,6 +18,90 @@ class Settings(BaseSettings):
 
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
 
+    # Paginación por cursor de los listados (?limit=&cursor=)
+    PAGINATION_DEFAULT_LIMIT: int = 50
+    PAGINATION_MAX_LIMIT: int = 500
+
+    # Ingesta de mediciones
+    MEASUREMENTS_BULK_MAX_ITEMS: int = 5000
+    MEASUREMENTS_STREAM_CHUNK_SIZE: int = 1000
+    MEASUREMENTS_STREAM_MAX_LINE_BYTES: int = 65536
+    MEASUREMENTS_STREAM_MAX_ERRORS: int = 1000
+    MEASUREMENTS_BINARY_MAX_RECORDS: int = 100000
+    # Segundos que se cachean los sensores de cada zona (POST /devices/{id}/readings)
+    DEVICE_ZONE_SENSORS_CACHE_TTL_SECONDS: int = 60
+    # Horas durante las que se recuerda una cabecera Idempotency-Key
+    INGESTION_IDEMPOTENCY_TTL_HOURS: int = 24
+
+    # Buffer write-behind para POST /measurements/ (desactivado por defecto)
+    MEASUREMENTS_WRITE_BEHIND_ENABLED: bool = False
+    MEASUREMENTS_WRITE_BEHIND_BATCH_SIZE: int = 500
+    MEASUREMENTS_WRITE_BEHIND_FLUSH_MS: int = 200
+    MEASUREMENTS_WRITE_BEHIND_HIGH_WATER_MARK: int = 20000
+    MEASUREMENTS_WRITE_BEHIND_RETRY_AFTER_SECONDS: int = 1
+    # Reintentos de un lote que falla al escribirse (espera exponencial)
+    MEASUREMENTS_WRITE_BEHIND_MAX_RETRIES: int = 8
+    MEASUREMENTS_WRITE_BEHIND_RETRY_BACKOFF_MS: int = 500
+    # Plazo para vaciar la cola al apagar; lo que quede se registra como descartado
+    MEASUREMENTS_WRITE_BEHIND_STOP_TIMEOUT_SECONDS: float = 10.0
+
+    # Worker de ingesta desde broker (python -m app.workers.ingest)
+    # memory:// o "paquete.modulo:ClaseBroker"
+    INGEST_BROKER_URL: str = "memory://"
+    INGEST_WORKER_BATCH_SIZE: int = 500
+    INGEST_WORKER_MAX_WAIT_MS: int = 200
+    INGEST_WORKER_REPORT_SECONDS: int = 10
+    # Intentos de un lote que falla por sus datos antes de aislar las filas malas
+    INGEST_WORKER_MAX_ATTEMPTS: int = 5
+
+    # Mantener measurement_rollups (1m/1h/1d) al insertar mediciones
+    MEASUREMENT_ROLLUPS_ENABLED: bool = True
+
+    # Mantener measurement_blocks (bloques horarios comprimidos) al insertar
+    MEASUREMENT_BLOCKS_ENABLED: bool = False
+
+    # Segundos que se cachea en proceso la última lectura de cada sensor
+    # (cubre las ingestas hechas desde otros procesos)
+    SENSOR_LATEST_CACHE_TTL_SECONDS: int = 5
+
+    # Máximo de intervalos por respuesta en GET /sensors/{id}/measurements?bucket=
+    MEASUREMENTS_MAX_BUCKETS: int = 10000
+
+    # Máximo de lecturas crudas que se reducen con LTTB en
+    # GET /sensors/{id}/measurements?max_points=; por encima se parte de
+    # los rollups de 1m (o de measurement_blocks)
+    MEASUREMENTS_DOWNSAMPLE_MAX_RAW_ROWS: int = 200000
+
+    # Máximo de celdas (sensores × intervalos) en GET /measurements/matrix
+    MEASUREMENTS_MATRIX_MAX_CELLS: int = 500000
+
+    # Particionado mensual de measurements (python -m app.commands.partitions)
+    MEASUREMENTS_PARTITION_MONTHS_AHEAD: int = 3
+    # Meses de lecturas crudas que se conservan; 0 = no expirar nunca
+    MEASUREMENTS_PARTITION_RETENTION_MONTHS: int = 0
+
+    # Políticas de retención (python -m app.commands.retention)
+    RETENTION_BATCH_SIZE: int = 5000
+    # Pausa entre lotes de borrado para no acaparar measurements
+    RETENTION_BATCH_PAUSE_MS: int = 50
+    RETENTION_INTERVAL_MINUTES: int = 60
+
+    # Archivo frío de mediciones (.npy por sensor y mes). Si está definido,
+    # la retención archiva los meses completos antes de borrarlos.
+    MEASUREMENTS_ARCHIVE_DIR: Optional[str] = None
+
+    # Filas por lote del cursor de servidor en las exportaciones CSV/NDJSON
+    MEASUREMENTS_EXPORT_BATCH_SIZE: int = 5000
+    # Exportación Arrow/Parquet: filas por RecordBatch/row group y horas
+    # de cada ventana de consulta
+    MEASUREMENTS_ARROW_BATCH_SIZE: int = 50000
+    MEASUREMENTS_ARROW_CHUNK_HOURS: int = 24
+
+    # Evaluar umbrales y reglas de automatización al ingerir mediciones
+    INGESTION_EVALUATE_RULES: bool = True
+    # Registrar un log "skipped" por cada regla evaluada que no se dispara
+    AUTOMATION_LOG_SKIPPED: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,10 @@
+from app.crud.base import CRUDBase
+from app.models.cultivation_zone import CultivationZone
+from app.schemas.cultivation_zone import CultivationZoneCreate, CultivationZoneUpdate
+
+
+class CRUDCultivationZone(CRUDBase[CultivationZone, CultivationZoneCreate, CultivationZoneUpdate]):
+    pass
+
+
+cultivation_zone = CRUDCultivationZone(CultivationZone)
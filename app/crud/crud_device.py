@@ -0,0 +1,10 @@
+from app.crud.base import CRUDBase
+from app.models.device import Device
+from app.schemas.device import DeviceCreate, DeviceUpdate
+
+
+class CRUDDevice(CRUDBase[Device, DeviceCreate, DeviceUpdate]):
+    pass
+
+
+device = CRUDDevice(Device)
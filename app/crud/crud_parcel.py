@@ -0,0 +1,10 @@
+from app.crud.base import CRUDBase
+from app.models.parcel import Parcel
+from app.schemas.parcel import ParcelCreate, ParcelUpdate
+
+
+class CRUDParcel(CRUDBase[Parcel, ParcelCreate, ParcelUpdate]):
+    pass
+
+
+parcel = CRUDParcel(Parcel)
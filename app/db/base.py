@@ -17,6 +17,11 @@ from app.models.actuator import Actuator
 from app.models.device import Device
 
 from app.models.measurement import Measurement
+from app.models.measurement_rollup import MeasurementRollup
+from app.models.measurement_block import MeasurementBlock
+from app.models.sensor_latest import SensorLatest
+from app.models.retention_policy import RetentionPolicy
+from app.models.ingestion_request import IngestionRequest
 from app.models.alert import Alert
 
 from app.models.camera import Camera
@@ -0,0 +1,30 @@
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Instante de una lectura con microsegundos. En MySQL DateTime es un
+# DATETIME de precisión de segundo: las lecturas de más de 1 Hz de un
+# sensor chocarían en el índice único (sensor_id, timestamp) y la
+# deduplicación compararía claves con µs contra valores truncados.
+PreciseDateTime = DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+class precise_now(FunctionElement):
+    """
+    CURRENT_TIMESTAMP para server_default de columnas PreciseDateTime:
+    MySQL exige que la precisión del DEFAULT coincida con la de la columna.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(precise_now)
+def _precise_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(precise_now, "mysql")
+def _precise_now_mysql(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP(6)"
@@ -1,5 +1,6 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.db.session import SessionLocal, engine
@@ -7,6 +8,8 @@ from app.db.init_db import init_db
 from app.db import base as models_base
 
 from app.api import api_router
+from app.services.write_buffer import measurement_write_buffer
+from app.utils.pagination import InvalidCursorError
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -27,6 +30,11 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Cursor de paginación mal formado o de otro listado
+    @app.exception_handler(InvalidCursorError)
+    def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
     # Crear tablas
     models_base.Base.metadata.create_all(bind=engine)
 
@@ -37,6 +45,14 @@ def create_app() -> FastAPI:
         init_db(db)
         db.close()
 
+        if settings.MEASUREMENTS_WRITE_BEHIND_ENABLED:
+            measurement_write_buffer.start()
+
+    @app.on_event("shutdown")
+    def shutdown_event():
+        # Vaciar la cola de mediciones pendientes antes de salir
+        measurement_write_buffer.stop(timeout=settings.MEASUREMENTS_WRITE_BEHIND_STOP_TIMEOUT_SECONDS)
+
     # ✅ MONTAR TODOS LOS ENDPOINTS /api/v1/...
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
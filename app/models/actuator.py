@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,10 @@ from app.db.session import Base
 class Actuator(Base):
     __tablename__ = "actuators"
 
+    # Listado paginado por cursor (created_at, id)
+    __table_args__ = (
+        Index("ix_actuators_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
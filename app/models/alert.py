@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,12 @@ from app.db.session import Base
 class Alert(Base):
     __tablename__ = "alerts"
 
+    # Listado global y por zona, más recientes primero
+    __table_args__ = (
+        Index("ix_alerts_created_at", "created_at"),
+        Index("ix_alerts_zone_created_at", "zone_id", "created_at"),
+    )
+
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class AutomationLog(Base):
     __tablename__ = "automation_logs"
 
+    # GET /automation/logs ordena por created_at desc
+    __table_args__ = (
+        Index("ix_automation_logs_created_at", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Resultado de la ejecución
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class AutomationRule(Base):
     __tablename__ = "automation_rules"
 
+    # Reglas activas de una zona por prioridad (evaluación en cada ingesta)
+    __table_args__ = (
+        Index("ix_automation_rules_zone_active_priority", "zone_id", "is_active", "priority"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Nombre de la regla
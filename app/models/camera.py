@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class Camera(Base):
     __tablename__ = "cameras"
 
+    # Listado paginado por cursor (created_at, id)
+    __table_args__ = (
+        Index("ix_cameras_created_at_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     name = Column(String(150), nullable=False)                  # Ej: "Cam NDVI Zona 1"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -8,6 +8,13 @@ from app.db.session import Base
 class Image(Base):
     __tablename__ = "images"
 
+    # Imágenes de una cámara, más recientes primero; listado general
+    # paginado por cursor (created_at, id)
+    __table_args__ = (
+        Index("ix_images_camera_captured_at", "camera_id", "captured_at"),
+        Index("ix_images_created_at_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     camera_id = Column(Integer, ForeignKey("cameras.id", ondelete="CASCADE"), nullable=False)
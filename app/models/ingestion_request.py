@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, func
+
+from app.db.session import Base
+
+
+class IngestionRequest(Base):
+    __tablename__ = "ingestion_requests"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Clave enviada por el cliente en la cabecera Idempotency-Key
+    idempotency_key = Column(String(100), unique=True, nullable=False)
+
+    # Endpoint que procesó la petición (ej: "measurements.bulk")
+    endpoint = Column(String(100), nullable=False)
+
+    # Respuesta devuelta la primera vez; se repite tal cual en reintentos
+    response = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -1,12 +1,22 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
+from app.db.types import PreciseDateTime, precise_now
 
 
 class Measurement(Base):
     __tablename__ = "measurements"
 
+    # Clave natural: una lectura por sensor e instante. Permite ingesta
+    # idempotente (INSERT IGNORE) cuando un gateway reintenta un envío.
+    # El índice único (sensor_id, timestamp) sirve también a las lecturas
+    # por sensor: últimas N y rangos de tiempo sin filesort.
+    __table_args__ = (
+        UniqueConstraint("sensor_id", "timestamp", name="uq_measurements_sensor_timestamp"),
+        # GET /measurements/ (todas, más recientes primero)
+        Index("ix_measurements_timestamp", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -21,7 +31,8 @@ class Measurement(Base):
     sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
 
     sensor = relationship("Sensor", back_populates="measurements")
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Microsegundos también en MySQL (DATETIME(6)), ver app.db.types
+    timestamp = Column(PreciseDateTime, server_default=precise_now())
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, LargeBinary, UniqueConstraint, func
+
+from app.db.session import Base
+
+
+class MeasurementBlock(Base):
+    """
+    Lecturas de un sensor durante una hora, comprimidas en un único BLOB
+    (delta-of-delta para timestamps y XOR para valores, ver
+    app.utils.gorilla). Una fila sustituye a miles de filas de
+    measurements para lecturas de rango y almacenamiento a largo plazo.
+    """
+
+    __tablename__ = "measurement_blocks"
+
+    __table_args__ = (
+        UniqueConstraint("sensor_id", "block_start", name="uq_measurement_blocks_sensor_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
+
+    # Inicio de la hora, UTC sin zona (igual que measurements.timestamp)
+    block_start = Column(DateTime, nullable=False)
+
+    samples = Column(Integer, nullable=False)
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+
+    # MEDIUMBLOB en MySQL (hasta 16 MB por hora)
+    data = Column(LargeBinary(length=2**24 - 1), nullable=False)
+    # Estado del codificador tras el último punto (gorilla.BlockEncoder):
+    # permite añadir lecturas sin decodificar la hora. NULL en bloques
+    # anteriores a la columna
+    tail = Column(LargeBinary(length=64), nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint, func
+
+from app.db.session import Base
+
+
+class MeasurementRollup(Base):
+    """
+    Agregado de las mediciones de un sensor en un intervalo fijo
+    (1m, 1h, 1d). Se mantiene al insertar mediciones y se puede
+    reconstruir desde measurements (datos tardíos, ediciones, backfill).
+    """
+
+    __tablename__ = "measurement_rollups"
+
+    __table_args__ = (
+        UniqueConstraint("sensor_id", "resolution", "bucket_start", name="uq_measurement_rollups_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
+
+    # "1m", "1h" o "1d"
+    resolution = Column(String(3), nullable=False)
+
+    # Inicio del intervalo, UTC sin zona (igual que measurements.timestamp)
+    bucket_start = Column(DateTime, nullable=False)
+
+    samples = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    # Suma de cuadrados: permite calcular la desviación estándar
+    value_sum_sq = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+
+    # Primera y última lectura del intervalo, por timestamp
+    value_first = Column(Float, nullable=False)
+    first_at = Column(DateTime, nullable=False)
+    value_last = Column(Float, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
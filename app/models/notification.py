@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,12 @@ from app.db.session import Base
 class Notification(Base):
     __tablename__ = "notifications"
 
+    # Bandeja del usuario (recientes primero) y conteo de no leídas
+    __table_args__ = (
+        Index("ix_notifications_user_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_is_read", "user_id", "is_read"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Título corto de la notificación
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class Report(Base):
     __tablename__ = "reports"
 
+    # Listado de reportes, más recientes primero
+    __table_args__ = (
+        Index("ix_reports_created_at", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     title = Column(String(200), nullable=False)
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy.orm import relationship
+
+from app.db.session import Base
+
+
+class RetentionPolicy(Base):
+    """
+    Cuánto tiempo se conservan las mediciones crudas y cada resolución de
+    measurement_rollups. El alcance lo dan sensor_type y zone_id (ambos
+    vacíos = política por defecto); a cada sensor se le aplica la más
+    específica. Un plazo NULL significa conservar para siempre.
+    """
+
+    __tablename__ = "retention_policies"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    name = Column(String(150), nullable=False)
+
+    # Alcance: tipo de sensor (temp, humedad, ph…) y/o zona
+    sensor_type = Column(String(100), nullable=True)
+    zone_id = Column(Integer, ForeignKey("cultivation_zones.id", ondelete="CASCADE"), nullable=True)
+
+    zone = relationship("CultivationZone")
+
+    # Plazos en días
+    raw_retention_days = Column(Integer, nullable=True)
+    rollup_1m_retention_days = Column(Integer, nullable=True)
+    rollup_1h_retention_days = Column(Integer, nullable=True)
+    rollup_1d_retention_days = Column(Integer, nullable=True)
+
+    is_active = Column(Boolean, default=True)
+
+    # Resultado de la última ejecución
+    last_run_at = Column(DateTime, nullable=True)
+    last_run_raw_deleted = Column(Integer, nullable=True)
+    last_run_rollups_deleted = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, event, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class Sensor(Base):
     __tablename__ = "sensors"
 
+    # Listado paginado por cursor (created_at, id)
+    __table_args__ = (
+        Index("ix_sensors_created_at_id", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     name = Column(String(150), nullable=False)
@@ -27,11 +32,13 @@ class Sensor(Base):
     # Zona a la que pertenece
     zone = relationship("CultivationZone", back_populates="sensors")
 
-    # Mediciones del sensor
+    # Mediciones del sensor. No se cargan para borrarlas una a una:
+    # ver _delete_measurements (la tabla particionada no tiene FK).
     measurements = relationship(
         "Measurement",
         back_populates="sensor",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     # 🔹 ESTA ES LA RELACIÓN QUE FALTABA
@@ -49,3 +56,17 @@ class Sensor(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+
+
+@event.listens_for(Sensor, "before_delete")
+def _delete_measurements(mapper, connection, target):
+    """
+    Borra las mediciones del sensor con un único DELETE por sensor_id.
+    Cubre también el borrado en cascada desde la zona y sustituye al
+    ON DELETE CASCADE cuando measurements está particionada.
+    """
+    from app.models.measurement import Measurement
+
+    connection.execute(
+        Measurement.__table__.delete().where(Measurement.sensor_id == target.id)
+    )
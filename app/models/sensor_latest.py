@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, func
+
+from app.db.session import Base
+from app.db.types import PreciseDateTime
+
+
+class SensorLatest(Base):
+    """
+    Última lectura de cada sensor (una fila por sensor). Se actualiza en
+    cada ingesta para que el estado actual de una zona no tenga que
+    buscar en measurements.
+    """
+
+    __tablename__ = "sensor_latest"
+
+    sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), primary_key=True)
+
+    value = Column(Float, nullable=False)
+    unit = Column(String(20), nullable=True)
+    status = Column(String(50), nullable=True)
+
+    # Timestamp de la lectura, UTC sin zona (igual que measurements.timestamp)
+    timestamp = Column(PreciseDateTime, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Float, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -7,6 +7,11 @@ from app.db.session import Base
 class ThresholdConfig(Base):
     __tablename__ = "threshold_configs"
 
+    # Umbrales activos por sensor (evaluación en cada ingesta)
+    __table_args__ = (
+        Index("ix_threshold_configs_sensor_active", "sensor_id", "is_active"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Tipo de variable monitoreada (temperature, humidity, ph, ndvi, etc.)
@@ -59,6 +59,9 @@ from app.schemas.device import (
     DeviceInDBBase,
     Device,
     DeviceInDB,
+    DeviceReading,
+    DeviceReadingsIn,
+    DeviceReadingsResult,
 )
 from app.schemas.measurement import (
     MeasurementBase,
@@ -67,6 +70,37 @@ from app.schemas.measurement import (
     MeasurementInDBBase,
     Measurement,
     MeasurementInDB,
+    MeasurementBulkItemResult,
+    MeasurementBulkResult,
+    MeasurementStreamLineError,
+    MeasurementStreamResult,
+    MeasurementBinaryResult,
+    MeasurementQueued,
+    WriteBufferMetrics,
+    IngestWorkerMetrics,
+    MeasurementPipelineResult,
+    MeasurementBucket,
+    MeasurementPoint,
+    MeasurementMatrix,
+    MeasurementMatrixSeries,
+)
+from app.schemas.measurement_rollup import (
+    MeasurementRollupBase,
+    MeasurementRollupInDBBase,
+    MeasurementRollup,
+    MeasurementRollupInDB,
+    MeasurementRollupRebuildResult,
+)
+from app.schemas.sensor_latest import SensorLatest
+from app.schemas.retention_policy import (
+    RetentionPolicyBase,
+    RetentionPolicyCreate,
+    RetentionPolicyUpdate,
+    RetentionPolicyInDBBase,
+    RetentionPolicy,
+    RetentionPolicyInDB,
+    RetentionPolicyRunResult,
+    RetentionRunResult,
 )
 from app.schemas.alert import (
     AlertBase,
@@ -188,12 +222,42 @@ __all__ = [
     "DeviceInDBBase",
     "Device",
     "DeviceInDB",
+    "DeviceReading",
+    "DeviceReadingsIn",
+    "DeviceReadingsResult",
     "MeasurementBase",
     "MeasurementCreate",
     "MeasurementUpdate",
     "MeasurementInDBBase",
     "Measurement",
     "MeasurementInDB",
+    "MeasurementBulkItemResult",
+    "MeasurementBulkResult",
+    "MeasurementStreamLineError",
+    "MeasurementStreamResult",
+    "MeasurementBinaryResult",
+    "MeasurementQueued",
+    "WriteBufferMetrics",
+    "IngestWorkerMetrics",
+    "MeasurementPipelineResult",
+    "MeasurementBucket",
+    "MeasurementPoint",
+    "MeasurementMatrix",
+    "MeasurementMatrixSeries",
+    "MeasurementRollupBase",
+    "MeasurementRollupInDBBase",
+    "MeasurementRollup",
+    "MeasurementRollupInDB",
+    "MeasurementRollupRebuildResult",
+    "SensorLatest",
+    "RetentionPolicyBase",
+    "RetentionPolicyCreate",
+    "RetentionPolicyUpdate",
+    "RetentionPolicyInDBBase",
+    "RetentionPolicy",
+    "RetentionPolicyInDB",
+    "RetentionPolicyRunResult",
+    "RetentionRunResult",
     "AlertBase",
     "AlertCreate",
     "AlertUpdate",
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
@@ -62,3 +62,29 @@ class Device(DeviceInDBBase):
 # -----------------------
 class DeviceInDB(DeviceInDBBase):
     pass
+
+
+# -----------------------
+# LECTURAS DEL GATEWAY
+# -----------------------
+class DeviceReading(BaseModel):
+    sensor_id: int
+    value: float
+    unit: Optional[str] = None
+    status: Optional[str] = None
+    # Si falta se usa el timestamp del envío
+    timestamp: Optional[datetime] = None
+
+
+class DeviceReadingsIn(BaseModel):
+    # Hora de captura común a todo el ciclo del gateway
+    timestamp: Optional[datetime] = None
+    readings: List[DeviceReading]
+
+
+class DeviceReadingsResult(BaseModel):
+    device_id: int
+    received: int
+    inserted: int
+    duplicates: int
+    last_seen: datetime
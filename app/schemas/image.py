@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 # -----------------------
@@ -51,6 +51,14 @@ class ImageUpdate(BaseModel):
 # BASE DESDE BD
 # -----------------------
 class ImageInDBBase(ImageBase):
+    # Desde el ORM se lee image_metadata: el atributo "metadata" de un
+    # modelo declarativo es el MetaData de SQLAlchemy, no la columna
+    image_metadata: Optional[Any] = Field(
+        default=None,
+        validation_alias=AliasChoices("image_metadata", "metadata"),
+        serialization_alias="metadata",
+    )
+
     id: int
     captured_at: datetime
     created_at: Optional[datetime]
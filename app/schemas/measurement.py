@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
@@ -43,3 +43,167 @@ class Measurement(MeasurementInDBBase):
 
 class MeasurementInDB(MeasurementInDBBase):
     pass
+
+
+# -----------------------
+# INGESTA EN LOTE
+# -----------------------
+class MeasurementBulkItemResult(BaseModel):
+    # Posición del elemento dentro del lote recibido
+    index: int
+    accepted: bool
+    # Aceptada pero ya existía (mismo sensor_id y timestamp): no se reinsertó
+    duplicate: bool = False
+    error: Optional[str] = None
+
+
+class MeasurementBulkResult(BaseModel):
+    received: int
+    accepted: int
+    rejected: int
+    # accepted = inserted + duplicates
+    inserted: int = 0
+    duplicates: int = 0
+    results: List[MeasurementBulkItemResult]
+
+
+# -----------------------
+# INGESTA NDJSON EN STREAMING
+# -----------------------
+class MeasurementStreamLineError(BaseModel):
+    # Número de línea (1-based) dentro del cuerpo NDJSON
+    line: int
+    error: str
+
+
+class MeasurementStreamResult(BaseModel):
+    lines: int
+    accepted: int
+    rejected: int
+    inserted: int = 0
+    duplicates: int = 0
+    chunks: int
+    errors: List[MeasurementStreamLineError]
+    # True si hubo más errores de los que se devuelven
+    errors_truncated: bool = False
+
+
+# -----------------------
+# INGESTA BINARIA
+# -----------------------
+class MeasurementBinaryResult(BaseModel):
+    received: int
+    accepted: int
+    rejected: int
+    inserted: int = 0
+    duplicates: int = 0
+    # Registros descartados por valor NaN/Inf
+    invalid_values: int = 0
+    unknown_sensor_ids: List[int] = []
+
+
+# -----------------------
+# PIPELINE DE REGLAS EN INGESTA
+# -----------------------
+class MeasurementPipelineResult(BaseModel):
+    measurements: int = 0
+    alerts: int = 0
+    automation_logs: int = 0
+    actuator_actions: int = 0
+
+
+# -----------------------
+# BUFFER WRITE-BEHIND
+# -----------------------
+class MeasurementQueued(BaseModel):
+    status: str = "queued"
+    sensor_id: int
+    queue_depth: int
+
+
+class WriteBufferMetrics(BaseModel):
+    enabled: bool
+    running: bool
+    queue_depth: int
+    high_water_mark: int
+    batch_size: int
+    flush_interval_ms: int
+
+    flushes: int
+    rows_flushed: int
+    rows_duplicated: int
+    rows_failed: int
+    rows_rejected: int
+    rows_retried: int
+    retry_pending: int
+
+    last_flush_rows: int
+    last_flush_ms: float
+    avg_flush_ms: float
+    max_flush_ms: float
+    avg_rows_per_flush: float
+
+
+# -----------------------
+# WORKER DE INGESTA (BROKER)
+# -----------------------
+class IngestWorkerMetrics(BaseModel):
+    messages_consumed: int
+    rows_inserted: int
+    rows_duplicated: int
+    rows_rejected: int
+    batches: int
+    write_retries: int
+    # Filas que la base de datos rechaza y se envían a Broker.dead_letter
+    rows_dead_lettered: int
+
+    # Lag: mensajes pendientes en el broker (None si no lo expone)
+    # y antigüedad del mensaje más viejo del último lote al escribirlo
+    lag_messages: Optional[int] = None
+    lag_seconds: float
+
+    last_batch_ms: float
+    avg_batch_ms: float
+    # Filas por segundo desde el arranque y en el último intervalo
+    throughput_rows_per_s: float
+    recent_rows_per_s: float
+
+
+# -----------------------
+# AGREGACIÓN POR INTERVALOS
+# -----------------------
+class MeasurementBucket(BaseModel):
+    bucket_start: datetime
+    count: int
+    # Solo se rellenan las agregaciones pedidas en `agg`
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sum: Optional[float] = None
+
+
+# -----------------------
+# SERIE REDUCIDA (LTTB)
+# -----------------------
+class MeasurementPoint(BaseModel):
+    timestamp: datetime
+    value: float
+
+
+# -----------------------
+# MATRIZ MULTISENSOR ALINEADA
+# -----------------------
+class MeasurementMatrixSeries(BaseModel):
+    sensor_id: int
+    unit: Optional[str] = None
+    # Un valor por timestamp del eje; None donde no hay dato (ni relleno)
+    values: List[Optional[float]]
+
+
+class MeasurementMatrix(BaseModel):
+    bucket_seconds: int
+    aggregation: str
+    fill: str
+    # Inicio de cada intervalo, común a todas las series
+    timestamps: List[datetime]
+    series: List[MeasurementMatrixSeries]
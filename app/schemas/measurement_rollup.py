@@ -0,0 +1,75 @@
+import math
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel, computed_field
+from pydantic import ConfigDict
+
+
+# -----------------------
+# BASE
+# -----------------------
+class MeasurementRollupBase(BaseModel):
+    sensor_id: int
+    resolution: str                   # 1m, 1h, 1d
+    bucket_start: datetime
+
+    samples: int
+    value_sum: float
+    value_sum_sq: float
+    value_min: float
+    value_max: float
+
+    value_first: float
+    first_at: datetime
+    value_last: float
+    last_at: datetime
+
+
+# -----------------------
+# BASE DESDE BD
+# -----------------------
+class MeasurementRollupInDBBase(MeasurementRollupBase):
+    id: int
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------
+# RESPUESTA API
+# -----------------------
+class MeasurementRollup(MeasurementRollupInDBBase):
+    @computed_field
+    @property
+    def value_avg(self) -> float:
+        return self.value_sum / self.samples
+
+    @computed_field
+    @property
+    def value_stddev(self) -> float:
+        # Desviación estándar poblacional a partir de la suma de cuadrados
+        mean = self.value_sum / self.samples
+        return math.sqrt(max(self.value_sum_sq / self.samples - mean * mean, 0.0))
+
+
+# -----------------------
+# INTERNO
+# -----------------------
+class MeasurementRollupInDB(MeasurementRollupInDBBase):
+    pass
+
+
+# -----------------------
+# RECONSTRUCCIÓN
+# -----------------------
+class MeasurementRollupRebuildResult(BaseModel):
+    sensor_id: Optional[int] = None
+    start: datetime
+    end: datetime
+    measurements: int
+    # Intervalos escritos por resolución
+    buckets: Dict[str, int]
+    # Días anteriores al corte de retención de las mediciones crudas: sus
+    # agregados son lo único que queda y no se tocan
+    skipped_days: int = 0
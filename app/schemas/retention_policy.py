@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+from pydantic import ConfigDict
+
+
+# -----------------------
+# BASE
+# -----------------------
+class RetentionPolicyBase(BaseModel):
+    name: str
+
+    # Alcance (ambos vacíos = política por defecto)
+    sensor_type: Optional[str] = None
+    zone_id: Optional[int] = None
+
+    # Días que se conservan; None = para siempre
+    raw_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1m_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1h_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1d_retention_days: Optional[int] = Field(default=None, ge=1)
+
+    is_active: bool = True
+
+
+# -----------------------
+# CREATE
+# -----------------------
+class RetentionPolicyCreate(RetentionPolicyBase):
+    pass
+
+
+# -----------------------
+# UPDATE
+# -----------------------
+class RetentionPolicyUpdate(BaseModel):
+    name: Optional[str] = None
+
+    sensor_type: Optional[str] = None
+    zone_id: Optional[int] = None
+
+    raw_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1m_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1h_retention_days: Optional[int] = Field(default=None, ge=1)
+    rollup_1d_retention_days: Optional[int] = Field(default=None, ge=1)
+
+    is_active: Optional[bool] = None
+
+
+# -----------------------
+# BASE DESDE BD
+# -----------------------
+class RetentionPolicyInDBBase(RetentionPolicyBase):
+    id: int
+
+    last_run_at: Optional[datetime] = None
+    last_run_raw_deleted: Optional[int] = None
+    last_run_rollups_deleted: Optional[int] = None
+
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------
+# RESPUESTA API
+# -----------------------
+class RetentionPolicy(RetentionPolicyInDBBase):
+    pass
+
+
+# -----------------------
+# INTERNO
+# -----------------------
+class RetentionPolicyInDB(RetentionPolicyInDBBase):
+    pass
+
+
+# -----------------------
+# EJECUCIÓN
+# -----------------------
+class RetentionPolicyRunResult(BaseModel):
+    policy_id: int
+    sensors: int
+    raw_deleted: int = 0
+    # Copiadas al archivo frío antes de borrarlas
+    raw_archived: int = 0
+    # Bloques horarios de measurement_blocks (mismo plazo que las crudas)
+    blocks_deleted: int = 0
+    rollup_1m_deleted: int = 0
+    rollup_1h_deleted: int = 0
+    rollup_1d_deleted: int = 0
+
+
+class RetentionRunResult(BaseModel):
+    started_at: datetime
+    finished_at: datetime
+    raw_deleted: int = 0
+    raw_archived: int = 0
+    blocks_deleted: int = 0
+    rollups_deleted: int = 0
+    policies: List[RetentionPolicyRunResult] = []
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+
+# -----------------------
+# RESPUESTA API
+# -----------------------
+class SensorLatest(BaseModel):
+    sensor_id: int
+    value: float
+    unit: Optional[str] = None
+    status: Optional[str] = None
+    timestamp: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,11 +1,17 @@
 from app.services.alert_service import AlertService
 from app.services.automation_service import AutomationService
+from app.services.device_service import DeviceService
+from app.services.idempotency_service import IdempotencyService
+from app.services.measurement_service import MeasurementService
 from app.services.notification_service import NotificationService
 from app.services.report_service import ReportService
 
 __all__ = [
     "AlertService",
     "AutomationService",
+    "DeviceService",
+    "IdempotencyService",
+    "MeasurementService",
     "NotificationService",
     "ReportService",
 ]
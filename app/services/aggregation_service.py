@@ -0,0 +1,311 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, cast, func, literal_column
+from sqlalchemy.orm import Session
+
+from app.models.measurement import Measurement
+from app.models.measurement_rollup import MeasurementRollup
+from app.schemas.measurement import MeasurementBucket
+from app.services.archive_service import MeasurementArchive
+from app.services.rollup_service import BUCKET_SIZE, bucket_start
+
+EPOCH = datetime(1970, 1, 1)
+
+AGGREGATIONS = ("avg", "min", "max", "sum", "count")
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_BUCKET_RE = re.compile(r"^(\d+)([smhd])$")
+
+
+class InvalidBucketError(ValueError):
+    """Tamaño de intervalo o agregación no reconocidos."""
+
+
+def parse_bucket(value: str) -> int:
+    """'30s', '5m', '1h', '1d' → segundos."""
+    match = _BUCKET_RE.match(value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise InvalidBucketError(f"Intervalo no válido: {value!r} (ej. 30s, 5m, 1h, 1d)")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def parse_aggregations(value: str) -> List[str]:
+    aggs = [a.strip().lower() for a in value.split(",") if a.strip()]
+    unknown = [a for a in aggs if a not in AGGREGATIONS]
+    if unknown or not aggs:
+        raise InvalidBucketError(
+            f"Agregación no válida: {', '.join(unknown) or value!r} "
+            f"(disponibles: {', '.join(AGGREGATIONS)})"
+        )
+    return aggs
+
+
+def rollup_resolutions(bucket_seconds: int) -> List[str]:
+    """Resoluciones de rollups que dividen el intervalo, de la más gruesa a la más fina."""
+    return [
+        resolution
+        for resolution in ("1d", "1h", "1m")
+        if bucket_seconds % int(BUCKET_SIZE[resolution].total_seconds()) == 0
+    ]
+
+
+def _ceil(ts: datetime, resolution: str) -> datetime:
+    start = bucket_start(ts, resolution)
+    return start if start == ts else start + BUCKET_SIZE[resolution]
+
+
+Segment = Tuple[Optional[str], Optional[datetime], Optional[datetime]]
+
+
+def plan_ranges(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    resolutions: Sequence[str],
+) -> List[Segment]:
+    """
+    Reparte [start, end) en tramos (resolución, desde, hasta): cada
+    resolución cubre la parte alineada a sus intervalos y los bordes
+    sueltos pasan a la siguiente más fina y, al final, a las filas
+    crudas (resolución None). Un rollup solo se lee si cae entero dentro
+    del rango. None en desde/hasta es sin límite.
+    """
+    if start is not None and end is not None and start >= end:
+        return []
+    if not resolutions:
+        return [(None, start, end)]
+
+    resolution, finer = resolutions[0], resolutions[1:]
+    lo = _ceil(start, resolution) if start is not None else None
+    hi = bucket_start(end, resolution) if end is not None else None
+    if lo is not None and hi is not None and lo >= hi:
+        return plan_ranges(start, end, finer)
+
+    before = plan_ranges(start, lo, finer) if lo is not None else []
+    after = plan_ranges(hi, end, finer) if hi is not None else []
+    return before + [(resolution, lo, hi)] + after
+
+
+def epoch_seconds(db: Session, column):
+    """Segundos desde epoch de una columna DateTime UTC naive, según el motor."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        # TIMESTAMPDIFF no depende de la zona horaria de la sesión (UNIX_TIMESTAMP sí)
+        return func.timestampdiff(literal_column("SECOND"), "1970-01-01 00:00:00", column)
+    if dialect == "sqlite":
+        return cast(func.strftime("%s", column), Integer)
+    return cast(func.extract("epoch", column), Integer)
+
+
+def _fold(merged: Dict[Tuple[int, int], List[Any]], rows: Iterable[Sequence[Any]]) -> None:
+    """Acumula filas (sensor_id, bucket_epoch, count, sum, min, max) por intervalo."""
+    # SUM de enteros llega como Decimal en MySQL
+    for sensor_id, bucket_epoch, count, total, low, high in rows:
+        key = (sensor_id, int(bucket_epoch))
+        row = merged.get(key)
+        if row is None:
+            merged[key] = [int(count), float(total), low, high]
+        else:
+            row[0] += int(count)
+            row[1] += float(total)
+            row[2] = min(row[2], low)
+            row[3] = max(row[3], high)
+
+
+def _sensor_filter(column, sensor_ids: Sequence[int]):
+    # Con un solo sensor, igualdad: el plan es el mismo que antes de admitir varios
+    if len(sensor_ids) == 1:
+        return column == sensor_ids[0]
+    return column.in_(sensor_ids)
+
+
+class AggregationService:
+    """
+    Agregación por intervalos de tiempo de las mediciones de un sensor,
+    calculada en la base de datos (GROUP BY sobre el timestamp truncado).
+
+    Si el intervalo es múltiplo de una resolución de measurement_rollups
+    (1m, 1h, 1d) y use_rollups es True, se agregan los rollups en lugar
+    de las filas crudas: un intervalo de 5m lee 5 filas de rollups en vez
+    de cientos de mediciones. Los bordes de [start, end) que no caen en
+    intervalos completos de rollup se leen de la resolución siguiente o
+    de measurements (plan_ranges). Los intervalos van alineados a epoch UTC.
+
+    Con archive, los tramos crudos incluyen también las lecturas del
+    archivo frío anteriores a las que quedan en measurements.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        use_rollups: bool = True,
+        archive: Optional[MeasurementArchive] = None,
+    ):
+        self.db = db
+        self.use_rollups = use_rollups
+        self.archive = archive
+
+    def buckets(
+        self,
+        sensor_id: int,
+        bucket_seconds: int,
+        aggregations: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[MeasurementBucket]:
+        wanted = set(aggregations)
+        out: List[MeasurementBucket] = []
+        for _, bucket_epoch, count, total, low, high in self.rows(
+            [sensor_id], bucket_seconds, start, end, limit
+        ):
+            out.append(
+                MeasurementBucket(
+                    bucket_start=EPOCH + timedelta(seconds=int(bucket_epoch)),
+                    count=count,
+                    avg=total / count if "avg" in wanted else None,
+                    min=low if "min" in wanted else None,
+                    max=high if "max" in wanted else None,
+                    sum=total if "sum" in wanted else None,
+                )
+            )
+        return out
+
+    def columns(
+        self,
+        sensor_id: int,
+        bucket_seconds: int,
+        aggregations: Sequence[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Any]]:
+        """Los mismos intervalos que buckets(), como un array por campo (?format=columnar)."""
+        rows = self.rows([sensor_id], bucket_seconds, start, end, limit)
+        out: Dict[str, List[Any]] = {
+            "bucket_start": [(EPOCH + timedelta(seconds=row[1])).isoformat() for row in rows],
+            "count": [row[2] for row in rows],
+        }
+        if "avg" in aggregations:
+            out["avg"] = [row[3] / row[2] for row in rows]
+        if "min" in aggregations:
+            out["min"] = [row[4] for row in rows]
+        if "max" in aggregations:
+            out["max"] = [row[5] for row in rows]
+        if "sum" in aggregations:
+            out["sum"] = [row[3] for row in rows]
+        return out
+
+    def rows(
+        self,
+        sensor_ids: Sequence[int],
+        bucket_seconds: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, int, int, float, Any, Any]]:
+        """
+        Filas (sensor_id, bucket_epoch, count, sum, min, max) de varios
+        sensores, ordenadas por sensor e intervalo. Cada tramo de
+        plan_ranges es una consulta y los intervalos que comparten dos
+        tramos se combinan. Con limit y sin start se devuelven los
+        `limit` intervalos más recientes.
+        """
+        newest = limit is not None and start is None
+        resolutions = rollup_resolutions(bucket_seconds) if self.use_rollups else []
+
+        merged: Dict[Tuple[int, int], List[Any]] = {}
+        for resolution, lo, hi in plan_ranges(start, end, resolutions):
+            if resolution is not None:
+                q = self._from_rollups(sensor_ids, bucket_seconds, resolution, lo, hi)
+            else:
+                q = self._from_measurements(sensor_ids, bucket_seconds, lo, hi)
+                if self.archive is not None:
+                    _fold(merged, self._from_archive(sensor_ids, bucket_seconds, lo, hi))
+
+            order = [literal_column("sensor_id"), literal_column("bucket_epoch")]
+            q = q.group_by(*order).order_by(*[c.desc() if newest else c for c in order])
+            if limit is not None:
+                # Ningún tramo aporta más de limit claves a las `limit` primeras
+                q = q.limit(limit)
+
+            _fold(merged, q.all())
+
+        keys = sorted(merged, reverse=newest)
+        if limit is not None:
+            keys = sorted(keys[:limit])
+        return [(*key, *merged[key]) for key in keys]
+
+    def _bucket_column(self, column, bucket_seconds: int):
+        seconds = epoch_seconds(self.db, column)
+        return (func.floor(seconds / bucket_seconds) * bucket_seconds).label("bucket_epoch")
+
+    def _from_measurements(
+        self,
+        sensor_ids: Sequence[int],
+        bucket_seconds: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ):
+        q = self.db.query(
+            Measurement.sensor_id.label("sensor_id"),
+            self._bucket_column(Measurement.timestamp, bucket_seconds),
+            func.count(Measurement.id),
+            func.sum(Measurement.value),
+            func.min(Measurement.value),
+            func.max(Measurement.value),
+        ).filter(_sensor_filter(Measurement.sensor_id, sensor_ids))
+        if start is not None:
+            q = q.filter(Measurement.timestamp >= start)
+        if end is not None:
+            q = q.filter(Measurement.timestamp < end)
+        return q
+
+    def _from_archive(
+        self,
+        sensor_ids: Sequence[int],
+        bucket_seconds: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Iterable[Tuple[int, int, int, float, float, float]]:
+        # Lo archivado es anterior a lo que queda en measurements
+        oldest = dict(
+            self.db.query(Measurement.sensor_id, func.min(Measurement.timestamp))
+            .filter(_sensor_filter(Measurement.sensor_id, sensor_ids))
+            .group_by(Measurement.sensor_id)
+            .all()
+        )
+        for sensor_id in sensor_ids:
+            bounds = [t for t in (end, oldest.get(sensor_id)) if t is not None]
+            for row in self.archive.aggregate(
+                sensor_id, bucket_seconds, start, min(bounds) if bounds else None
+            ):
+                yield (sensor_id, *row)
+
+    def _from_rollups(
+        self,
+        sensor_ids: Sequence[int],
+        bucket_seconds: int,
+        resolution: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ):
+        q = (
+            self.db.query(
+                MeasurementRollup.sensor_id.label("sensor_id"),
+                self._bucket_column(MeasurementRollup.bucket_start, bucket_seconds),
+                func.sum(MeasurementRollup.samples),
+                func.sum(MeasurementRollup.value_sum),
+                func.min(MeasurementRollup.value_min),
+                func.max(MeasurementRollup.value_max),
+            )
+            .filter(_sensor_filter(MeasurementRollup.sensor_id, sensor_ids))
+            .filter(MeasurementRollup.resolution == resolution)
+        )
+        # plan_ranges da límites alineados a la resolución
+        if start is not None:
+            q = q.filter(MeasurementRollup.bucket_start >= start)
+        if end is not None:
+            q = q.filter(MeasurementRollup.bucket_start < end)
+        return q
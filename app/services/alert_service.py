@@ -1,5 +1,6 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
@@ -54,6 +55,54 @@ class AlertService:
 
         return None
 
+    # ========================================================
+    # EVALUACIÓN EN LOTE → LLAMADO DESDE IngestionPipeline
+    # ========================================================
+    def load_thresholds(self, sensor_ids: Iterable[int]) -> Dict[int, List[ThresholdConfig]]:
+        """
+        Carga con una sola consulta los umbrales activos de varios
+        sensores, agrupados por sensor_id.
+        """
+        ids = set(sensor_ids)
+        grouped: Dict[int, List[ThresholdConfig]] = defaultdict(list)
+        if not ids:
+            return grouped
+
+        thresholds = (
+            self.db.query(ThresholdConfig)
+            .filter(ThresholdConfig.sensor_id.in_(ids))
+            .filter(ThresholdConfig.is_active == True)
+            .order_by(ThresholdConfig.id.asc())
+            .all()
+        )
+        for t in thresholds:
+            grouped[t.sensor_id].append(t)
+        return grouped
+
+    def evaluate_batch(
+        self,
+        measurements: Sequence[Measurement],
+        zone_by_sensor: Dict[int, int],
+        thresholds_by_sensor: Dict[int, List[ThresholdConfig]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Evalúa un lote con umbrales ya cargados. Devuelve las filas de
+        alertas a insertar (como mucho una por medición, igual que
+        evaluate_measurement); no escribe ni hace commit.
+        """
+        rows: List[Dict[str, Any]] = []
+        for measurement in measurements:
+            zone_id = zone_by_sensor.get(measurement.sensor_id)
+            if zone_id is None:
+                continue
+
+            for t in thresholds_by_sensor.get(measurement.sensor_id, ()):
+                values = self._alert_values(t, measurement, zone_id)
+                if values:
+                    rows.append(values)
+                    break
+        return rows
+
     # ========================================================
     # EVALUAR UMBRAL
     # ========================================================
@@ -67,6 +116,29 @@ class AlertService:
         Evalúa una medición según un threshold específico.
         """
 
+        values = self._alert_values(threshold, measurement, zone_id)
+        if values is None:
+            return None
+
+        alert = Alert(**values)
+
+        self.db.add(alert)
+        self.db.commit()
+        self.db.refresh(alert)
+
+        return alert
+
+    def _alert_values(
+        self,
+        threshold: ThresholdConfig,
+        measurement: Measurement,
+        zone_id: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve los campos de la alerta que genera la medición según el
+        threshold, o None si está dentro de rango. No toca la BD.
+        """
+
         value = measurement.value
         param = threshold.parameter
 
@@ -85,10 +157,10 @@ class AlertService:
             if threshold.max_value is not None and value > threshold.max_value:
                 critical = True
         elif op == ">":
-            if value > threshold.max_value:
+            if threshold.max_value is not None and value > threshold.max_value:
                 critical = True
         elif op == "<":
-            if value < threshold.min_value:
+            if threshold.min_value is not None and value < threshold.min_value:
                 critical = True
         elif op == ">=":
             if threshold.max_value is not None and value >= threshold.max_value:
@@ -121,22 +193,16 @@ class AlertService:
         )
 
         # ===============================
-        # 4. Crear alerta
+        # 4. Datos de la alerta
         # ===============================
-        alert = Alert(
-            message=message,
-            details=details,
-            severity=severity,
-            sensor_id=measurement.sensor_id,
-            zone_id=zone_id,
-            created_at=datetime.utcnow(),
-        )
-
-        self.db.add(alert)
-        self.db.commit()
-        self.db.refresh(alert)
-
-        return alert
+        return {
+            "message": message,
+            "details": details,
+            "severity": severity,
+            "sensor_id": measurement.sensor_id,
+            "zone_id": zone_id,
+            "created_at": datetime.utcnow(),
+        }
 
     # ========================================================
     # METODO ADICIONAL: FORZAR ALERTA
@@ -0,0 +1,303 @@
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.measurement import Measurement
+from app.services.partition_service import add_months, month_start
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+
+# Columnas de cada mes: <AAAAMM>.<columna>.npy
+COLUMNS = ("ts", "value", "id")
+
+
+class CorruptArchiveError(ValueError):
+    """Las columnas de un mes archivado no tienen la misma longitud."""
+
+
+class ArchivedMeasurement(NamedTuple):
+    id: int
+    timestamp: datetime
+    value: float
+
+
+def to_epoch_us(value: datetime) -> int:
+    return (value - EPOCH) // _US
+
+
+def from_epoch_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+class MeasurementArchive:
+    """
+    Archivo frío de mediciones en disco, un directorio por sensor y tres
+    ficheros .npy por mes: ts (int64, µs desde epoch UTC, ordenado),
+    value (float64) e id (int64). Los ficheros se guardan sin comprimir
+    para poder abrirlos con numpy.memmap: una consulta de rango lee solo
+    las páginas que caen dentro (búsqueda binaria sobre ts), no el mes
+    entero.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    # ========================================================
+    # RUTAS
+    # ========================================================
+    def _path(self, sensor_id: int, month: datetime, column: str) -> Path:
+        return self.root / str(sensor_id) / f"{month:%Y%m}.{column}.npy"
+
+    def months(self, sensor_id: int) -> List[datetime]:
+        directory = self.root / str(sensor_id)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            datetime.strptime(path.name.split(".")[0], "%Y%m")
+            for path in directory.glob("*.ts.npy")
+        )
+
+    # ========================================================
+    # ESCRITURA
+    # ========================================================
+    def write_month(
+        self,
+        sensor_id: int,
+        month: datetime,
+        ts: np.ndarray,
+        values: np.ndarray,
+        ids: np.ndarray,
+    ) -> int:
+        """
+        Añade lecturas a un mes. Si el mes ya estaba archivado se fusiona
+        con lo existente (una lectura por timestamp, gana la nueva).
+        """
+        month = month_start(month)
+        if self._path(sensor_id, month, "ts").exists():
+            old_ts, old_values, old_ids = self._load(sensor_id, month, mmap=False)
+            ts = np.concatenate([ts, old_ts])
+            values = np.concatenate([values, old_values])
+            ids = np.concatenate([ids, old_ids])
+
+        # np.unique conserva la primera aparición: las lecturas nuevas van delante
+        ts, first = np.unique(ts, return_index=True)
+        values, ids = values[first], ids[first]
+
+        directory = self.root / str(sensor_id)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Primero los tres .tmp y después los renombrados, ts el último: un
+        # fallo al escribir deja el mes como estaba, y ts.npy (el que marca
+        # el mes como archivado) solo aparece cuando las demás columnas ya están
+        paths = {column: self._path(sensor_id, month, column) for column in COLUMNS}
+        pending = []
+        try:
+            for column, data in zip(COLUMNS, (ts, values, ids)):
+                tmp = paths[column].with_suffix(".tmp")
+                pending.append(tmp)
+                with open(tmp, "wb") as fh:
+                    np.save(fh, data)
+        except BaseException:
+            for tmp in pending:
+                tmp.unlink(missing_ok=True)
+            raise
+
+        for column in sorted(COLUMNS, key=lambda c: c == "ts"):
+            os.replace(paths[column].with_suffix(".tmp"), paths[column])
+        return len(ts)
+
+    def export(self, db: Session, sensor_id: int, before: datetime) -> int:
+        """
+        Copia al archivo las mediciones del sensor anteriores a before,
+        mes a mes. No borra nada de la base de datos.
+        """
+        oldest = (
+            db.query(Measurement.timestamp)
+            .filter(Measurement.sensor_id == sensor_id)
+            .order_by(Measurement.timestamp.asc())
+            .limit(1)
+            .scalar()
+        )
+        if oldest is None or oldest >= before:
+            return 0
+
+        archived = 0
+        month = month_start(oldest)
+        while month < before:
+            upper = min(add_months(month, 1), before)
+            rows = (
+                db.query(Measurement.timestamp, Measurement.value, Measurement.id)
+                .filter(Measurement.sensor_id == sensor_id)
+                .filter(Measurement.timestamp >= month)
+                .filter(Measurement.timestamp < upper)
+                .all()
+            )
+            if rows:
+                self.write_month(
+                    sensor_id,
+                    month,
+                    np.fromiter((to_epoch_us(ts) for ts, _, _ in rows), dtype=np.int64, count=len(rows)),
+                    np.fromiter((v for _, v, _ in rows), dtype=np.float64, count=len(rows)),
+                    np.fromiter((i for _, _, i in rows), dtype=np.int64, count=len(rows)),
+                )
+                archived += len(rows)
+            month = add_months(month, 1)
+
+        logger.info("sensor %s: %s mediciones archivadas", sensor_id, archived)
+        return archived
+
+    # ========================================================
+    # LECTURA
+    # ========================================================
+    def _load(self, sensor_id: int, month: datetime, mmap: bool = True):
+        mode = "r" if mmap else None
+        arrays = tuple(
+            np.load(self._path(sensor_id, month, column), mmap_mode=mode)
+            for column in COLUMNS
+        )
+        if len({len(a) for a in arrays}) != 1:
+            raise CorruptArchiveError(
+                f"Sensor {sensor_id}, {month:%Y-%m}: columnas de longitudes distintas "
+                f"({', '.join(f'{c}={len(a)}' for c, a in zip(COLUMNS, arrays))})"
+            )
+        return arrays
+
+    def _months_in(
+        self,
+        sensor_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> List[datetime]:
+        return [
+            m
+            for m in self.months(sensor_id)
+            if (start is None or add_months(m, 1) > start) and (end is None or m < end)
+        ]
+
+    @staticmethod
+    def _window(ts: np.ndarray, lo_us: Optional[int], hi_us: Optional[int]) -> Tuple[int, int]:
+        lo = int(np.searchsorted(ts, lo_us, side="left")) if lo_us is not None else 0
+        hi = int(np.searchsorted(ts, hi_us, side="left")) if hi_us is not None else len(ts)
+        return lo, hi
+
+    def span(self, sensor_id: int) -> Optional[Tuple[datetime, datetime]]:
+        """Primera y última lectura archivadas del sensor (None si no hay)."""
+        months = self.months(sensor_id)
+        if not months:
+            return None
+        first = self._load(sensor_id, months[0])[0]
+        last = self._load(sensor_id, months[-1])[0]
+        if not len(first) or not len(last):
+            return None
+        return from_epoch_us(first[0]), from_epoch_us(last[-1])
+
+    def read(
+        self,
+        sensor_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[ArchivedMeasurement]:
+        """Lecturas archivadas en [start, end), como mucho limit."""
+        months = self._months_in(sensor_id, start, end)
+        if descending:
+            months.reverse()
+
+        lo_us = to_epoch_us(start) if start is not None else None
+        hi_us = to_epoch_us(end) if end is not None else None
+
+        out: List[ArchivedMeasurement] = []
+        for month in months:
+            ts, values, ids = self._load(sensor_id, month)
+            lo, hi = self._window(ts, lo_us, hi_us)
+
+            step = -1 if descending else 1
+            window = slice(lo, hi)
+            if limit is not None:
+                remaining = limit - len(out)
+                window = slice(max(hi - remaining, lo), hi) if descending else slice(lo, min(lo + remaining, hi))
+
+            # Solo se copian a memoria las filas del rango
+            out.extend(
+                ArchivedMeasurement(i, from_epoch_us(t), v)
+                for i, t, v in zip(
+                    ids[window][::step].tolist(),
+                    ts[window][::step].tolist(),
+                    values[window][::step].tolist(),
+                )
+            )
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def arrays(
+        self,
+        sensor_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(ts en µs, valores) archivados en [start, end), en orden cronológico."""
+        lo_us = to_epoch_us(start) if start is not None else None
+        hi_us = to_epoch_us(end) if end is not None else None
+
+        ts_parts: List[np.ndarray] = []
+        value_parts: List[np.ndarray] = []
+        for month in self._months_in(sensor_id, start, end):
+            ts, values, _ = self._load(sensor_id, month)
+            lo, hi = self._window(ts, lo_us, hi_us)
+            if lo < hi:
+                ts_parts.append(np.array(ts[lo:hi]))
+                value_parts.append(np.array(values[lo:hi]))
+        if not ts_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(ts_parts), np.concatenate(value_parts)
+
+    def aggregate(
+        self,
+        sensor_id: int,
+        bucket_seconds: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Tuple[int, int, float, float, float]]:
+        """
+        (bucket_epoch, count, sum, min, max) de las lecturas archivadas en
+        [start, end) por intervalos de bucket_seconds alineados a epoch,
+        mes a mes (un intervalo que cruza dos meses sale dos veces).
+        """
+        lo_us = to_epoch_us(start) if start is not None else None
+        hi_us = to_epoch_us(end) if end is not None else None
+
+        for month in self._months_in(sensor_id, start, end):
+            ts, values, _ = self._load(sensor_id, month)
+            lo, hi = self._window(ts, lo_us, hi_us)
+            if lo >= hi:
+                continue
+            buckets = ts[lo:hi] // (bucket_seconds * 1_000_000) * bucket_seconds
+            values = np.asarray(values[lo:hi])
+            # ts está ordenado: cada intervalo es un tramo contiguo
+            firsts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+            counts = np.diff(np.append(firsts, len(buckets)))
+            yield from zip(
+                buckets[firsts].tolist(),
+                counts.tolist(),
+                np.add.reduceat(values, firsts).tolist(),
+                np.minimum.reduceat(values, firsts).tolist(),
+                np.maximum.reduceat(values, firsts).tolist(),
+            )
+
+
+measurement_archive: Optional[MeasurementArchive] = (
+    MeasurementArchive(settings.MEASUREMENTS_ARCHIVE_DIR)
+    if settings.MEASUREMENTS_ARCHIVE_DIR
+    else None
+)
@@ -0,0 +1,314 @@
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.cultivation_zone import CultivationZone
+from app.models.measurement import Measurement
+from app.models.parcel import Parcel
+from app.models.sensor import Sensor
+from app.services.archive_service import MeasurementArchive
+
+# Lecturas con los ids de sensor, zona y parcela, para Arrow/Parquet.
+# Los instantes son UTC (como en la base de datos).
+ARROW_SCHEMA = pa.schema(
+    [
+        pa.field("measurement_id", pa.int64(), nullable=False),
+        pa.field("sensor_id", pa.int32(), nullable=False),
+        pa.field("zone_id", pa.int32()),
+        pa.field("parcel_id", pa.int32()),
+        pa.field("timestamp", pa.timestamp("us", tz="UTC")),
+        pa.field("value", pa.float64()),
+        pa.field("unit", pa.string()),
+        pa.field("status", pa.string()),
+    ]
+)
+
+# (sensor_id, zone_id, parcel_id, unit, lectura más antigua en measurements)
+ArchivedSensor = Tuple[Any, ...]
+
+ARROW_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _order(row) -> Tuple[datetime, int]:
+    # (timestamp, measurement_id): el orden de cada ventana
+    return row[4], row[0]
+
+
+def _chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _ChunkSink:
+    """
+    Destino de escritura para pyarrow que acumula lo escrito hasta que
+    se recoge con take(): permite enviar el IPC/Parquet por trozos sin
+    un fichero intermedio. Solo escritura secuencial (tell, sin seek).
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ArrowMeasurementExporter:
+    """
+    Exportación de measurements como stream IPC de Arrow o Parquet.
+
+    El rango [start, end) se recorre en ventanas de `chunk` (una consulta
+    por ventana, sobre el índice de timestamp) y cada ventana se lee con
+    un cursor de servidor en lotes de batch_size filas; cada lote pasa a
+    un RecordBatch (Arrow) o a un row group (Parquet) y se envía antes de
+    leer el siguiente, así que la memoria no depende del tamaño de la
+    exportación. Dentro de cada ventana las filas van ordenadas por
+    timestamp e id.
+
+    Filtros opcionales por granja, parcela, zona o sensor. La sesión es
+    propia (session_factory), igual que en MeasurementExporter.
+
+    Con archive, cada ventana incluye también las lecturas archivadas de
+    los sensores filtrados anteriores a las que les quedan en la base de
+    datos (como MeasurementExporter), intercaladas en el mismo orden; en
+    memoria queda como mucho lo archivado de una ventana.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        farm_id: Optional[int] = None,
+        parcel_id: Optional[int] = None,
+        zone_id: Optional[int] = None,
+        sensor_id: Optional[int] = None,
+        chunk: timedelta = timedelta(days=1),
+        batch_size: int = 50000,
+        archive: Optional[MeasurementArchive] = None,
+    ):
+        if chunk <= timedelta(0):
+            raise ValueError("chunk debe ser positivo")
+        self.session_factory = session_factory
+        self.start = start
+        self.end = end
+        self.farm_id = farm_id
+        self.parcel_id = parcel_id
+        self.zone_id = zone_id
+        self.sensor_id = sensor_id
+        self.chunk = chunk
+        self.batch_size = batch_size
+        self.archive = archive
+
+    # ========================================================
+    # LECTURA
+    # ========================================================
+    def _filtered(self, stmt):
+        return self._scoped(stmt.join(Sensor, Sensor.id == Measurement.sensor_id), Measurement.sensor_id)
+
+    def _scoped(self, stmt, sensor_column):
+        """Filtros de granja, parcela, zona y sensor sobre una consulta que ya incluye Sensor."""
+        stmt = stmt.outerjoin(CultivationZone, CultivationZone.id == Sensor.zone_id)
+        if self.farm_id is not None:
+            stmt = stmt.join(Parcel, Parcel.id == CultivationZone.parcel_id).where(
+                Parcel.farm_id == self.farm_id
+            )
+        if self.parcel_id is not None:
+            stmt = stmt.where(CultivationZone.parcel_id == self.parcel_id)
+        if self.zone_id is not None:
+            stmt = stmt.where(Sensor.zone_id == self.zone_id)
+        if self.sensor_id is not None:
+            stmt = stmt.where(sensor_column == self.sensor_id)
+        return stmt
+
+    def _archived_sensors(self, db: Session) -> List[ArchivedSensor]:
+        """
+        (sensor_id, zone_id, parcel_id, unit, hasta) de los sensores
+        filtrados con meses archivados; `hasta` es su lectura más antigua
+        en la base de datos (lo archivado es anterior).
+        """
+        if self.archive is None:
+            return []
+        sensors = db.execute(
+            self._scoped(
+                select(Sensor.id, Sensor.zone_id, CultivationZone.parcel_id, Sensor.unit)
+                .select_from(Sensor),
+                Sensor.id,
+            )
+        ).all()
+        sensors = [s for s in sensors if self.archive.months(s[0])]
+        if not sensors:
+            return []
+        oldest = dict(
+            db.execute(
+                select(Measurement.sensor_id, func.min(Measurement.timestamp))
+                .where(Measurement.sensor_id.in_([s[0] for s in sensors]))
+                .group_by(Measurement.sensor_id)
+            ).all()
+        )
+        return [(*s, oldest.get(s[0])) for s in sensors]
+
+    def _archived(
+        self,
+        sensors: Sequence[ArchivedSensor],
+        lo: datetime,
+        hi: datetime,
+    ) -> List[Tuple[Any, ...]]:
+        """Filas archivadas de [lo, hi) con las columnas de ARROW_SCHEMA, ordenadas."""
+        rows: List[Tuple[Any, ...]] = []
+        for sensor_id, zone_id, parcel_id, unit, until in sensors:
+            upper = min(hi, until) if until is not None else hi
+            if lo >= upper:
+                continue
+            rows.extend(
+                (a.id, sensor_id, zone_id, parcel_id, a.timestamp, a.value, unit, None)
+                for a in self.archive.read(sensor_id, start=lo, end=upper)
+            )
+        rows.sort(key=_order)
+        return rows
+
+    def _bounds(
+        self,
+        db: Session,
+        sensors: Sequence[ArchivedSensor] = (),
+    ) -> Optional[Tuple[datetime, datetime]]:
+        start, end = self.start, self.end
+        if start is None or end is None:
+            first, last = db.execute(
+                self._filtered(
+                    select(func.min(Measurement.timestamp), func.max(Measurement.timestamp))
+                )
+            ).one()
+            for sensor_id, *_ in sensors:
+                span = self.archive.span(sensor_id)
+                if span is not None:
+                    first = min(first, span[0]) if first is not None else span[0]
+                    last = max(last, span[1]) if last is not None else span[1]
+            if first is None:
+                return None
+            # El rango es semiabierto: +1 µs para incluir la última lectura
+            start = start if start is not None else first
+            end = end if end is not None else last + timedelta(microseconds=1)
+        return (start, end) if start < end else None
+
+    def windows(
+        self,
+        db: Session,
+        sensors: Sequence[ArchivedSensor] = (),
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        bounds = self._bounds(db, sensors)
+        if bounds is None:
+            return
+        lo, end = bounds
+        while lo < end:
+            hi = min(lo + self.chunk, end)
+            yield lo, hi
+            lo = hi
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        """RecordBatch de como mucho batch_size filas, ventana a ventana."""
+        columns = select(
+            Measurement.id,
+            Measurement.sensor_id,
+            Sensor.zone_id,
+            CultivationZone.parcel_id,
+            Measurement.timestamp,
+            Measurement.value,
+            Measurement.unit,
+            Measurement.status,
+        )
+        db = self.session_factory()
+        try:
+            sensors = self._archived_sensors(db)
+            for lo, hi in self.windows(db, sensors):
+                # Antes de abrir el cursor: no se puede consultar mientras se lee
+                archived = self._archived(sensors, lo, hi) if sensors else []
+                stmt = (
+                    self._filtered(columns)
+                    .where(Measurement.timestamp >= lo, Measurement.timestamp < hi)
+                    .order_by(Measurement.timestamp.asc(), Measurement.id.asc())
+                )
+                result = db.execute(stmt.execution_options(yield_per=self.batch_size))
+                try:
+                    if not archived:
+                        for partition in result.partitions():
+                            yield self._record_batch(partition)
+                        continue
+                    stored = (row for partition in result.partitions() for row in partition)
+                    merged = heapq.merge(archived, stored, key=_order)
+                    for rows in _chunked(merged, self.batch_size):
+                        yield self._record_batch(rows)
+                finally:
+                    result.close()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _record_batch(rows) -> pa.RecordBatch:
+        data = list(zip(*rows))
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(data, ARROW_SCHEMA)],
+            schema=ARROW_SCHEMA,
+        )
+
+    # ========================================================
+    # FORMATOS
+    # ========================================================
+    def stream(self, fmt: str) -> Iterator[bytes]:
+        """Trozos binarios en el formato pedido (una clave de ARROW_MEDIA_TYPES)."""
+        if fmt == "arrow":
+            return self.iter_arrow()
+        if fmt == "parquet":
+            return self.iter_parquet()
+        raise ValueError(f"Formato de exportación no válido: {fmt!r}")
+
+    def iter_arrow(self) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, ARROW_SCHEMA) as writer:
+            for batch in self.batches():
+                writer.write_batch(batch)
+                yield sink.take()
+        # Marca de fin del stream (y el esquema si no hubo filas)
+        yield sink.take()
+
+    def iter_parquet(self) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, ARROW_SCHEMA, compression="zstd") as writer:
+            for batch in self.batches():
+                # Un row group por lote: se escribe entero y se libera
+                writer.write_batch(batch, row_group_size=self.batch_size)
+                yield sink.take()
+        # Pie del fichero con los metadatos de los row groups
+        yield sink.take()
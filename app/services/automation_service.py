@@ -1,9 +1,11 @@
 import json
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import settings
 from app.models.automation_rule import AutomationRule
 from app.models.automation_log import AutomationLog
 from app.models.rule_actuator_map import RuleActuatorMap
@@ -53,6 +55,67 @@ class AutomationService:
         for rule in rules:
             self._evaluate_and_execute(rule, measurement)
 
+    # ========================================================
+    # EVALUACIÓN EN LOTE → LLAMADO DESDE IngestionPipeline
+    # ========================================================
+    def load_rules(
+        self,
+        zone_ids: Iterable[int],
+    ) -> Dict[int, List[Tuple[AutomationRule, Optional[dict]]]]:
+        """
+        Carga con una sola consulta las reglas activas de varias zonas
+        (con sus actuadores) y parsea cada condición una única vez.
+        Devuelve {zone_id: [(regla, condición | None), ...]} por prioridad.
+        """
+        ids = set(zone_ids)
+        grouped: Dict[int, List[Tuple[AutomationRule, Optional[dict]]]] = defaultdict(list)
+        if not ids:
+            return grouped
+
+        rules: List[AutomationRule] = (
+            self.db.query(AutomationRule)
+            .options(
+                selectinload(AutomationRule.actuators)
+                .selectinload(RuleActuatorMap.actuator)
+            )
+            .filter(AutomationRule.zone_id.in_(ids))
+            .filter(AutomationRule.is_active == True)
+            .order_by(AutomationRule.priority.asc())
+            .all()
+        )
+        for rule in rules:
+            grouped[rule.zone_id].append((rule, self._parse_condition(rule)))
+        return grouped
+
+    def handle_batch(
+        self,
+        measurements: Sequence[Measurement],
+        zone_by_sensor: Dict[int, int],
+        rules_by_zone: Dict[int, List[Tuple[AutomationRule, Optional[dict]]]],
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Evalúa un lote con reglas ya cargadas. Aplica los cambios de
+        estado sobre los actuadores en la sesión (sin commit) y devuelve
+        (filas de logs a insertar, número de acciones aplicadas).
+        """
+        logs: List[Dict[str, Any]] = []
+        actions = 0
+
+        for measurement in measurements:
+            zone_id = zone_by_sensor.get(measurement.sensor_id)
+            if zone_id is None:
+                continue
+
+            for rule, condition_data in rules_by_zone.get(zone_id, ()):
+                for log_kwargs, action in self._plan_rule(rule, condition_data, measurement):
+                    if action is not None:
+                        actuator, desired_state = action
+                        actuator.is_on = desired_state
+                        actions += 1
+                    logs.append(self._log_values(**log_kwargs))
+
+        return logs, actions
+
     # ========================================================
     # EVALUAR UNA REGLA Y EJECUTAR ACCIONES
     # ========================================================
@@ -67,34 +130,86 @@ class AutomationService:
         vinculados a la regla y registra logs.
         """
 
+        condition_data = self._parse_condition(rule)
+
+        for log_kwargs, action in self._plan_rule(rule, condition_data, measurement):
+            if action is None:
+                self._create_log(**log_kwargs)
+                continue
+
+            actuator, desired_state = action
+
+            # Aplicar acción: encender/apagar
+            try:
+                actuator.is_on = desired_state
+                # Podrías usar duration_seconds con otro proceso (job async)
+                self.db.add(actuator)
+                self.db.commit()
+                self.db.refresh(actuator)
+
+                self._create_log(**log_kwargs)
+            except Exception as e:
+                self.db.rollback()
+                self._create_log(
+                    rule=rule,
+                    status="failed",
+                    message=f"Error aplicando acción en actuador {actuator.id}",
+                    details=str(e),
+                    sensor_id=measurement.sensor_id if measurement else None,
+                    zone_id=rule.zone_id,
+                    actuator_id=actuator.id,
+                    action_executed=False,
+                )
+
+    def _parse_condition(self, rule: AutomationRule) -> Optional[dict]:
+        """Parsea la condición JSON de la regla; None si está mal formada."""
         try:
-            condition_data = json.loads(rule.condition)
+            condition = json.loads(rule.condition)
         except Exception:
+            return None
+        return condition if isinstance(condition, dict) else None
+
+    def _plan_rule(
+        self,
+        rule: AutomationRule,
+        condition_data: Optional[dict],
+        measurement: Optional[Measurement] = None,
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[Tuple[Actuator, bool]]]]:
+        """
+        Decide qué hacer con una regla sin tocar la BD.
+        Produce pares (argumentos de _create_log, acción) donde la acción
+        es (actuador, estado deseado) o None si solo hay que registrar log.
+        """
+
+        sensor_id = measurement.sensor_id if measurement else None
+
+        if condition_data is None:
             # Si el JSON está mal formado, registramos un log de fallo
-            self._create_log(
+            yield dict(
                 rule=rule,
                 status="failed",
                 message="Error al parsear condición",
                 details=f"condition={rule.condition}",
-                sensor_id=measurement.sensor_id if measurement else None,
+                sensor_id=sensor_id,
                 zone_id=rule.zone_id,
                 action_executed=False,
-            )
+            ), None
             return
 
         should_trigger = self._evaluate_condition(condition_data, measurement)
 
         if not should_trigger:
             # Log opcional de "skipped"
-            self._create_log(
-                rule=rule,
-                status="skipped",
-                message="Condición no cumplida",
-                details=f"condition={rule.condition}",
-                sensor_id=measurement.sensor_id if measurement else None,
-                zone_id=rule.zone_id,
-                action_executed=False,
-            )
+            if settings.AUTOMATION_LOG_SKIPPED:
+                yield dict(
+                    rule=rule,
+                    status="skipped",
+                    message="Condición no cumplida",
+                    details=f"condition={rule.condition}",
+                    sensor_id=sensor_id,
+                    zone_id=rule.zone_id,
+                    action_executed=False,
+                ), None
             return
 
         # Si se cumple la condición → ejecutar acciones sobre actuadores
@@ -102,65 +217,45 @@ class AutomationService:
 
         if not rule_links:
             # No hay actuadores asociados, pero la regla se disparó
-            self._create_log(
+            yield dict(
                 rule=rule,
                 status="triggered",
                 message="Regla disparada sin actuadores asociados",
                 details=f"condition={rule.condition}",
-                sensor_id=measurement.sensor_id if measurement else None,
+                sensor_id=sensor_id,
                 zone_id=rule.zone_id,
                 action_executed=False,
-            )
+            ), None
             return
 
-        # Ejecutamos acción por cada actuador
+        # Acción por cada actuador
         for link in rule_links:
             actuator: Optional[Actuator] = link.actuator
             if not actuator:
-                self._create_log(
+                yield dict(
                     rule=rule,
                     status="failed",
                     message="Actuador asociado no encontrado",
                     details=f"rule_actuator_map_id={link.id}",
-                    sensor_id=measurement.sensor_id if measurement else None,
+                    sensor_id=sensor_id,
                     zone_id=rule.zone_id,
                     action_executed=False,
-                )
+                ), None
                 continue
 
-            # Aplicar acción: encender/apagar
-            try:
-                actuator.is_on = bool(link.desired_state)
-                # Podrías usar duration_seconds con otro proceso (job async)
-                self.db.add(actuator)
-                self.db.commit()
-                self.db.refresh(actuator)
-
-                self._create_log(
-                    rule=rule,
-                    status="triggered",
-                    message=f"Acción aplicada a actuador {actuator.id}",
-                    details=(
-                        f"desired_state={link.desired_state}, "
-                        f"duration_seconds={link.duration_seconds}"
-                    ),
-                    sensor_id=measurement.sensor_id if measurement else None,
-                    zone_id=rule.zone_id,
-                    actuator_id=actuator.id,
-                    action_executed=True,
-                )
-            except Exception as e:
-                self.db.rollback()
-                self._create_log(
-                    rule=rule,
-                    status="failed",
-                    message=f"Error aplicando acción en actuador {actuator.id}",
-                    details=str(e),
-                    sensor_id=measurement.sensor_id if measurement else None,
-                    zone_id=rule.zone_id,
-                    actuator_id=actuator.id,
-                    action_executed=False,
-                )
+            yield dict(
+                rule=rule,
+                status="triggered",
+                message=f"Acción aplicada a actuador {actuator.id}",
+                details=(
+                    f"desired_state={link.desired_state}, "
+                    f"duration_seconds={link.duration_seconds}"
+                ),
+                sensor_id=sensor_id,
+                zone_id=rule.zone_id,
+                actuator_id=actuator.id,
+                action_executed=True,
+            ), (actuator, bool(link.desired_state))
 
     # ========================================================
     # EVALUACIÓN DE CONDICIÓN (SIMPLE, PERO EXTENDIBLE)
@@ -239,18 +334,43 @@ class AutomationService:
         action_executed: bool = False,
     ) -> AutomationLog:
         log = AutomationLog(
-            rule_id=rule.id,
-            status=status,
-            message=message,
-            details=details,
-            action_executed=action_executed,
-            actuator_id=actuator_id,
-            sensor_id=sensor_id,
-            zone_id=zone_id or rule.zone_id,
-            executed_at=datetime.utcnow(),
-            created_at=datetime.utcnow(),
+            **self._log_values(
+                rule=rule,
+                status=status,
+                message=message,
+                details=details,
+                sensor_id=sensor_id,
+                zone_id=zone_id,
+                actuator_id=actuator_id,
+                action_executed=action_executed,
+            )
         )
         self.db.add(log)
         self.db.commit()
         self.db.refresh(log)
         return log
+
+    def _log_values(
+        self,
+        rule: AutomationRule,
+        status: str,
+        message: str,
+        details: Optional[str] = None,
+        sensor_id: Optional[int] = None,
+        zone_id: Optional[int] = None,
+        actuator_id: Optional[int] = None,
+        action_executed: bool = False,
+    ) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        return {
+            "rule_id": rule.id,
+            "status": status,
+            "message": message,
+            "details": details,
+            "action_executed": action_executed,
+            "actuator_id": actuator_id,
+            "sensor_id": sensor_id,
+            "zone_id": zone_id or rule.zone_id,
+            "executed_at": now,
+            "created_at": now,
+        }
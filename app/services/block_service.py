@@ -0,0 +1,266 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.measurement import Measurement
+from app.models.measurement_block import MeasurementBlock
+from app.services.retention_service import RetentionService
+from app.services.rollup_service import bucket_start
+from app.utils.gorilla import BlockEncoder, decode_block
+from app.utils.measurement_codec import datetime_to_epoch_ms, epoch_ms_to_datetime
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = timedelta(hours=1)
+
+BlockKey = Tuple[int, datetime]
+
+
+def block_start(ts: datetime) -> datetime:
+    return bucket_start(ts, "1h")
+
+
+def points_by_ms(readings: Iterable[Tuple[datetime, float]]) -> Dict[int, float]:
+    """
+    {epoch_ms: value} de las lecturas (timestamp, value) de un bloque.
+    El bloque guarda milisegundos (el salto de una hora en microsegundos
+    no cabe en los 32 bits de delta-of-delta del códec): dos lecturas del
+    mismo milisegundo, que measurements conserva por separado, ocupan un
+    solo punto, el de la lectura con el timestamp mayor.
+    """
+    points: Dict[int, float] = {}
+    newest: Dict[int, datetime] = {}
+    for ts, value in readings:
+        epoch_ms = datetime_to_epoch_ms(ts)
+        if epoch_ms not in newest or ts > newest[epoch_ms]:
+            newest[epoch_ms] = ts
+            points[epoch_ms] = value
+    return points
+
+
+def build_block(sensor_id: int, start: datetime, points: Dict[int, float]) -> Dict[str, Any]:
+    """Columnas de measurement_blocks para los puntos {epoch_ms: value} de una hora."""
+    ordered = sorted(points.items())
+    values = [value for _, value in ordered]
+    encoder = BlockEncoder()
+    encoder.extend(ordered)
+    return {
+        "sensor_id": sensor_id,
+        "block_start": start,
+        "samples": len(ordered),
+        "first_at": epoch_ms_to_datetime(ordered[0][0]),
+        "last_at": epoch_ms_to_datetime(ordered[-1][0]),
+        "value_min": min(values),
+        "value_max": max(values),
+        "data": encoder.getvalue(),
+        "tail": encoder.state(),
+    }
+
+
+class BlockService:
+    """
+    Almacenamiento comprimido de mediciones en measurement_blocks: un
+    BLOB por sensor y hora.
+
+    - apply(): añade un lote recién insertado a sus bloques. Las
+      lecturas posteriores a la última del bloque continúan su
+      codificación (ver MeasurementBlock.tail); solo las que llegan
+      desordenadas obligan a decodificar y recodificar la hora. Una
+      lectura en un milisegundo que el bloque ya tiene sustituye a la
+      guardada (ver points_by_ms).
+    - rebuild(): regenera los bloques de un rango desde measurements,
+      para compactar el histórico o tras ediciones y borrados. Las horas
+      anteriores al corte de retención de las mediciones crudas no se
+      tocan (ver RollupService.rebuild).
+    - blocks() / points(): los bloques o las lecturas de un rango,
+      decodificando bloque a bloque sin cargarlos todos en memoria.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # MANTENIMIENTO INCREMENTAL
+    # ========================================================
+    def apply(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Fusiona filas recién insertadas en sus bloques. No hace commit."""
+        readings: Dict[BlockKey, List[Tuple[datetime, float]]] = {}
+        for row in rows:
+            key = (row["sensor_id"], block_start(row["timestamp"]))
+            readings.setdefault(key, []).append((row["timestamp"], row["value"]))
+        if not readings:
+            return 0
+
+        pending = {key: points_by_ms(points) for key, points in readings.items()}
+        existing = self._locked(pending.keys())
+        for key, points in pending.items():
+            block = existing.get(key)
+            if block is not None:
+                self._merge(block, points)
+                continue
+
+            block = MeasurementBlock(**build_block(key[0], key[1], points))
+            try:
+                # Otro proceso pudo crear el mismo bloque: se fusiona con el suyo
+                with self.db.begin_nested():
+                    self.db.add(block)
+            except IntegrityError:
+                self._merge(self._locked([key])[key], points)
+        return len(pending)
+
+    def _locked(self, keys: Iterable[BlockKey]) -> Dict[BlockKey, MeasurementBlock]:
+        blocks = (
+            self.db.query(MeasurementBlock)
+            .filter(tuple_(MeasurementBlock.sensor_id, MeasurementBlock.block_start).in_(list(keys)))
+            .with_for_update()
+            .all()
+        )
+        return {(b.sensor_id, b.block_start): b for b in blocks}
+
+    @staticmethod
+    def _merge(block: MeasurementBlock, points: Dict[int, float]) -> None:
+        ordered = sorted(points.items())
+        if block.tail is not None:
+            encoder = BlockEncoder.resume(block.data, block.tail)
+            if ordered[0][0] > encoder.last_ts:
+                encoder.extend(ordered)
+                values = [value for _, value in ordered]
+                block.data = encoder.getvalue()
+                block.tail = encoder.state()
+                block.samples = encoder.count
+                block.last_at = epoch_ms_to_datetime(ordered[-1][0])
+                block.value_min = min(block.value_min, min(values))
+                block.value_max = max(block.value_max, max(values))
+                return
+
+        merged = dict(decode_block(block.data))
+        merged.update(points)
+        for field, value in build_block(block.sensor_id, block.block_start, merged).items():
+            setattr(block, field, value)
+
+    # ========================================================
+    # RECONSTRUCCIÓN
+    # ========================================================
+    def rebuild(
+        self,
+        start: datetime,
+        end: datetime,
+        sensor_id: Optional[int] = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Regenera los bloques de [start, end), ampliado a horas completas,
+        desde measurements. Con commit=True confirma hora a hora. Las horas
+        que empiezan antes del corte de retención de cada sensor
+        (RetentionService.raw_cutoffs) se saltan: sus bloques pueden ser
+        lo único que queda de ellas. Devuelve el número de bloques escritos.
+        """
+        hour = block_start(start)
+        end = block_start(end - timedelta(microseconds=1)) + BLOCK_SIZE
+        cutoffs = RetentionService(self.db).raw_cutoffs(None if sensor_id is None else [sensor_id])
+        written = 0
+        skipped = 0
+        while hour < end:
+            eligible = [s for s, cutoff in cutoffs.items() if cutoff is None or hour >= cutoff]
+            if len(eligible) < len(cutoffs):
+                skipped += 1
+            if eligible:
+                # Todos los sensores: un único recorrido de la hora, sin filtro
+                sensor_ids = None if sensor_id is None and len(eligible) == len(cutoffs) else eligible
+                written += self._rebuild_hour(sensor_ids, hour)
+                if commit:
+                    self.db.commit()
+            hour += BLOCK_SIZE
+
+        if skipped:
+            logger.warning(
+                "bloques sensor %s: %s horas anteriores al corte de retención sin regenerar "
+                "(mediciones purgadas)",
+                sensor_id,
+                skipped,
+            )
+        return written
+
+    def rebuild_at(self, points: Iterable[Tuple[int, datetime]]) -> None:
+        """
+        Regenera las horas que contienen cada (sensor_id, timestamp), salvo
+        las anteriores al corte de retención (ver rebuild). No hace commit.
+        """
+        hours = {(sensor_id, block_start(ts)) for sensor_id, ts in points if ts is not None}
+        cutoffs = RetentionService(self.db).raw_cutoffs({sensor_id for sensor_id, _ in hours})
+        for sensor_id, hour in sorted(hours):
+            cutoff = cutoffs.get(sensor_id)
+            if cutoff is not None and hour < cutoff:
+                logger.warning(
+                    "bloques sensor %s: hora %s anterior al corte de retención, sin regenerar",
+                    sensor_id,
+                    hour,
+                )
+                continue
+            self._rebuild_hour([sensor_id], hour)
+
+    def _rebuild_hour(self, sensor_ids: Optional[Sequence[int]], hour: datetime) -> int:
+        """Regenera la hora para sensor_ids (None: todos los sensores)."""
+        delete = self.db.query(MeasurementBlock).filter(MeasurementBlock.block_start == hour)
+        q = (
+            self.db.query(Measurement.sensor_id, Measurement.timestamp, Measurement.value)
+            .filter(Measurement.timestamp >= hour)
+            .filter(Measurement.timestamp < hour + BLOCK_SIZE)
+        )
+        if sensor_ids is not None:
+            delete = delete.filter(MeasurementBlock.sensor_id.in_(sensor_ids))
+            q = q.filter(Measurement.sensor_id.in_(sensor_ids))
+
+        delete.delete(synchronize_session=False)
+        by_sensor: Dict[int, List[Tuple[datetime, float]]] = {}
+        for s, ts, value in q.all():
+            by_sensor.setdefault(s, []).append((ts, value))
+
+        blocks: List[Dict[str, Any]] = [
+            build_block(s, hour, points_by_ms(readings)) for s, readings in by_sensor.items()
+        ]
+        if blocks:
+            self.db.execute(MeasurementBlock.__table__.insert(), blocks)
+        return len(blocks)
+
+    # ========================================================
+    # CONSULTA
+    # ========================================================
+    def blocks(
+        self,
+        sensor_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Tuple[datetime, bytes]]:
+        """(block_start, data) de las horas que tocan [start, end), en orden."""
+        q = (
+            self.db.query(MeasurementBlock.block_start, MeasurementBlock.data)
+            .filter(MeasurementBlock.sensor_id == sensor_id)
+        )
+        if start is not None:
+            q = q.filter(MeasurementBlock.block_start >= block_start(start))
+        if end is not None:
+            q = q.filter(MeasurementBlock.block_start < end)
+        for hour, data in q.order_by(MeasurementBlock.block_start.asc()).yield_per(64):
+            yield hour, data
+
+    def points(
+        self,
+        sensor_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Tuple[datetime, float]]:
+        """Lecturas (timestamp, value) de [start, end) en orden cronológico."""
+        lo = datetime_to_epoch_ms(start) if start is not None else None
+        hi = datetime_to_epoch_ms(end) if end is not None else None
+        for _, data in self.blocks(sensor_id, start, end):
+            for epoch_ms, value in decode_block(data):
+                if lo is not None and epoch_ms < lo:
+                    continue
+                if hi is not None and epoch_ms >= hi:
+                    return
+                yield epoch_ms_to_datetime(epoch_ms), value
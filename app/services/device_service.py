@@ -0,0 +1,122 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.device import Device
+from app.models.sensor import Sensor
+from app.schemas.device import DeviceReadingsIn, DeviceReadingsResult
+from app.services.measurement_service import MeasurementService, to_utc_naive
+
+
+class DeviceWithoutZoneError(Exception):
+    """El dispositivo no tiene zona asignada: no puede reportar lecturas."""
+
+
+class SensorsOutsideZoneError(Exception):
+    """Alguna lectura apunta a un sensor que no es de la zona del dispositivo."""
+
+    def __init__(self, sensor_ids: List[int]):
+        super().__init__("Sensores fuera de la zona del dispositivo")
+        self.sensor_ids = sensor_ids
+
+
+class ZoneSensorCache:
+    """
+    Caché en proceso zona → ids de sensores, con caducidad.
+    El router de sensores la invalida al crear, mover o borrar sensores;
+    la caducidad cubre los cambios hechos desde otros procesos.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, FrozenSet[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, zone_id: int, refresh: bool = False) -> FrozenSet[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(zone_id)
+        if entry and not refresh and now - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        sensor_ids = frozenset(
+            sensor_id
+            for (sensor_id,) in db.query(Sensor.id).filter(Sensor.zone_id == zone_id).all()
+        )
+        with self._lock:
+            self._entries[zone_id] = (now, sensor_ids)
+        return sensor_ids
+
+    def invalidate(self, zone_id: Optional[int] = None) -> None:
+        with self._lock:
+            if zone_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(zone_id, None)
+
+
+zone_sensor_cache = ZoneSensorCache(settings.DEVICE_ZONE_SENSORS_CACHE_TTL_SECONDS)
+
+
+class DeviceService:
+    """
+    Ingesta por gateway: un envío con las lecturas de todos los sensores
+    de la zona del dispositivo, que además actualiza su presencia.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # LECTURAS → POST /devices/{id}/readings
+    # ========================================================
+    def ingest_readings(self, device: Device, payload: DeviceReadingsIn) -> DeviceReadingsResult:
+        """
+        Comprueba con la caché de zona que todos los sensores son de la
+        zona del dispositivo y escribe las lecturas y last_seen/is_online
+        en la misma transacción. Un envío sin lecturas sirve de latido.
+        """
+        if device.zone_id is None:
+            raise DeviceWithoutZoneError()
+
+        # 1. Pertenencia a la zona; ante un fallo se recarga una vez
+        # por si el sensor se creó en otro proceso
+        sensor_ids = {r.sensor_id for r in payload.readings}
+        zone_sensors = zone_sensor_cache.get(self.db, device.zone_id)
+        if not sensor_ids <= zone_sensors:
+            zone_sensors = zone_sensor_cache.get(self.db, device.zone_id, refresh=True)
+            outside = sorted(sensor_ids - zone_sensors)
+            if outside:
+                raise SensorsOutsideZoneError(outside)
+
+        # 2. Filas; la hora de la lectura, la del ciclo o la del servidor
+        now = datetime.utcnow()
+        cycle_ts = to_utc_naive(payload.timestamp) if payload.timestamp else now
+        rows = [
+            {
+                "value": r.value,
+                "unit": r.unit,
+                "status": r.status,
+                "sensor_id": r.sensor_id,
+                "timestamp": to_utc_naive(r.timestamp) if r.timestamp else cycle_ts,
+            }
+            for r in payload.readings
+        ]
+
+        # 3. Lecturas + presencia, un solo commit
+        inserted = MeasurementService(self.db).insert_rows(rows, commit=False)
+        device.last_seen = now
+        device.is_online = True
+        self.db.commit()
+
+        return DeviceReadingsResult(
+            device_id=device.id,
+            received=len(rows),
+            inserted=inserted,
+            duplicates=len(rows) - inserted,
+            last_seen=now,
+        )
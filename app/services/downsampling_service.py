@@ -0,0 +1,250 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.measurement import Measurement
+from app.models.measurement_block import MeasurementBlock
+from app.models.measurement_rollup import MeasurementRollup
+from app.schemas.measurement import MeasurementPoint
+from app.services.archive_service import MeasurementArchive
+from app.services.block_service import BLOCK_SIZE, BlockService, block_start
+from app.services.rollup_service import bucket_start
+from app.utils.downsampling import lttb_indices
+from app.utils.gorilla import decode_all
+from app.utils.measurement_codec import datetime_to_epoch_ms
+
+EPOCH = datetime(1970, 1, 1)
+
+# Filas por lote al leer la serie del cursor
+FETCH_CHUNK = 50000
+
+
+def epoch_float_seconds(db: Session, column):
+    """Segundos (con fracción) desde epoch de una columna DateTime UTC naive."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.timestampdiff(literal_column("MICROSECOND"), "1970-01-01 00:00:00", column) / 1e6
+    if dialect == "sqlite":
+        return (func.julianday(column) - 2440587.5) * 86400.0
+    return cast(func.extract("epoch", column), Float)
+
+
+class SeriesTooLargeError(ValueError):
+    """El rango supera max_raw_rows lecturas y no hay rollups ni bloques de los que partir."""
+
+    def __init__(self, max_raw_rows: int):
+        super().__init__(
+            f"El rango tiene más de {max_raw_rows} lecturas; acotar 'from'/'to' o usar 'bucket'"
+        )
+        self.max_raw_rows = max_raw_rows
+
+
+class DownsamplingService:
+    """
+    Series para gráficas de línea reducidas con LTTB.
+
+    La serie se lee del cursor en lotes de FETCH_CHUNK filas como pares
+    (segundos desde epoch, valor) calculados en SQL, que van directos a
+    arrays de NumPy sin crear objetos datetime ni filas; solo los
+    max_points puntos elegidos se convierten a la respuesta.
+
+    Con MEASUREMENT_BLOCKS_ENABLED las horas que tienen bloque en
+    measurement_blocks se leen de ahí (un BLOB por hora en lugar de
+    miles de filas) y solo los huecos sin bloque van a measurements.
+    Con archive, la serie empieza con las lecturas del archivo frío
+    anteriores a las que quedan en measurements.
+
+    Con max_raw_rows, un rango con más lecturas crudas (p. ej. sin
+    from/to sobre todo el histórico) no se lee fila a fila: se reduce
+    la media de los rollups de 1m, o se leen los bloques si no hay
+    rollups; sin ninguno de los dos se lanza SeriesTooLargeError.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        archive: Optional[MeasurementArchive] = None,
+        max_raw_rows: Optional[int] = None,
+    ):
+        self.db = db
+        self.archive = archive
+        self.max_raw_rows = max_raw_rows
+
+    def series(
+        self,
+        sensor_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(segundos desde epoch, valores) de [start, end) en orden cronológico."""
+        if self.max_raw_rows is not None and self._exceeds(sensor_id, start, end, self.max_raw_rows):
+            if settings.MEASUREMENT_ROLLUPS_ENABLED:
+                return self._rollup_series(sensor_id, start, end)
+            if not settings.MEASUREMENT_BLOCKS_ENABLED:
+                raise SeriesTooLargeError(self.max_raw_rows)
+
+        if settings.MEASUREMENT_BLOCKS_ENABLED:
+            x, y = self._block_series(sensor_id, start, end)
+        else:
+            x, y = self._raw_series(sensor_id, start, end)
+        if self.archive is None:
+            return x, y
+
+        # Lo archivado es anterior a lo que queda en measurements
+        oldest = (
+            self.db.query(func.min(Measurement.timestamp))
+            .filter(Measurement.sensor_id == sensor_id)
+            .scalar()
+        )
+        bounds = [t for t in (end, oldest) if t is not None]
+        ts, values = self.archive.arrays(sensor_id, start, min(bounds) if bounds else None)
+        if not len(ts):
+            return x, y
+        return np.concatenate([ts / 1e6, x]), np.concatenate([values, y])
+
+    def _exceeds(
+        self,
+        sensor_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        max_rows: int,
+    ) -> bool:
+        """Si el rango tiene más de max_rows lecturas crudas (cuenta como mucho max_rows + 1)."""
+        stmt = select(Measurement.id).where(Measurement.sensor_id == sensor_id)
+        if start is not None:
+            stmt = stmt.where(Measurement.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(Measurement.timestamp < end)
+        capped = stmt.limit(max_rows + 1).subquery()
+        return self.db.execute(select(func.count()).select_from(capped)).scalar() > max_rows
+
+    def _rollup_series(
+        self,
+        sensor_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Media de cada minuto desde los rollups de 1m, en el inicio del minuto."""
+        stmt = (
+            select(
+                epoch_float_seconds(self.db, MeasurementRollup.bucket_start),
+                MeasurementRollup.value_sum / MeasurementRollup.samples,
+            )
+            .where(MeasurementRollup.sensor_id == sensor_id)
+            .where(MeasurementRollup.resolution == "1m")
+            .order_by(MeasurementRollup.bucket_start.asc())
+        )
+        if start is not None:
+            stmt = stmt.where(MeasurementRollup.bucket_start >= bucket_start(start, "1m"))
+        if end is not None:
+            stmt = stmt.where(MeasurementRollup.bucket_start < end)
+        return self._fetch(stmt)
+
+    def _block_series(
+        self,
+        sensor_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        hours_q = self.db.query(MeasurementBlock.block_start).filter(
+            MeasurementBlock.sensor_id == sensor_id
+        )
+        if start is not None:
+            hours_q = hours_q.filter(MeasurementBlock.block_start >= block_start(start))
+        if end is not None:
+            hours_q = hours_q.filter(MeasurementBlock.block_start < end)
+        hours = [hour for (hour,) in hours_q.order_by(MeasurementBlock.block_start.asc())]
+
+        # Huecos sin bloque, desde measurements (antes de abrir el cursor
+        # de bloques: no se pueden intercalar consultas en la conexión)
+        parts: List[Tuple[np.ndarray, np.ndarray]] = []
+        cursor = start
+        for hour in hours:
+            if cursor is None or cursor < hour:
+                parts.append(self._raw_series(sensor_id, cursor, hour))
+            cursor = hour + BLOCK_SIZE
+        if cursor is None or end is None or cursor < end:
+            parts.append(self._raw_series(sensor_id, cursor, end))
+
+        lo = datetime_to_epoch_ms(start) / 1000.0 if start is not None else -np.inf
+        hi = datetime_to_epoch_ms(end) / 1000.0 if end is not None else np.inf
+        for _, data in BlockService(self.db).blocks(sensor_id, start, end):
+            points = np.array(decode_all(data), dtype=np.float64)
+            x = points[:, 0] / 1000.0
+            keep = (x >= lo) & (x < hi)
+            parts.append((x[keep], points[keep, 1]))
+
+        parts = [part for part in parts if len(part[0])]
+        if not parts:
+            return np.empty(0), np.empty(0)
+        # Las partes no se solapan: basta ordenarlas por su primer instante
+        parts.sort(key=lambda part: part[0][0])
+        return np.concatenate([x for x, _ in parts]), np.concatenate([y for _, y in parts])
+
+    def _raw_series(
+        self,
+        sensor_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        stmt = (
+            select(epoch_float_seconds(self.db, Measurement.timestamp), Measurement.value)
+            .where(Measurement.sensor_id == sensor_id)
+            .order_by(Measurement.timestamp.asc())
+        )
+        if start is not None:
+            stmt = stmt.where(Measurement.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(Measurement.timestamp < end)
+        return self._fetch(stmt)
+
+    def _fetch(self, stmt) -> Tuple[np.ndarray, np.ndarray]:
+        """Pares (segundos desde epoch, valor) de stmt como dos arrays."""
+        # Tuplas del driver directamente a NumPy: convertir objetos Row
+        # cuesta un orden de magnitud más que leer el cursor
+        chunks: List[np.ndarray] = []
+        result = self.db.connection().execute(stmt)
+        try:
+            while True:
+                rows = result.cursor.fetchmany(FETCH_CHUNK)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.float64))
+        finally:
+            result.close()
+        if not chunks:
+            return np.empty(0), np.empty(0)
+
+        data = np.concatenate(chunks)
+        return data[:, 0], data[:, 1]
+
+    def reduced(
+        self,
+        sensor_id: int,
+        max_points: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[List[datetime], List[float]]:
+        """(timestamps, values) de los puntos elegidos, en orden cronológico."""
+        x, y = self.series(sensor_id, start, end)
+        idx = lttb_indices(x, y, max_points)
+        # Precisión de milisegundo: julianday() de SQLite no da más
+        timestamps = [EPOCH + timedelta(seconds=round(ts, 3)) for ts in x[idx].tolist()]
+        return timestamps, y[idx].tolist()
+
+    def points(
+        self,
+        sensor_id: int,
+        max_points: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[MeasurementPoint]:
+        timestamps, values = self.reduced(sensor_id, max_points, start, end)
+        return [
+            MeasurementPoint(timestamp=ts, value=value)
+            for ts, value in zip(timestamps, values)
+        ]
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ingestion_request import IngestionRequest
+
+
+class IdempotencyService:
+    """
+    Guarda la respuesta de cada petición de ingesta enviada con
+    cabecera Idempotency-Key, para que un reintento del gateway reciba
+    la misma respuesta sin volver a procesar el cuerpo.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_response(self, key: str, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Respuesta guardada para la clave, o None si no existe o caducó."""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.INGESTION_IDEMPOTENCY_TTL_HOURS)
+        obj = (
+            self.db.query(IngestionRequest)
+            .filter(IngestionRequest.idempotency_key == key)
+            .filter(IngestionRequest.endpoint == endpoint)
+            .filter(IngestionRequest.created_at >= cutoff)
+            .first()
+        )
+        return obj.response if obj else None
+
+    def save_response(self, key: str, endpoint: str, response: Dict[str, Any]) -> None:
+        """
+        Registra la respuesta. Si otra petición con la misma clave ganó
+        la carrera se conserva la suya; las mediciones ya quedaron
+        deduplicadas por el índice único.
+        """
+        self.purge_expired()
+
+        self.db.add(
+            IngestionRequest(
+                idempotency_key=key,
+                endpoint=endpoint,
+                response=response,
+                created_at=datetime.utcnow(),
+            )
+        )
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+
+    def purge_expired(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(hours=settings.INGESTION_IDEMPOTENCY_TTL_HOURS)
+        return (
+            self.db.query(IngestionRequest)
+            .filter(IngestionRequest.created_at < cutoff)
+            .delete(synchronize_session=False)
+        )
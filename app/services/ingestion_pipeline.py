@@ -0,0 +1,89 @@
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.alert import Alert
+from app.models.automation_log import AutomationLog
+from app.models.measurement import Measurement
+from app.models.sensor import Sensor
+from app.schemas.measurement import MeasurementPipelineResult
+from app.services.alert_service import AlertService
+from app.services.automation_service import AutomationService
+
+
+class IngestionPipeline:
+    """
+    Etapa de ingesta que evalúa umbrales y reglas de automatización
+    sobre un lote de mediciones nuevas.
+
+    Sensores, umbrales y reglas se cargan una vez por lote (agrupados
+    por sensor y zona), de modo que el coste por medición baja al
+    crecer el lote. Alertas, logs y cambios de actuadores se escriben
+    juntos; el commit lo hace el llamador o process(commit=True).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.alerts = AlertService(db)
+        self.automation = AutomationService(db)
+
+    def process(
+        self,
+        measurements: Sequence[Measurement],
+        commit: bool = False,
+        current: Optional[Sequence[Measurement]] = None,
+    ) -> MeasurementPipelineResult:
+        """
+        measurements puede contener modelos Measurement o cualquier objeto
+        con sensor_id y value (p. ej. filas aún sin id del INSERT en lote).
+
+        Los umbrales se evalúan sobre todas. Las reglas de automatización
+        solo sobre current (por defecto, todas): el llamador pasa las que
+        son la última lectura de su sensor, para que una lectura atrasada
+        o reenviada no mueva los actuadores.
+        """
+        result = MeasurementPipelineResult(measurements=len(measurements))
+        if not measurements:
+            return result
+
+        # 1. Zona de cada sensor (una consulta)
+        sensor_ids = {m.sensor_id for m in measurements}
+        zone_by_sensor: Dict[int, int] = {
+            sensor_id: zone_id
+            for sensor_id, zone_id in (
+                self.db.query(Sensor.id, Sensor.zone_id)
+                .filter(Sensor.id.in_(sensor_ids))
+                .all()
+            )
+        }
+
+        # 2. Umbrales por sensor y reglas por zona (una consulta cada uno)
+        thresholds = self.alerts.load_thresholds(zone_by_sensor.keys())
+        rules = self.automation.load_rules(set(zone_by_sensor.values()))
+
+        # 3. Evaluación en memoria
+        alert_rows = self.alerts.evaluate_batch(measurements, zone_by_sensor, thresholds)
+        log_rows, actions = self.automation.handle_batch(
+            measurements if current is None else current,
+            zone_by_sensor,
+            rules,
+        )
+
+        # 4. Escritura en la misma transacción
+        if alert_rows:
+            self.db.execute(insert(Alert.__table__), alert_rows)
+        if log_rows:
+            self.db.execute(insert(AutomationLog.__table__), log_rows)
+        if commit:
+            self.db.commit()
+
+        result.alerts = len(alert_rows)
+        result.automation_logs = len(log_rows)
+        result.actuator_actions = actions
+        return result
+
+
+def measurements_from_rows(rows: Sequence[Dict[str, Any]]) -> Sequence[Measurement]:
+    """Objetos Measurement transitorios (sin sesión) a partir de filas del INSERT."""
+    return [Measurement(**row) for row in rows]
@@ -0,0 +1,253 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, event
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.measurement import Measurement
+from app.models.sensor_latest import SensorLatest
+from app.schemas.sensor_latest import SensorLatest as SensorLatestSchema
+
+_table = SensorLatest.__table__
+
+# Cambios pendientes de la sesión; se pasan a la caché al hacer commit
+_PENDING_OFFERS = "sensor_latest_offers"
+_PENDING_INVALIDATIONS = "sensor_latest_invalidations"
+
+
+def newest_by_sensor(rows: Iterable[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """La fila con el timestamp más reciente de cada sensor del lote."""
+    out: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        current = out.get(row["sensor_id"])
+        if current is None or row["timestamp"] > current["timestamp"]:
+            out[row["sensor_id"]] = row
+    return out
+
+
+class SensorLatestCache:
+    """
+    Caché en proceso sensor → última lectura (None si no tiene), con
+    caducidad. Las ingestas de este proceso la actualizan al confirmarse;
+    la caducidad cubre las hechas desde otros procesos.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, Optional[SensorLatestSchema]]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(
+        self,
+        sensor_ids: Iterable[int],
+    ) -> Tuple[Dict[int, Optional[SensorLatestSchema]], List[int]]:
+        """(lecturas encontradas en caché, ids que hay que consultar)."""
+        now = time.monotonic()
+        found: Dict[int, Optional[SensorLatestSchema]] = {}
+        missing: List[int] = []
+        with self._lock:
+            for sensor_id in sensor_ids:
+                entry = self._entries.get(sensor_id)
+                if entry and now - entry[0] < self.ttl_seconds:
+                    found[sensor_id] = entry[1]
+                else:
+                    missing.append(sensor_id)
+        return found, missing
+
+    def set(self, sensor_id: int, latest: Optional[SensorLatestSchema]) -> None:
+        with self._lock:
+            self._entries[sensor_id] = (time.monotonic(), latest)
+
+    def offer(self, latest: Iterable[SensorLatestSchema]) -> None:
+        """Guarda lecturas nuevas salvo que la caché tenga una más reciente."""
+        now = time.monotonic()
+        with self._lock:
+            for item in latest:
+                entry = self._entries.get(item.sensor_id)
+                if entry and entry[1] is not None and entry[1].timestamp >= item.timestamp:
+                    continue
+                self._entries[item.sensor_id] = (now, item)
+
+    def invalidate(self, sensor_ids: Optional[Iterable[int]] = None) -> None:
+        with self._lock:
+            if sensor_ids is None:
+                self._entries.clear()
+            else:
+                for sensor_id in sensor_ids:
+                    self._entries.pop(sensor_id, None)
+
+
+sensor_latest_cache = SensorLatestCache(settings.SENSOR_LATEST_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_latest(session: Session) -> None:
+    invalidations = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if invalidations:
+        sensor_latest_cache.invalidate(invalidations)
+    offers = session.info.pop(_PENDING_OFFERS, None)
+    if offers:
+        sensor_latest_cache.offer(offers.values())
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_latest(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_OFFERS, None)
+        session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+class LatestService:
+    """
+    Mantenimiento y consulta de sensor_latest.
+
+    - apply(): upsert de la lectura más reciente de cada sensor del lote;
+      una lectura tardía (o repetida, con el mismo timestamp) no pisa a
+      la guardada. Devuelve las que sí la pisan, las únicas que evalúan
+      las reglas de automatización.
+    - refresh(): recalcula desde measurements tras editar o borrar.
+    - get(): lecturas actuales de varios sensores, desde la caché en
+      proceso y, para los que falten, con una consulta por clave primaria.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # MANTENIMIENTO
+    # ========================================================
+    def apply(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Actualiza sensor_latest con un lote recién insertado. No hace commit.
+        Devuelve las filas del lote que pasan a ser la última lectura de su
+        sensor; las tardías o repetidas no están entre ellas.
+        """
+        newest = newest_by_sensor(rows)
+        if not newest:
+            return []
+
+        stored = dict(
+            self.db.query(SensorLatest.sensor_id, SensorLatest.timestamp)
+            .filter(SensorLatest.sensor_id.in_(newest.keys()))
+            .all()
+        )
+        advanced = [
+            row
+            for sensor_id, row in newest.items()
+            if sensor_id not in stored or row["timestamp"] > stored[sensor_id]
+        ]
+        if not advanced:
+            return []
+
+        values = [
+            {
+                "sensor_id": row["sensor_id"],
+                "value": row["value"],
+                "unit": row.get("unit"),
+                "status": row.get("status"),
+                "timestamp": row["timestamp"],
+            }
+            for row in advanced
+        ]
+        # El upsert conserva su guarda: otra ingesta concurrente puede
+        # haber escrito una lectura más reciente tras la consulta
+        self._upsert(values)
+        offers = self.db.info.setdefault(_PENDING_OFFERS, {})
+        for row in values:
+            current = offers.get(row["sensor_id"])
+            if current is None or row["timestamp"] > current.timestamp:
+                offers[row["sensor_id"]] = SensorLatestSchema(**row)
+        return advanced
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        dialect = self.db.get_bind().dialect.name
+        c = _table.c
+
+        if dialect == "mysql":
+            stmt = mysql.insert(_table)
+            new = stmt.inserted
+            newer = new.timestamp > c.timestamp
+            # MySQL aplica las asignaciones en orden: timestamp va la última
+            stmt = stmt.on_duplicate_key_update(
+                [
+                    ("value", case((newer, new.value), else_=c.value)),
+                    ("unit", case((newer, new.unit), else_=c.unit)),
+                    ("status", case((newer, new.status), else_=c.status)),
+                    ("timestamp", case((newer, new.timestamp), else_=c.timestamp)),
+                ]
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect == "sqlite" else postgresql).insert(_table)
+            new = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[c.sensor_id],
+                set_={
+                    "value": new.value,
+                    "unit": new.unit,
+                    "status": new.status,
+                    "timestamp": new.timestamp,
+                },
+                where=new.timestamp > c.timestamp,
+            )
+        else:
+            for row in rows:
+                current = self.db.get(SensorLatest, row["sensor_id"])
+                if current is None:
+                    self.db.add(SensorLatest(**row))
+                elif row["timestamp"] > current.timestamp:
+                    for field, value in row.items():
+                        setattr(current, field, value)
+            return
+
+        self.db.execute(stmt, rows)
+
+    def refresh(self, sensor_ids: Iterable[int]) -> None:
+        """Recalcula la última lectura de los sensores desde measurements. No hace commit."""
+        sensor_ids = set(sensor_ids)
+        for sensor_id in sensor_ids:
+            newest = (
+                self.db.query(Measurement)
+                .filter(Measurement.sensor_id == sensor_id)
+                .order_by(Measurement.timestamp.desc())
+                .first()
+            )
+            current = self.db.get(SensorLatest, sensor_id)
+            if newest is None:
+                if current is not None:
+                    self.db.delete(current)
+                continue
+            if current is None:
+                current = SensorLatest(sensor_id=sensor_id)
+                self.db.add(current)
+            current.value = newest.value
+            current.unit = newest.unit
+            current.status = newest.status
+            current.timestamp = newest.timestamp
+
+        self.db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(sensor_ids)
+        offers = self.db.info.get(_PENDING_OFFERS)
+        if offers:
+            for sensor_id in sensor_ids:
+                offers.pop(sensor_id, None)
+
+    # ========================================================
+    # CONSULTA
+    # ========================================================
+    def get(self, sensor_ids: Iterable[int]) -> List[SensorLatestSchema]:
+        """Última lectura de cada sensor, en el orden de sensor_ids; omite los que no tienen."""
+        sensor_ids = list(dict.fromkeys(sensor_ids))
+        found, missing = sensor_latest_cache.get_many(sensor_ids)
+
+        if missing:
+            rows = {
+                row.sensor_id: SensorLatestSchema.model_validate(row)
+                for row in self.db.query(SensorLatest).filter(SensorLatest.sensor_id.in_(missing)).all()
+            }
+            for sensor_id in missing:
+                found[sensor_id] = rows.get(sensor_id)
+                sensor_latest_cache.set(sensor_id, rows.get(sensor_id))
+
+        return [found[sensor_id] for sensor_id in sensor_ids if found[sensor_id] is not None]
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.schemas.measurement import MeasurementMatrix, MeasurementMatrixSeries
+from app.services.aggregation_service import EPOCH, AggregationService
+from app.services.archive_service import MeasurementArchive
+from app.utils.gap_fill import fill_gaps
+
+# Columnas de AggregationService.rows()
+_SENSOR, _EPOCH, _COUNT, _SUM, _MIN, _MAX = range(6)
+
+
+def _first_bucket(start: datetime, bucket_seconds: int) -> int:
+    return int((start - EPOCH).total_seconds()) // bucket_seconds * bucket_seconds
+
+
+def axis_length(start: datetime, end: datetime, bucket_seconds: int) -> int:
+    """Número de intervalos alineados a epoch que tocan [start, end)."""
+    span = (end - EPOCH).total_seconds() - _first_bucket(start, bucket_seconds)
+    return max(int(np.ceil(span / bucket_seconds)), 0)
+
+
+def bucket_axis(start: datetime, end: datetime, bucket_seconds: int) -> np.ndarray:
+    """Inicios (epoch s) de esos intervalos."""
+    first = _first_bucket(start, bucket_seconds)
+    return first + bucket_seconds * np.arange(axis_length(start, end, bucket_seconds), dtype=np.int64)
+
+
+class MatrixService:
+    """
+    Series de varios sensores alineadas sobre un eje de tiempo común.
+
+    AggregationService.rows agrega todos los sensores a la vez por
+    intervalo (desde rollups cuando se puede); el resultado
+    se coloca en una matriz sensor × intervalo de NumPy con NaN en los
+    huecos, que se rellenan según `fill` con operaciones vectorizadas
+    (app.utils.gap_fill).
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        use_rollups: bool = True,
+        archive: Optional[MeasurementArchive] = None,
+    ):
+        self.db = db
+        self.use_rollups = use_rollups
+        self.archive = archive
+
+    def matrix(
+        self,
+        sensor_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        bucket_seconds: int,
+        aggregation: str = "avg",
+        fill: str = "none",
+        units: Optional[Dict[int, Optional[str]]] = None,
+    ) -> MeasurementMatrix:
+        axis = bucket_axis(start, end, bucket_seconds)
+        values = self.values(sensor_ids, axis, end, bucket_seconds, aggregation)
+        if aggregation != "count":
+            values = fill_gaps(values, fill)
+
+        # NaN → None para el JSON
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        units = units or {}
+        return MeasurementMatrix(
+            bucket_seconds=bucket_seconds,
+            aggregation=aggregation,
+            fill=fill,
+            timestamps=[EPOCH + timedelta(seconds=ts) for ts in axis.tolist()],
+            series=[
+                MeasurementMatrixSeries(sensor_id=sensor_id, unit=units.get(sensor_id), values=row)
+                for sensor_id, row in zip(sensor_ids, cells.tolist())
+            ],
+        )
+
+    def values(
+        self,
+        sensor_ids: Sequence[int],
+        axis: np.ndarray,
+        end: datetime,
+        bucket_seconds: int,
+        aggregation: str,
+    ) -> np.ndarray:
+        """Matriz len(sensor_ids) × len(axis) con la agregación de cada intervalo (NaN si vacío)."""
+        # Sin datos un intervalo cuenta 0, no es un hueco
+        empty = 0.0 if aggregation == "count" else np.nan
+        out = np.full((len(sensor_ids), len(axis)), empty)
+        if not len(sensor_ids) or not len(axis):
+            return out
+
+        rows = AggregationService(self.db, use_rollups=self.use_rollups, archive=self.archive).rows(
+            sensor_ids,
+            bucket_seconds,
+            start=EPOCH + timedelta(seconds=int(axis[0])),
+            end=end,
+        )
+        if not rows:
+            return out
+        data = np.array(rows, dtype=np.float64)
+
+        if aggregation == "avg":
+            column = data[:, _SUM] / data[:, _COUNT]
+        else:
+            column = data[:, {"count": _COUNT, "sum": _SUM, "min": _MIN, "max": _MAX}[aggregation]]
+
+        # Fila de cada sensor en el orden pedido y columna de cada intervalo
+        ids = np.asarray(sensor_ids, dtype=np.int64)
+        order = np.argsort(ids)
+        row_idx = order[np.searchsorted(ids, data[:, _SENSOR].astype(np.int64), sorter=order)]
+        col_idx = (data[:, _EPOCH].astype(np.int64) - axis[0]) // bucket_seconds
+        # Solo se colocan los intervalos que caen dentro del eje
+        keep = (col_idx >= 0) & (col_idx < len(axis))
+        out[row_idx[keep], col_idx[keep]] = column[keep]
+        return out
@@ -0,0 +1,513 @@
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.measurement import Measurement
+from app.models.sensor import Sensor
+from app.schemas.measurement import (
+    MeasurementCreate,
+    MeasurementPipelineResult,
+    MeasurementBulkItemResult,
+    MeasurementBulkResult,
+    MeasurementBinaryResult,
+    MeasurementStreamLineError,
+    MeasurementStreamResult,
+)
+from app.services.block_service import BlockService
+from app.services.ingestion_pipeline import IngestionPipeline, measurements_from_rows
+from app.services.latest_service import LatestService
+from app.services.rollup_service import RollupService
+from app.utils.measurement_codec import (
+    decode_records,
+    epoch_ms_to_datetime,
+    is_valid_value,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tamaño máximo del IN (sensor_id, timestamp) al buscar duplicados
+_KEY_LOOKUP_CHUNK = 1000
+
+# INSERT que ignora filas que violan uq_measurements_sensor_timestamp
+_insert_ignore = (
+    insert(Measurement.__table__)
+    .prefix_with("IGNORE", dialect="mysql")
+    .prefix_with("OR IGNORE", dialect="sqlite")
+)
+
+
+class MeasurementService:
+    """
+    Servicio de ingesta de mediciones:
+    - valida lotes elemento a elemento
+    - inserta todas las filas válidas con un único INSERT multi-fila
+    - confirma el lote con un solo commit
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # INGESTA EN LOTE → POST /measurements/bulk
+    # ========================================================
+    def ingest_bulk(self, items: Sequence[Any]) -> MeasurementBulkResult:
+        """
+        Valida cada elemento contra MeasurementCreate y comprueba que el
+        sensor exista. Las filas válidas se escriben en una sola
+        transacción; las inválidas se reportan sin abortar el lote.
+        """
+
+        results: List[MeasurementBulkItemResult] = []
+        valid: List[Tuple[int, MeasurementCreate]] = []
+
+        for index, raw in enumerate(items):
+            try:
+                valid.append((index, MeasurementCreate.model_validate(raw)))
+            except ValidationError as e:
+                results.append(
+                    MeasurementBulkItemResult(
+                        index=index,
+                        accepted=False,
+                        error=format_validation_error(e),
+                    )
+                )
+
+        known = self.existing_sensor_ids(m_in.sensor_id for _, m_in in valid)
+
+        rows: List[Dict[str, Any]] = []
+        row_indexes: List[int] = []
+        for index, m_in in valid:
+            if m_in.sensor_id not in known:
+                results.append(
+                    MeasurementBulkItemResult(
+                        index=index,
+                        accepted=False,
+                        error=f"Sensor {m_in.sensor_id} no encontrado",
+                    )
+                )
+                continue
+
+            rows.append(self.to_row(m_in))
+            row_indexes.append(index)
+
+        fresh, duplicate_positions = self.split_duplicates(rows)
+        duplicated = {row_indexes[p] for p in duplicate_positions}
+        for index in row_indexes:
+            results.append(
+                MeasurementBulkItemResult(
+                    index=index,
+                    accepted=True,
+                    duplicate=index in duplicated,
+                )
+            )
+
+        inserted = self.write_rows(fresh)
+
+        results.sort(key=lambda r: r.index)
+        return MeasurementBulkResult(
+            received=len(items),
+            accepted=len(rows),
+            rejected=len(items) - len(rows),
+            inserted=inserted,
+            duplicates=len(rows) - inserted,
+            results=results,
+        )
+
+    # ========================================================
+    # INGESTA BINARIA → POST /measurements/binary
+    # ========================================================
+    def ingest_binary(
+        self,
+        payload: bytes,
+        unit: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> MeasurementBinaryResult:
+        """
+        Decodifica registros binarios (ver app.utils.measurement_codec) y
+        los escribe por insert_rows, igual que el camino de
+        MeasurementCreate pero sin crear un modelo pydantic por registro.
+        unit y status se aplican a todo el lote.
+        """
+        rows, received = self.rows_from_binary(payload, unit, status)
+        invalid = received - len(rows)
+
+        sensor_ids = {r["sensor_id"] for r in rows}
+        known = self.existing_sensor_ids(sensor_ids)
+        if len(known) < len(sensor_ids):
+            rows = [r for r in rows if r["sensor_id"] in known]
+
+        inserted = self.insert_rows(rows)
+
+        return MeasurementBinaryResult(
+            received=received,
+            accepted=len(rows),
+            rejected=received - len(rows),
+            inserted=inserted,
+            duplicates=len(rows) - inserted,
+            invalid_values=invalid,
+            unknown_sensor_ids=sorted(sensor_ids - known),
+        )
+
+    @staticmethod
+    def rows_from_binary(
+        payload: bytes,
+        unit: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Decodifica el cuerpo binario a filas con las mismas columnas que
+        to_row(). Devuelve (filas válidas, registros recibidos); los
+        valores NaN/Inf se descartan.
+        """
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        received = 0
+
+        for sensor_id, epoch_ms, value in decode_records(payload):
+            received += 1
+            if not is_valid_value(value):
+                continue
+            rows.append(
+                {
+                    "value": value,
+                    "unit": unit,
+                    "status": status,
+                    "sensor_id": sensor_id,
+                    "timestamp": epoch_ms_to_datetime(epoch_ms) if epoch_ms else now,
+                }
+            )
+
+        return rows, received
+
+    # ========================================================
+    # ESCRITURA
+    # ========================================================
+    def insert_rows(self, rows: List[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Inserta las filas con un único executemany, que el driver
+        (pymysql) reescribe como INSERT multi-fila, y pasa el lote por
+        el pipeline de umbrales/reglas dentro de la misma transacción.
+        Las lecturas repetidas (mismo sensor_id y timestamp) se descartan.
+        Devuelve el número de filas nuevas.
+        """
+        fresh, _ = self.split_duplicates(rows)
+        return self.write_rows(fresh, commit=commit)
+
+    def write_rows(self, rows: List[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Escribe filas ya deduplicadas con INSERT IGNORE: si un reintento
+        concurrente se adelantó, el índice único descarta la fila en vez
+        de abortar el lote. Rollups, bloques, sensor_latest y reglas solo
+        reciben las filas que se insertaron de verdad. Devuelve cuántas son.
+        """
+        landed: List[Dict[str, Any]] = []
+        if rows:
+            landed = self.insert_ignore(rows)
+        if landed:
+            self.update_rollups(landed)
+            self.update_blocks(landed)
+            current = {(r["sensor_id"], r["timestamp"]) for r in self.update_latest(landed)}
+            measurements = measurements_from_rows(landed)
+            self.evaluate(
+                measurements,
+                current=[m for m in measurements if (m.sensor_id, m.timestamp) in current],
+            )
+        if commit:
+            self.db.commit()
+        return len(landed)
+
+    def insert_ignore(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        INSERT IGNORE del lote; devuelve las filas que el índice único no
+        descartó. Con RETURNING (SQLite, MariaDB, PostgreSQL) son las que
+        devuelve el propio INSERT. En MySQL, si rowcount dice que faltan
+        filas, se releen las claves: la lectura usa la instantánea de la
+        transacción (REPEATABLE READ, abierta por split_duplicates), así que
+        ve las filas propias recién insertadas pero no las que un reintento
+        concurrente confirmó después.
+        """
+        if self.db.get_bind().dialect.insert_executemany_returning:
+            result = self.db.execute(
+                _insert_ignore.returning(Measurement.sensor_id, Measurement.timestamp), rows
+            )
+            keys = set(result.all())
+        else:
+            result = self.db.execute(_insert_ignore, rows)
+            if 0 <= result.rowcount and result.rowcount == len(rows):
+                return rows
+            keys = self.existing_keys((r["sensor_id"], r["timestamp"]) for r in rows)
+        return [r for r in rows if (r["sensor_id"], r["timestamp"]) in keys]
+
+    def split_duplicates(
+        self,
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Separa las filas nuevas de las repetidas, ya sea dentro del lote
+        o porque ya están guardadas (consulta sobre el índice único).
+        Devuelve (filas nuevas, posiciones de las repetidas en rows).
+        """
+        keys = [(r["sensor_id"], r["timestamp"]) for r in rows]
+        existing = self.existing_keys(keys)
+
+        fresh: List[Dict[str, Any]] = []
+        duplicates: List[int] = []
+        seen: Set[Tuple[int, datetime]] = set()
+
+        for position, (row, key) in enumerate(zip(rows, keys)):
+            if key in seen or key in existing:
+                duplicates.append(position)
+                continue
+            seen.add(key)
+            fresh.append(row)
+
+        return fresh, duplicates
+
+    def existing_keys(
+        self,
+        keys: Iterable[Tuple[int, datetime]],
+    ) -> Set[Tuple[int, datetime]]:
+        """Claves (sensor_id, timestamp) que ya existen en measurements."""
+        pending = list(set(keys))
+        found: Set[Tuple[int, datetime]] = set()
+
+        for start in range(0, len(pending), _KEY_LOOKUP_CHUNK):
+            chunk = pending[start:start + _KEY_LOOKUP_CHUNK]
+            found.update(
+                (sensor_id, timestamp)
+                for sensor_id, timestamp in (
+                    self.db.query(Measurement.sensor_id, Measurement.timestamp)
+                    .filter(tuple_(Measurement.sensor_id, Measurement.timestamp).in_(chunk))
+                    .all()
+                )
+            )
+
+        return found
+
+    def update_rollups(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Suma las filas nuevas a measurement_rollups sin hacer commit."""
+        if settings.MEASUREMENT_ROLLUPS_ENABLED:
+            RollupService(self.db).apply(rows)
+
+    def update_blocks(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Fusiona las filas nuevas en measurement_blocks sin hacer commit."""
+        if settings.MEASUREMENT_BLOCKS_ENABLED:
+            BlockService(self.db).apply(rows)
+
+    def update_latest(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Actualiza sensor_latest con las filas nuevas sin hacer commit.
+        Devuelve las que pasan a ser la última lectura de su sensor.
+        """
+        return LatestService(self.db).apply(rows)
+
+    def evaluate(
+        self,
+        measurements: Sequence[Measurement],
+        current: Optional[Sequence[Measurement]] = None,
+    ) -> MeasurementPipelineResult:
+        """
+        Evalúa umbrales y reglas del lote sin hacer commit. current son las
+        mediciones que actualizaron sensor_latest: solo ellas pasan por las
+        reglas de automatización (ver IngestionPipeline.process).
+        """
+        if not settings.INGESTION_EVALUATE_RULES:
+            return MeasurementPipelineResult(measurements=len(measurements))
+        return IngestionPipeline(self.db).process(measurements, current=current)
+
+    # ========================================================
+    # HELPERS
+    # ========================================================
+    def existing_sensor_ids(self, sensor_ids: Iterable[int]) -> Set[int]:
+        """Devuelve, con una sola consulta, los ids que existen en sensors."""
+        ids = set(sensor_ids)
+        if not ids:
+            return set()
+        found = self.db.query(Sensor.id).filter(Sensor.id.in_(ids)).all()
+        return {sensor_id for (sensor_id,) in found}
+
+    @staticmethod
+    def to_row(m_in: MeasurementCreate) -> Dict[str, Any]:
+        """
+        Convierte una medición validada en una fila para el INSERT.
+        Todas las filas llevan las mismas columnas para que el lote
+        viaje en un solo executemany; sin timestamp se usa la hora actual.
+        Los timestamps se guardan en UTC sin zona, como datetime.utcnow().
+        """
+        return {
+            "value": m_in.value,
+            "unit": m_in.unit,
+            "status": m_in.status,
+            "sensor_id": m_in.sensor_id,
+            "timestamp": to_utc_naive(m_in.timestamp) if m_in.timestamp else datetime.utcnow(),
+        }
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normaliza un datetime con zona a UTC naive; los naive se asumen UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Resume un ValidationError de pydantic en una línea legible."""
+    parts = []
+    for err in error.errors():
+        loc = ".".join(str(p) for p in err.get("loc", ())) or "body"
+        parts.append(f"{loc}: {err.get('msg')}")
+    return "; ".join(parts)
+
+
+class MeasurementStreamIngestor:
+    """
+    Ingesta incremental de un cuerpo NDJSON (una medición por línea).
+
+    Recibe el cuerpo por trozos con feed(), valida cada línea contra
+    MeasurementCreate y acumula como máximo chunk_size filas; mientras
+    ready() sea True el llamador invoca flush(), que escribe el trozo en
+    una transacción. La memoria usada no depende del tamaño del cuerpo.
+    """
+
+    def __init__(
+        self,
+        service: MeasurementService,
+        chunk_size: int = 1000,
+        max_line_bytes: int = 65536,
+        max_errors: int = 1000,
+    ):
+        self.service = service
+        self.chunk_size = chunk_size
+        self.max_line_bytes = max_line_bytes
+        self.max_errors = max_errors
+
+        self._buffer = b""
+        self._discarding = False
+        self._lines: Deque[Optional[bytes]] = deque()
+        self._pending: List[Tuple[int, MeasurementCreate]] = []
+        self._known_sensors: Set[int] = set()
+
+        self.lines = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.chunks = 0
+        self.errors: List[MeasurementStreamLineError] = []
+        self.errors_truncated = False
+
+    # ========================================================
+    # LECTURA
+    # ========================================================
+    def feed(self, data: bytes) -> None:
+        """Añade un trozo del cuerpo; las líneas completas quedan en cola."""
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+
+        if self._discarding:
+            if lines:
+                # Final de una línea demasiado larga ya reportada
+                lines = lines[1:]
+                self._discarding = False
+            else:
+                self._buffer = b""
+
+        self._lines.extend(lines)
+
+        if len(self._buffer) > self.max_line_bytes:
+            self._buffer = b""
+            self._discarding = True
+            self._lines.append(None)
+
+    def close(self) -> None:
+        """Encola la última línea si el cuerpo no termina en salto de línea."""
+        if self._buffer and not self._discarding:
+            self._lines.append(self._buffer)
+        self._buffer = b""
+
+    def ready(self) -> bool:
+        """
+        Valida líneas en cola hasta completar un trozo. Devuelve True si
+        hay chunk_size filas listas para escribir con flush().
+        """
+        while self._lines and len(self._pending) < self.chunk_size:
+            self._add_line(self._lines.popleft())
+        return len(self._pending) >= self.chunk_size
+
+    def _add_line(self, line: Optional[bytes]) -> None:
+        self.lines += 1
+        if line is None or len(line) > self.max_line_bytes:
+            self._reject(self.lines, f"Línea mayor a {self.max_line_bytes} bytes")
+            return
+
+        line = line.strip()
+        if not line:
+            return
+
+        try:
+            m_in = MeasurementCreate.model_validate_json(line)
+        except ValidationError as e:
+            self._reject(self.lines, format_validation_error(e))
+            return
+
+        self._pending.append((self.lines, m_in))
+
+    # ========================================================
+    # ESCRITURA
+    # ========================================================
+    def flush(self) -> None:
+        """Escribe las filas pendientes en una transacción."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        unknown = {m_in.sensor_id for _, m_in in pending} - self._known_sensors
+        self._known_sensors |= self.service.existing_sensor_ids(unknown)
+
+        rows: List[Dict[str, Any]] = []
+        for line_no, m_in in pending:
+            if m_in.sensor_id not in self._known_sensors:
+                self._reject(line_no, f"Sensor {m_in.sensor_id} no encontrado")
+                continue
+            rows.append(MeasurementService.to_row(m_in))
+
+        inserted = self.service.insert_rows(rows)
+        self.accepted += len(rows)
+        self.inserted += inserted
+        self.duplicates += len(rows) - inserted
+        self.chunks += 1
+
+        logger.info(
+            "Ingesta NDJSON: %s líneas leídas, %s aceptadas (%s duplicadas), %s rechazadas (trozo %s)",
+            self.lines,
+            self.accepted,
+            self.duplicates,
+            self.rejected,
+            self.chunks,
+        )
+
+    def _reject(self, line_no: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(MeasurementStreamLineError(line=line_no, error=error))
+        else:
+            self.errors_truncated = True
+
+    def result(self) -> MeasurementStreamResult:
+        return MeasurementStreamResult(
+            lines=self.lines,
+            accepted=self.accepted,
+            rejected=self.rejected,
+            inserted=self.inserted,
+            duplicates=self.duplicates,
+            chunks=self.chunks,
+            errors=sorted(self.errors, key=lambda e: e.line),
+            errors_truncated=self.errors_truncated,
+        )
@@ -0,0 +1,220 @@
+import logging
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+TABLE = "measurements"
+
+# Partición comodín para lecturas más nuevas que la última partición mensual
+FUTURE_PARTITION = "p_future"
+# Partición inicial con todo lo anterior al primer mes particionado
+OLD_PARTITION = "p_old"
+
+
+class PartitioningNotSupportedError(Exception):
+    """El particionado por rango solo está implementado para MySQL."""
+
+
+class MeasurementPartition(NamedTuple):
+    name: str
+    # Límite superior exclusivo; None para p_future (MAXVALUE)
+    upper_bound: Optional[datetime]
+    # Estimación de InnoDB (information_schema)
+    rows: int
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"p{month:%Y%m}"
+
+
+class MeasurementPartitionService:
+    """
+    Particionado mensual de measurements (MySQL, RANGE COLUMNS(timestamp)).
+
+    - enable(): conversión única de la tabla. MySQL exige que toda clave
+      única incluya la columna de particionado y no admite claves
+      foráneas en tablas particionadas, así que la PK pasa a ser
+      (id, timestamp) y se elimina la FK a sensors (el borrado de un
+      sensor ya borra sus mediciones de forma explícita).
+    - ensure_future(): crea por adelantado las particiones de los
+      próximos meses partiendo p_future (vacía, operación instantánea).
+    - expire(): elimina, o archiva con EXCHANGE PARTITION, los meses
+      anteriores al periodo de retención. Ambas operaciones son O(1):
+      no recorren filas.
+
+    Las consultas con filtro de timestamp se limitan a las particiones
+    del rango (partition pruning) sin cambios en el código.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # ESTADO
+    # ========================================================
+    def _check_dialect(self) -> None:
+        if self.db.get_bind().dialect.name != "mysql":
+            raise PartitioningNotSupportedError(
+                "El particionado de measurements solo está disponible en MySQL"
+            )
+
+    def partitions(self) -> List[MeasurementPartition]:
+        self._check_dialect()
+        rows = self.db.execute(
+            text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+                "FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            {"table": TABLE},
+        ).all()
+        return [
+            MeasurementPartition(name, _parse_bound(description), rows or 0)
+            for name, description, rows in rows
+        ]
+
+    def is_partitioned(self) -> bool:
+        return bool(self.partitions())
+
+    # ========================================================
+    # CONVERSIÓN INICIAL
+    # ========================================================
+    def enable(self, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+        """
+        Particiona la tabla por meses desde la lectura más antigua hasta
+        months_ahead meses después de now. Reescribe la tabla entera:
+        ejecutar en una ventana de mantenimiento.
+        """
+        self._check_dialect()
+        if self.is_partitioned():
+            return []
+
+        now = month_start(now or datetime.utcnow())
+        oldest = self.db.execute(text(f"SELECT MIN(`timestamp`) FROM {TABLE}")).scalar()
+        first = month_start(oldest) if oldest else now
+        last = add_months(now, months_ahead)
+
+        statements = [
+            f"ALTER TABLE {TABLE} DROP FOREIGN KEY `{fk['name']}`"
+            for fk in inspect(self.db.get_bind()).get_foreign_keys(TABLE)
+            if fk.get("name")
+        ]
+        statements += [
+            f"UPDATE {TABLE} SET `timestamp` = COALESCE(created_at, NOW()) WHERE `timestamp` IS NULL",
+            f"ALTER TABLE {TABLE} MODIFY `timestamp` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)",
+            f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, `timestamp`)",
+        ]
+
+        parts = [f"PARTITION {OLD_PARTITION} VALUES LESS THAN ('{first:%Y-%m-%d}')"]
+        month = first
+        while month <= last:
+            parts.append(_partition_sql(month))
+            month = add_months(month, 1)
+        parts.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        statements.append(
+            f"ALTER TABLE {TABLE} PARTITION BY RANGE COLUMNS(`timestamp`) (\n    "
+            + ",\n    ".join(parts)
+            + "\n)"
+        )
+
+        for statement in statements:
+            logger.info("%s", statement)
+            self.db.execute(text(statement))
+        self.db.commit()
+        return statements
+
+    # ========================================================
+    # MANTENIMIENTO
+    # ========================================================
+    def ensure_future(self, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+        """Crea las particiones mensuales que falten hasta now + months_ahead."""
+        partitions = self.partitions()
+        if not partitions:
+            return []
+
+        bounds = [p.upper_bound for p in partitions if p.upper_bound is not None]
+        month = max(bounds)
+        last = add_months(month_start(now or datetime.utcnow()), months_ahead)
+
+        created = []
+        new_parts = []
+        while month <= last:
+            created.append(partition_name(month))
+            new_parts.append(_partition_sql(month))
+            month = add_months(month, 1)
+
+        if new_parts:
+            new_parts.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+            statement = (
+                f"ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (\n    "
+                + ",\n    ".join(new_parts)
+                + "\n)"
+            )
+            logger.info("%s", statement)
+            self.db.execute(text(statement))
+            self.db.commit()
+        return created
+
+    def expire(
+        self,
+        retention_months: int,
+        archive: bool = False,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Quita las particiones cuyo mes terminó antes del periodo de
+        retención. Con archive=True cada partición se mueve a su propia
+        tabla measurements_archive_<partición> antes de quitarla.
+        Los agregados de measurement_rollups se conservan.
+        """
+        cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+        expired = [
+            p.name
+            for p in self.partitions()
+            if p.upper_bound is not None and p.upper_bound <= cutoff
+        ]
+
+        for name in expired:
+            if archive:
+                archive_table = f"{TABLE}_archive_{name}"
+                for statement in (
+                    f"CREATE TABLE {archive_table} LIKE {TABLE}",
+                    f"ALTER TABLE {archive_table} REMOVE PARTITIONING",
+                    f"ALTER TABLE {TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive_table}",
+                ):
+                    logger.info("%s", statement)
+                    self.db.execute(text(statement))
+
+            statement = f"ALTER TABLE {TABLE} DROP PARTITION {name}"
+            logger.info("%s", statement)
+            self.db.execute(text(statement))
+        self.db.commit()
+        return expired
+
+
+def _partition_sql(month: datetime) -> str:
+    return (
+        f"PARTITION {partition_name(month)} "
+        f"VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def _parse_bound(description: Optional[str]) -> Optional[datetime]:
+    if not description or description.upper() == "MAXVALUE":
+        return None
+    return datetime.fromisoformat(description.strip("'"))
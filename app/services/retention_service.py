@@ -0,0 +1,265 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.measurement import Measurement
+from app.models.measurement_block import MeasurementBlock
+from app.models.measurement_rollup import MeasurementRollup
+from app.models.retention_policy import RetentionPolicy
+from app.core.config import settings
+from app.models.sensor import Sensor
+from app.schemas.retention_policy import RetentionPolicyRunResult, RetentionRunResult
+from app.services.archive_service import MeasurementArchive
+from app.services.partition_service import add_months, month_start
+
+logger = logging.getLogger(__name__)
+
+# Columna de la política que fija el plazo de cada resolución de rollups
+ROLLUP_RETENTION = {
+    "1m": "rollup_1m_retention_days",
+    "1h": "rollup_1h_retention_days",
+    "1d": "rollup_1d_retention_days",
+}
+
+
+def specificity(policy: RetentionPolicy) -> int:
+    """zona + tipo > zona > tipo > política por defecto."""
+    return (2 if policy.zone_id is not None else 0) + (1 if policy.sensor_type is not None else 0)
+
+
+def matches(policy: RetentionPolicy, sensor_type: Optional[str], zone_id: Optional[int]) -> bool:
+    if policy.zone_id is not None and policy.zone_id != zone_id:
+        return False
+    if policy.sensor_type is not None and policy.sensor_type != sensor_type:
+        return False
+    return True
+
+
+def _policy_for(
+    ordered: List[RetentionPolicy],
+    sensor_type: Optional[str],
+    zone_id: Optional[int],
+) -> Optional[RetentionPolicy]:
+    """La primera política de ordered (ver RetentionService._ordered) que aplica al sensor."""
+    for policy in ordered:
+        if matches(policy, sensor_type, zone_id):
+            return policy
+    return None
+
+
+class RetentionService:
+    """
+    Aplica las políticas de retención sobre measurements,
+    measurement_blocks y measurement_rollups.
+
+    Cada sensor queda bajo la política activa más específica que le
+    corresponda. Los borrados van por sensor y en lotes de batch_size
+    filas (SELECT de ids por el índice (sensor_id, timestamp) + DELETE
+    por id), con un commit por lote y una pausa opcional entre lotes:
+    ningún DELETE mantiene bloqueos largos sobre la tabla.
+
+    Con archive, las mediciones crudas fuera de plazo se copian antes al
+    archivo frío; el corte se redondea al inicio de mes para archivar
+    solo meses completos. Los bloques comprimidos siguen el plazo de las
+    mediciones crudas, por horas completas: el de la hora del corte se
+    borra en la siguiente ejecución.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 5000,
+        pause_ms: int = 0,
+        archive: Optional[MeasurementArchive] = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.pause_ms = pause_ms
+        self.archive = archive
+
+    # ========================================================
+    # ASIGNACIÓN
+    # ========================================================
+    def assign(
+        self,
+        policies: Optional[List[RetentionPolicy]] = None,
+    ) -> Dict[int, Tuple[RetentionPolicy, List[int]]]:
+        """policy_id -> (política, sensores a los que se aplica)."""
+        ordered = self._ordered(policies)
+
+        assigned: Dict[int, Tuple[RetentionPolicy, List[int]]] = {
+            p.id: (p, []) for p in ordered
+        }
+        sensors = self.db.query(Sensor.id, Sensor.sensor_type, Sensor.zone_id).all()
+        for sensor_id, sensor_type, zone_id in sensors:
+            policy = _policy_for(ordered, sensor_type, zone_id)
+            if policy is not None:
+                assigned[policy.id][1].append(sensor_id)
+        return assigned
+
+    def raw_cutoffs(
+        self,
+        sensor_ids: Optional[Iterable[int]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[int, Optional[datetime]]:
+        """
+        sensor_id -> instante antes del cual sus mediciones crudas pueden
+        estar ya borradas, por su política de retención o por particiones
+        expiradas; None si no se borran nunca. Sin sensor_ids, todos los
+        sensores. Una consulta de políticas y otra de sensores.
+        """
+        now = now or datetime.utcnow()
+        partition = None
+        if settings.MEASUREMENTS_PARTITION_RETENTION_MONTHS:
+            partition = add_months(month_start(now), -settings.MEASUREMENTS_PARTITION_RETENTION_MONTHS)
+
+        ordered = self._ordered()
+        q = self.db.query(Sensor.id, Sensor.sensor_type, Sensor.zone_id)
+        if sensor_ids is not None:
+            q = q.filter(Sensor.id.in_(set(sensor_ids)))
+
+        cutoffs: Dict[int, Optional[datetime]] = {}
+        for sensor_id, sensor_type, zone_id in q.all():
+            policy = _policy_for(ordered, sensor_type, zone_id)
+            cutoff = partition
+            if policy is not None and policy.raw_retention_days:
+                expired = now - timedelta(days=policy.raw_retention_days)
+                cutoff = expired if cutoff is None else max(cutoff, expired)
+            cutoffs[sensor_id] = cutoff
+        return cutoffs
+
+    def raw_cutoff(self, sensor_id: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        """raw_cutoffs() de un solo sensor."""
+        return self.raw_cutoffs([sensor_id], now).get(sensor_id)
+
+    def _ordered(self, policies: Optional[List[RetentionPolicy]] = None) -> List[RetentionPolicy]:
+        """Políticas (por defecto, las activas) de la más específica a la menos."""
+        if policies is None:
+            policies = (
+                self.db.query(RetentionPolicy)
+                .filter(RetentionPolicy.is_active.is_(True))
+                .all()
+            )
+        return sorted(policies, key=lambda p: (-specificity(p), p.id))
+
+    # ========================================================
+    # EJECUCIÓN
+    # ========================================================
+    def run(
+        self,
+        policy_id: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> RetentionRunResult:
+        """
+        Ejecuta todas las políticas activas (o solo policy_id, que sigue
+        respetando la asignación por especificidad) y guarda en cada
+        política las filas eliminadas.
+        """
+        now = now or datetime.utcnow()
+        result = RetentionRunResult(started_at=datetime.utcnow(), finished_at=datetime.utcnow())
+
+        for policy, sensor_ids in self.assign().values():
+            if policy_id is not None and policy.id != policy_id:
+                continue
+
+            outcome = self._apply(policy, sensor_ids, now)
+            rollups = outcome.rollup_1m_deleted + outcome.rollup_1h_deleted + outcome.rollup_1d_deleted
+
+            policy.last_run_at = now
+            policy.last_run_raw_deleted = outcome.raw_deleted
+            policy.last_run_rollups_deleted = rollups
+            self.db.commit()
+
+            logger.info(
+                "política %s (%s sensores): %s mediciones, %s agregados eliminados",
+                policy.id,
+                outcome.sensors,
+                outcome.raw_deleted,
+                rollups,
+            )
+            result.raw_deleted += outcome.raw_deleted
+            result.raw_archived += outcome.raw_archived
+            result.blocks_deleted += outcome.blocks_deleted
+            result.rollups_deleted += rollups
+            result.policies.append(outcome)
+
+        result.finished_at = datetime.utcnow()
+        return result
+
+    def _apply(
+        self,
+        policy: RetentionPolicy,
+        sensor_ids: List[int],
+        now: datetime,
+    ) -> RetentionPolicyRunResult:
+        outcome = RetentionPolicyRunResult(policy_id=policy.id, sensors=len(sensor_ids))
+
+        for sensor_id in sensor_ids:
+            if policy.raw_retention_days:
+                cutoff = now - timedelta(days=policy.raw_retention_days)
+                if self.archive is not None:
+                    cutoff = month_start(cutoff)
+                    outcome.raw_archived += self.archive.export(self.db, sensor_id, cutoff)
+                outcome.raw_deleted += self._purge_raw(sensor_id, cutoff)
+                outcome.blocks_deleted += self._purge_blocks(sensor_id, cutoff)
+            for resolution, column in ROLLUP_RETENTION.items():
+                days = getattr(policy, column)
+                if not days:
+                    continue
+                deleted = self._purge_rollups(sensor_id, resolution, now - timedelta(days=days))
+                setattr(
+                    outcome,
+                    f"rollup_{resolution}_deleted",
+                    getattr(outcome, f"rollup_{resolution}_deleted") + deleted,
+                )
+        return outcome
+
+    # ========================================================
+    # BORRADO POR LOTES
+    # ========================================================
+    def _purge_raw(self, sensor_id: int, cutoff: datetime) -> int:
+        q = (
+            self.db.query(Measurement.id)
+            .filter(Measurement.sensor_id == sensor_id)
+            .filter(Measurement.timestamp < cutoff)
+        )
+        return self._delete_in_batches(Measurement, q)
+
+    def _purge_blocks(self, sensor_id: int, cutoff: datetime) -> int:
+        q = (
+            self.db.query(MeasurementBlock.id)
+            .filter(MeasurementBlock.sensor_id == sensor_id)
+            .filter(MeasurementBlock.block_start <= cutoff - timedelta(hours=1))
+        )
+        return self._delete_in_batches(MeasurementBlock, q)
+
+    def _purge_rollups(self, sensor_id: int, resolution: str, cutoff: datetime) -> int:
+        q = (
+            self.db.query(MeasurementRollup.id)
+            .filter(MeasurementRollup.sensor_id == sensor_id)
+            .filter(MeasurementRollup.resolution == resolution)
+            .filter(MeasurementRollup.bucket_start < cutoff)
+        )
+        return self._delete_in_batches(MeasurementRollup, q)
+
+    def _delete_in_batches(self, model, id_query) -> int:
+        deleted = 0
+        while True:
+            ids = [row_id for (row_id,) in id_query.limit(self.batch_size).all()]
+            if not ids:
+                return deleted
+
+            deleted += (
+                self.db.query(model)
+                .filter(model.id.in_(ids))
+                .delete(synchronize_session=False)
+            )
+            self.db.commit()
+
+            if len(ids) < self.batch_size:
+                return deleted
+            if self.pause_ms:
+                time.sleep(self.pause_ms / 1000)
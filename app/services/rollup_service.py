@@ -0,0 +1,289 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.measurement import Measurement
+from app.models.measurement_rollup import MeasurementRollup
+from app.schemas.measurement_rollup import MeasurementRollupRebuildResult
+from app.services.retention_service import RetentionService
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = ("1m", "1h", "1d")
+
+BUCKET_SIZE = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+_table = MeasurementRollup.__table__
+
+BucketKey = Tuple[int, str, datetime]
+
+
+def bucket_start(ts: datetime, resolution: str) -> datetime:
+    """Inicio del intervalo de `resolution` que contiene ts."""
+    if resolution == "1m":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def aggregate(rows: Iterable[Dict[str, Any]]) -> Dict[BucketKey, Dict[str, Any]]:
+    """
+    Agrega filas (sensor_id, timestamp, value) en memoria por sensor,
+    resolución e intervalo. El resultado tiene las columnas de
+    measurement_rollups y sirve tanto para sumar (upsert) como para
+    reemplazar intervalos (reconstrucción).
+    """
+    out: Dict[BucketKey, Dict[str, Any]] = {}
+    for row in rows:
+        sensor_id, ts, value = row["sensor_id"], row["timestamp"], row["value"]
+        for resolution in RESOLUTIONS:
+            start = bucket_start(ts, resolution)
+            acc = out.get((sensor_id, resolution, start))
+            if acc is None:
+                out[(sensor_id, resolution, start)] = {
+                    "sensor_id": sensor_id,
+                    "resolution": resolution,
+                    "bucket_start": start,
+                    "samples": 1,
+                    "value_sum": value,
+                    "value_sum_sq": value * value,
+                    "value_min": value,
+                    "value_max": value,
+                    "value_first": value,
+                    "first_at": ts,
+                    "value_last": value,
+                    "last_at": ts,
+                }
+                continue
+
+            acc["samples"] += 1
+            acc["value_sum"] += value
+            acc["value_sum_sq"] += value * value
+            if value < acc["value_min"]:
+                acc["value_min"] = value
+            if value > acc["value_max"]:
+                acc["value_max"] = value
+            if ts < acc["first_at"]:
+                acc["value_first"], acc["first_at"] = value, ts
+            if ts >= acc["last_at"]:
+                acc["value_last"], acc["last_at"] = value, ts
+    return out
+
+
+class RollupService:
+    """
+    Mantenimiento y consulta de measurement_rollups (1m / 1h / 1d).
+
+    - apply(): suma un lote de mediciones nuevas con un único upsert
+      (ON DUPLICATE KEY UPDATE / ON CONFLICT). Los datos fuera de orden
+      son correctos: first/last se comparan por timestamp.
+    - rebuild(): recalcula desde measurements los días UTC de un rango,
+      para ediciones, borrados o un backfill del histórico.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ========================================================
+    # MANTENIMIENTO INCREMENTAL
+    # ========================================================
+    def apply(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Suma filas recién insertadas a sus intervalos. No hace commit."""
+        partials = list(aggregate(rows).values())
+        if partials:
+            self._upsert(partials)
+        return len(partials)
+
+    def _upsert(self, partials: List[Dict[str, Any]]) -> None:
+        dialect = self.db.get_bind().dialect.name
+        c = _table.c
+
+        if dialect == "mysql":
+            stmt = mysql.insert(_table)
+            new = stmt.inserted
+            least, greatest = func.least, func.greatest
+        elif dialect in ("sqlite", "postgresql"):
+            stmt = (sqlite if dialect == "sqlite" else postgresql).insert(_table)
+            new = stmt.excluded
+            # En SQLite min()/max() con dos argumentos son escalares
+            least = func.min if dialect == "sqlite" else func.least
+            greatest = func.max if dialect == "sqlite" else func.greatest
+        else:
+            # Sin upsert nativo: se recalculan los días afectados
+            for sensor_id, days in _days_by_sensor(partials).items():
+                for day in days:
+                    self._rebuild_day([sensor_id], day)
+            return
+
+        # MySQL aplica las asignaciones en orden y cada una ve el valor ya
+        # actualizado: value_first/value_last van antes que first_at/last_at.
+        updates = [
+            ("samples", c.samples + new.samples),
+            ("value_sum", c.value_sum + new.value_sum),
+            ("value_sum_sq", c.value_sum_sq + new.value_sum_sq),
+            ("value_min", least(c.value_min, new.value_min)),
+            ("value_max", greatest(c.value_max, new.value_max)),
+            ("value_first", case((new.first_at < c.first_at, new.value_first), else_=c.value_first)),
+            ("first_at", least(c.first_at, new.first_at)),
+            ("value_last", case((new.last_at >= c.last_at, new.value_last), else_=c.value_last)),
+            ("last_at", greatest(c.last_at, new.last_at)),
+            ("updated_at", func.now()),
+        ]
+
+        if dialect == "mysql":
+            stmt = stmt.on_duplicate_key_update(updates)
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[c.sensor_id, c.resolution, c.bucket_start],
+                set_=dict(updates),
+            )
+        self.db.execute(stmt, partials)
+
+    # ========================================================
+    # RECONSTRUCCIÓN
+    # ========================================================
+    def rebuild(
+        self,
+        start: datetime,
+        end: datetime,
+        sensor_id: Optional[int] = None,
+        commit: bool = True,
+    ) -> MeasurementRollupRebuildResult:
+        """
+        Recalcula los intervalos de [start, end), ampliado a días UTC
+        completos para que 1m, 1h y 1d queden coherentes. Con commit=True
+        confirma día a día para no mantener transacciones largas.
+
+        Los días que empiezan antes del corte de retención de las
+        mediciones crudas (RetentionService.raw_cutoffs) se saltan: sus
+        mediciones pueden estar borradas del todo o en parte, y
+        recalcularlos borraría los únicos agregados que quedan. Sin
+        sensor_id el corte es el de cada sensor, y skipped_days cuenta
+        los días en que se saltó alguno.
+        """
+        day = bucket_start(start, "1d")
+        end = bucket_start(end - timedelta(microseconds=1), "1d") + BUCKET_SIZE["1d"]
+        result = MeasurementRollupRebuildResult(
+            sensor_id=sensor_id,
+            start=day,
+            end=end,
+            measurements=0,
+            buckets={resolution: 0 for resolution in RESOLUTIONS},
+        )
+
+        retention = RetentionService(self.db)
+        cutoffs = retention.raw_cutoffs(None if sensor_id is None else [sensor_id])
+        while day < end:
+            eligible = [s for s, cutoff in cutoffs.items() if cutoff is None or day >= cutoff]
+            if len(eligible) < len(cutoffs):
+                result.skipped_days += 1
+            if eligible:
+                # Todos los sensores: un único recorrido del día, sin filtro
+                sensor_ids = None if sensor_id is None and len(eligible) == len(cutoffs) else eligible
+                measurements, partials = self._rebuild_day(sensor_ids, day)
+                result.measurements += measurements
+                for partial in partials:
+                    result.buckets[partial["resolution"]] += 1
+                if commit:
+                    self.db.commit()
+            day += BUCKET_SIZE["1d"]
+
+        if result.skipped_days:
+            logger.warning(
+                "rollups sensor %s: %s días anteriores al corte de retención sin recalcular "
+                "(mediciones purgadas)",
+                sensor_id,
+                result.skipped_days,
+            )
+        return result
+
+    def rebuild_at(self, points: Iterable[Tuple[int, datetime]]) -> None:
+        """
+        Recalcula los días que contienen cada (sensor_id, timestamp),
+        salvo los anteriores al corte de retención (ver rebuild). No hace commit.
+        """
+        days = {(sensor_id, bucket_start(ts, "1d")) for sensor_id, ts in points if ts is not None}
+        cutoffs = RetentionService(self.db).raw_cutoffs({sensor_id for sensor_id, _ in days})
+        for sensor_id, day in sorted(days):
+            cutoff = cutoffs.get(sensor_id)
+            if cutoff is not None and day < cutoff:
+                logger.warning(
+                    "rollups sensor %s: día %s anterior al corte de retención, sin recalcular",
+                    sensor_id,
+                    day.date(),
+                )
+                continue
+            self._rebuild_day([sensor_id], day)
+
+    def _rebuild_day(
+        self,
+        sensor_ids: Optional[Sequence[int]],
+        day: datetime,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Recalcula el día para sensor_ids (None: todos los sensores)."""
+        next_day = day + BUCKET_SIZE["1d"]
+
+        delete = (
+            _table.delete()
+            .where(_table.c.bucket_start >= day)
+            .where(_table.c.bucket_start < next_day)
+        )
+        q = (
+            self.db.query(Measurement.sensor_id, Measurement.timestamp, Measurement.value)
+            .filter(Measurement.timestamp >= day)
+            .filter(Measurement.timestamp < next_day)
+        )
+        if sensor_ids is not None:
+            delete = delete.where(_table.c.sensor_id.in_(sensor_ids))
+            q = q.filter(Measurement.sensor_id.in_(sensor_ids))
+
+        self.db.execute(delete)
+        raw = q.all()
+        partials = list(
+            aggregate({"sensor_id": s, "timestamp": ts, "value": v} for s, ts, v in raw).values()
+        )
+        if partials:
+            self.db.execute(insert(_table), partials)
+        return len(raw), partials
+
+    # ========================================================
+    # CONSULTA
+    # ========================================================
+    def query(
+        self,
+        sensor_id: int,
+        resolution: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[MeasurementRollup]:
+        q = (
+            self.db.query(MeasurementRollup)
+            .filter(MeasurementRollup.sensor_id == sensor_id)
+            .filter(MeasurementRollup.resolution == resolution)
+        )
+        if start is not None:
+            q = q.filter(MeasurementRollup.bucket_start >= bucket_start(start, resolution))
+        if end is not None:
+            q = q.filter(MeasurementRollup.bucket_start < end)
+        q = q.order_by(MeasurementRollup.bucket_start.asc())
+        if limit is not None:
+            q = q.limit(limit)
+        return q.all()
+
+
+def _days_by_sensor(partials: Iterable[Dict[str, Any]]) -> Dict[int, set]:
+    days: Dict[int, set] = {}
+    for partial in partials:
+        if partial["resolution"] == "1d":
+            days.setdefault(partial["sensor_id"], set()).add(partial["bucket_start"])
+    return days
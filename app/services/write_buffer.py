@@ -0,0 +1,319 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.measurement import WriteBufferMetrics
+from app.services.measurement_service import MeasurementService
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFullError(Exception):
+    """La cola superó el high-water mark: el cliente debe reintentar."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Buffer de ingesta lleno")
+        self.retry_after = retry_after
+
+
+class MeasurementWriteBuffer:
+    """
+    Buffer write-behind en proceso para mediciones.
+
+    Las filas aceptadas se encolan y un hilo de fondo las escribe en
+    lotes cuando se juntan batch_size filas o cuando la fila más antigua
+    lleva flush_interval_ms esperando. Por encima de high_water_mark
+    submit() lanza BufferFullError para aplicar backpressure.
+    stop() vacía la cola antes de terminar; con timeout, las filas que
+    sigan pendientes al vencer el plazo se registran como descartadas.
+
+    Un lote que falla (base de datos caída, deadlock...) vuelve al frente
+    de la cola y se reintenta hasta max_retries veces con espera
+    exponencial desde retry_backoff_ms; solo entonces sus filas cuentan
+    como fallidas. Las filas de un sensor inexistente no se reintentan.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 500,
+        flush_interval_ms: int = 200,
+        high_water_mark: int = 20000,
+        retry_after_seconds: int = 1,
+        max_retries: int = 8,
+        retry_backoff_ms: int = 500,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.high_water_mark = high_water_mark
+        self.retry_after_seconds = retry_after_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_ms = retry_backoff_ms
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._deadline: Optional[float] = None
+        self._oldest_at: Optional[float] = None
+        # Intentos fallidos del lote del frente y cuándo reintentarlo
+        self._attempts = 0
+        self._retry_at: Optional[float] = None
+
+        # Métricas
+        self._flushes = 0
+        self._rows_flushed = 0
+        self._rows_duplicated = 0
+        self._rows_failed = 0
+        self._rows_rejected = 0
+        self._rows_retried = 0
+        self._last_flush_rows = 0
+        self._last_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+
+    # ========================================================
+    # CICLO DE VIDA
+    # ========================================================
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._deadline = None
+        self._thread = threading.Thread(
+            target=self._run,
+            name="measurement-write-buffer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el hilo tras escribir todo lo que quede en la cola. Con
+        timeout (segundos) no espera más: si el plazo vence durante la
+        espera de un reintento, o antes de sacar el siguiente lote, las
+        filas pendientes se registran y se descartan.
+        """
+        with self._cond:
+            self._stopping = True
+            if timeout is not None:
+                self._deadline = time.monotonic() + timeout
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Un lote en curso: el hilo descarta el resto al terminarlo
+                logger.warning(
+                    "El buffer de mediciones sigue escribiendo tras %ss; quedan %s en cola",
+                    timeout,
+                    len(self._queue),
+                )
+            self._thread = None
+
+    # ========================================================
+    # ENCOLAR
+    # ========================================================
+    def submit(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Encola filas ya validadas (ver MeasurementService.to_row).
+        Devuelve la profundidad de la cola tras encolar.
+        """
+        with self._cond:
+            # Detenido o deteniéndose: mismo trato que una cola llena
+            if self._stopping or not self.running:
+                raise BufferFullError(self.retry_after_seconds)
+
+            if len(self._queue) + len(rows) > self.high_water_mark:
+                self._rows_rejected += len(rows)
+                raise BufferFullError(self.retry_after_seconds)
+
+            if not self._queue:
+                self._oldest_at = time.monotonic()
+            self._queue.extend(rows)
+
+            # Despierta al hilo: lote completo o temporizador por armar
+            self._cond.notify()
+
+            return len(self._queue)
+
+    # ========================================================
+    # HILO DE ESCRITURA
+    # ========================================================
+    def _run(self) -> None:
+        interval = self.flush_interval_ms / 1000.0
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._deadline is not None and time.monotonic() >= self._deadline:
+                        self._abandon()
+                        return
+                    if self._retry_at is not None:
+                        # Lote pendiente de reintento: se respeta la espera
+                        # también al detenerse, salvo que venza el plazo de stop()
+                        remaining = self._retry_at - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        if self._deadline is not None:
+                            remaining = min(remaining, self._deadline - time.monotonic())
+                        self._cond.wait(max(remaining, 0))
+                        continue
+                    if self._stopping or len(self._queue) >= self.batch_size:
+                        break
+                    if self._queue:
+                        remaining = self._oldest_at + interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+
+                if not self._queue:
+                    # Solo se llega aquí vacío si se está deteniendo
+                    return
+
+                size = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(size)]
+                self._oldest_at = time.monotonic() if self._queue else None
+                self._retry_at = None
+
+            if self._write(batch):
+                self._attempts = 0
+            else:
+                self._requeue(batch)
+
+    def _abandon(self) -> None:
+        """Descarta la cola al vencer el plazo de stop(), fila a fila en el log."""
+        if self._queue:
+            logger.error(
+                "Plazo de parada vencido: se descartan %s mediciones sin escribir",
+                len(self._queue),
+            )
+            for row in self._queue:
+                logger.error("Medición descartada: %s", json.dumps(row, default=str))
+        self._rows_failed += len(self._queue)
+        self._queue.clear()
+        self._oldest_at = None
+        self._attempts = 0
+        self._retry_at = None
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        """Devuelve un lote fallido al frente de la cola o lo da por perdido."""
+        with self._cond:
+            self._attempts += 1
+            if self._attempts > self.max_retries:
+                logger.error(
+                    "Descartado lote de %s mediciones tras %s reintentos",
+                    len(batch),
+                    self.max_retries,
+                )
+                self._attempts = 0
+                self._rows_failed += len(batch)
+                return
+
+            # Orden original: el lote se vuelve a sacar entero en el siguiente
+            # ciclo (el siguiente lote tiene como mínimo el mismo tamaño)
+            self._queue.extendleft(reversed(batch))
+            self._oldest_at = time.monotonic()
+            delay_ms = self.retry_backoff_ms * 2 ** (self._attempts - 1)
+            self._retry_at = time.monotonic() + delay_ms / 1000.0
+            self._rows_retried += len(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Escribe un lote. False si ha fallado entero y hay que reintentarlo;
+        las filas de sensores inexistentes se cuentan como fallidas aquí.
+        """
+        started = time.perf_counter()
+        written = 0
+        handled = 0
+        unknown = 0
+
+        db = self.session_factory()
+        try:
+            service = MeasurementService(db)
+            try:
+                written = service.insert_rows(batch)
+                handled = len(batch)
+            except Exception:
+                # Un sensor borrado tras encolar hace fallar el lote entero:
+                # se descartan solo las filas con sensor inexistente.
+                db.rollback()
+                known = service.existing_sensor_ids(r["sensor_id"] for r in batch)
+                valid = [r for r in batch if r["sensor_id"] in known]
+                written = service.insert_rows(valid)
+                handled = len(valid)
+                unknown = len(batch) - len(valid)
+        except Exception:
+            db.rollback()
+            logger.exception(
+                "Error escribiendo lote de %s mediciones (intento %s de %s)",
+                len(batch),
+                self._attempts + 1,
+                self.max_retries + 1,
+            )
+            return False
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._cond:
+            self._flushes += 1
+            self._rows_flushed += written
+            self._rows_duplicated += handled - written
+            self._rows_failed += unknown
+            self._last_flush_rows = written
+            self._last_flush_ms = elapsed_ms
+            self._total_flush_ms += elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        return True
+
+    # ========================================================
+    # MÉTRICAS
+    # ========================================================
+    def metrics(self) -> WriteBufferMetrics:
+        with self._cond:
+            flushes = self._flushes
+            return WriteBufferMetrics(
+                enabled=settings.MEASUREMENTS_WRITE_BEHIND_ENABLED,
+                running=self.running,
+                queue_depth=len(self._queue),
+                high_water_mark=self.high_water_mark,
+                batch_size=self.batch_size,
+                flush_interval_ms=self.flush_interval_ms,
+                flushes=flushes,
+                rows_flushed=self._rows_flushed,
+                rows_duplicated=self._rows_duplicated,
+                rows_failed=self._rows_failed,
+                rows_rejected=self._rows_rejected,
+                rows_retried=self._rows_retried,
+                retry_pending=self._attempts,
+                last_flush_rows=self._last_flush_rows,
+                last_flush_ms=round(self._last_flush_ms, 3),
+                avg_flush_ms=round(self._total_flush_ms / flushes, 3) if flushes else 0.0,
+                max_flush_ms=round(self._max_flush_ms, 3),
+                avg_rows_per_flush=round(self._rows_flushed / flushes, 3) if flushes else 0.0,
+            )
+
+
+# Instancia única del proceso; main.py la arranca y la detiene
+measurement_write_buffer = MeasurementWriteBuffer(
+    batch_size=settings.MEASUREMENTS_WRITE_BEHIND_BATCH_SIZE,
+    flush_interval_ms=settings.MEASUREMENTS_WRITE_BEHIND_FLUSH_MS,
+    high_water_mark=settings.MEASUREMENTS_WRITE_BEHIND_HIGH_WATER_MARK,
+    retry_after_seconds=settings.MEASUREMENTS_WRITE_BEHIND_RETRY_AFTER_SECONDS,
+    max_retries=settings.MEASUREMENTS_WRITE_BEHIND_MAX_RETRIES,
+    retry_backoff_ms=settings.MEASUREMENTS_WRITE_BEHIND_RETRY_BACKOFF_MS,
+)
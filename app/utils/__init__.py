@@ -1,5 +1,16 @@
 from app.utils.hashing import get_password_hash, verify_password
-from app.utils.pagination import paginate, PaginationParams, PaginatedResponse
+from app.utils.pagination import (
+    paginate,
+    PaginationParams,
+    PaginatedResponse,
+    TotalMode,
+    count_total,
+    estimate_count,
+    paginate_keyset,
+    CursorParams,
+    CursorPage,
+    InvalidCursorError,
+)
 
 __all__ = [
     "get_password_hash",
@@ -7,4 +18,11 @@ __all__ = [
     "paginate",
     "PaginationParams",
     "PaginatedResponse",
+    "TotalMode",
+    "count_total",
+    "estimate_count",
+    "paginate_keyset",
+    "CursorParams",
+    "CursorPage",
+    "InvalidCursorError",
 ]
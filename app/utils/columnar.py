@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Sequence
+
+# Formato columnar de las respuestas (?format=columnar): un array por
+# campo en lugar de un objeto por fila, construido directamente desde
+# las tuplas de la base de datos. Los campos de `hoist` que tienen el
+# mismo valor en todas las filas (sensor_id, unit…) salen una sola vez
+# como escalar; si varían, quedan como array igual que el resto.
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def to_columns(
+    rows: Iterable[Sequence[Any]],
+    names: Sequence[str],
+    hoist: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """{campo: [valores]} a partir de tuplas con los campos en el orden de names."""
+    rows = list(rows)
+    hoist = set(hoist)
+    data = list(zip(*rows)) if rows else [() for _ in names]
+
+    out: Dict[str, Any] = {}
+    for name, column in zip(names, data):
+        if name in hoist and len(set(column)) <= 1:
+            out[name] = _json_value(column[0]) if column else None
+        elif isinstance(next((v for v in column if v is not None), None), datetime):
+            out[name] = [value.isoformat() if value is not None else None for value in column]
+        else:
+            out[name] = list(column)
+    return out
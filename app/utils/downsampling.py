@@ -0,0 +1,46 @@
+import numpy as np
+
+# Largest-Triangle-Three-Buckets (Steinarsson, 2013): reduce una serie a
+# n puntos conservando su forma visual. A diferencia de promediar, en
+# cada intervalo se queda con el punto real que forma el triángulo de
+# mayor área con el punto elegido antes y la media del intervalo
+# siguiente, así que los picos sobreviven.
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices (ordenados) de los n_out puntos elegidos de la serie (x, y),
+    con x creciente. El primer y el último punto siempre se conservan.
+    La elección es secuencial por intervalos, pero dentro de cada uno el
+    cálculo de áreas está vectorizado y las medias de todos los
+    intervalos se obtienen de una vez con np.add.reduceat.
+    """
+    n = len(x)
+    if n_out < 3:
+        raise ValueError("LTTB necesita al menos 3 puntos de salida")
+    if n <= n_out:
+        return np.arange(n)
+
+    # Intervalos [edges[j], edges[j + 1]) entre el primer y el último punto
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = np.append(edges[:-1], n - 1)
+    counts = np.diff(np.append(starts, n))
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(y, starts) / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for j in range(n_out - 2):
+        lo, hi = edges[j], edges[j + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[j + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[j + 1] - ay))
+        a = lo + int(area.argmax())
+        out[j + 1] = a
+    return out
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int):
+    """(x, y) reducidos a n_out puntos con LTTB."""
+    idx = lttb_indices(x, y, n_out)
+    return x[idx], y[idx]
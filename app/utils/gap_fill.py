@@ -0,0 +1,65 @@
+import numpy as np
+
+# Relleno de huecos (NaN) en matrices sensor × intervalo, fila a fila y
+# sin bucles en Python: para cada celda se calcula con acumulados el
+# índice del valor conocido anterior y del siguiente.
+#   none    los huecos quedan como NaN
+#   ffill   último valor conocido; los huecos iniciales quedan como NaN
+#   linear  interpolación entre el valor anterior y el siguiente; los
+#           huecos de los extremos quedan como NaN (no se extrapola)
+FILL_MODES = ("none", "ffill", "linear")
+
+
+def _previous_valid(valid: np.ndarray) -> np.ndarray:
+    """Índice de columna del último valor conocido en o antes de cada celda (-1 si no hay)."""
+    cols = np.arange(valid.shape[1])
+    prev = np.where(valid, cols, -1)
+    np.maximum.accumulate(prev, axis=1, out=prev)
+    return prev
+
+
+def _next_valid(valid: np.ndarray) -> np.ndarray:
+    """Índice de columna del siguiente valor conocido en o después de cada celda (n si no hay)."""
+    n = valid.shape[1]
+    nxt = np.where(valid, np.arange(n), n)[:, ::-1]
+    return np.minimum.accumulate(nxt, axis=1)[:, ::-1]
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    if matrix.size == 0:
+        return matrix.copy()
+    prev = _previous_valid(~np.isnan(matrix))
+    rows = np.arange(matrix.shape[0])[:, None]
+    filled = matrix[rows, np.maximum(prev, 0)]
+    return np.where(prev >= 0, filled, np.nan)
+
+
+def linear_fill(matrix: np.ndarray) -> np.ndarray:
+    if matrix.size == 0:
+        return matrix.copy()
+    n = matrix.shape[1]
+    valid = ~np.isnan(matrix)
+    prev = _previous_valid(valid)
+    nxt = _next_valid(valid)
+    inside = (prev >= 0) & (nxt < n)
+
+    rows = np.arange(matrix.shape[0])[:, None]
+    left_i = np.clip(prev, 0, n - 1)
+    right_i = np.clip(nxt, 0, n - 1)
+    left = matrix[rows, left_i]
+    right = matrix[rows, right_i]
+    # En las celdas con valor, prev == nxt: span 1 y el resultado es el propio valor
+    span = np.maximum(right_i - left_i, 1)
+    with np.errstate(invalid="ignore"):
+        interpolated = left + (right - left) * (np.arange(n) - left_i) / span
+    return np.where(inside, interpolated, np.nan)
+
+
+def fill_gaps(matrix: np.ndarray, mode: str) -> np.ndarray:
+    if mode == "none":
+        return matrix
+    if mode == "ffill":
+        return forward_fill(matrix)
+    if mode == "linear":
+        return linear_fill(matrix)
+    raise ValueError(f"Modo de relleno no válido: {mode!r} ({', '.join(FILL_MODES)})")
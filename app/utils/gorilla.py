@@ -0,0 +1,256 @@
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+# Bloque comprimido estilo Gorilla (Facebook, VLDB 2015) para una serie
+# (epoch_ms, value):
+#   cabecera  count u32 | first_ts i64 | first_value f64   (little-endian)
+#   resto     por cada punto siguiente, timestamp y valor a nivel de bit:
+#     timestamp → delta-of-delta (el primer delta se codifica contra 0)
+#       0                       '0'
+#       [-64, 63]               '10'   + 7 bits
+#       [-256, 255]             '110'  + 9 bits
+#       [-2048, 2047]           '1110' + 12 bits
+#       resto                   '1111' + 32 bits
+#     valor → XOR con el anterior
+#       igual                   '0'
+#       cabe en la ventana      '10' + bits significativos
+#       ventana nueva           '11' + 5 bits ceros iniciales
+#                                    + 6 bits (longitud - 1) + bits significativos
+# Los timestamps van en milisegundos: el bloque no guarda microsegundos.
+HEADER_FORMAT = "<Iqd"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+_header = struct.Struct(HEADER_FORMAT)
+_float = struct.Struct("<d")
+_uint = struct.Struct("<Q")
+# Estado del encoder tras el último punto (ver BlockEncoder.state)
+_tail = struct.Struct("<qqQBBB")
+TAIL_SIZE = _tail.size
+
+# (prefijo, bits del prefijo, bits del valor, mínimo, máximo)
+_DOD_BUCKETS = (
+    (0b10, 2, 7, -64, 63),
+    (0b110, 3, 9, -256, 255),
+    (0b1110, 4, 12, -2048, 2047),
+)
+_DOD_FALLBACK_BITS = 32
+
+Point = Tuple[int, float]
+
+
+class CorruptBlockError(ValueError):
+    """El bloque está truncado o no tiene el formato esperado."""
+
+
+def _float_bits(value: float) -> int:
+    return _uint.unpack(_float.pack(value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return _float.unpack(_uint.pack(bits))[0]
+
+
+class BitWriter:
+    def __init__(self):
+        self._out = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        self._acc = (self._acc << bits) | (value & ((1 << bits) - 1))
+        self._bits += bits
+        while self._bits >= 8:
+            self._bits -= 8
+            self._out.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self) -> bytes:
+        if self._bits:
+            return bytes(self._out) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self._out)
+
+
+class BitReader:
+    def __init__(self, data: bytes, offset: int = 0):
+        self._data = memoryview(data)
+        self._pos = offset
+        self._acc = 0
+        self._bits = 0
+
+    def read(self, bits: int) -> int:
+        while self._bits < bits:
+            if self._pos >= len(self._data):
+                raise CorruptBlockError("Bloque truncado")
+            self._acc = (self._acc << 8) | self._data[self._pos]
+            self._pos += 1
+            self._bits += 8
+        self._bits -= bits
+        value = self._acc >> self._bits
+        self._acc &= (1 << self._bits) - 1
+        return value
+
+    def read_signed(self, bits: int) -> int:
+        value = self.read(bits)
+        if value >= 1 << (bits - 1):
+            value -= 1 << bits
+        return value
+
+
+class BlockEncoder:
+    """
+    Codificador incremental de un bloque. state() resume en TAIL_SIZE
+    bytes lo que hace falta para seguir añadiendo puntos (último
+    timestamp, delta y valor, ventana de XOR y bits usados del último
+    byte), así que resume() continúa un bloque sin decodificarlo.
+    """
+
+    def __init__(self):
+        self._writer = BitWriter()
+        self.count = 0
+        self._first_ts = 0
+        self._first_value = 0.0
+        self.last_ts = 0
+        self._delta = 0
+        self._bits = 0
+        # Ventana de bits significativos del último XOR distinto de 0
+        self._leading, self._trailing = 65, 0
+
+    @classmethod
+    def resume(cls, data: bytes, state: bytes) -> "BlockEncoder":
+        """Encoder en el punto en que quedó el bloque `data` con su state()."""
+        encoder = cls()
+        encoder.count, encoder._first_ts, encoder._first_value = _header.unpack_from(data)
+        (
+            encoder.last_ts,
+            encoder._delta,
+            encoder._bits,
+            encoder._leading,
+            encoder._trailing,
+            used,
+        ) = _tail.unpack(state)
+
+        body = data[HEADER_SIZE:]
+        writer = encoder._writer
+        if used:
+            writer._out = bytearray(body[:-1])
+            writer._acc = body[-1] >> (8 - used)
+            writer._bits = used
+        else:
+            writer._out = bytearray(body)
+        return encoder
+
+    def append(self, ts: int, value: float) -> None:
+        """Añade un punto posterior al último."""
+        if self.count == 0:
+            self._first_ts, self._first_value = ts, value
+            self.last_ts, self._bits = ts, _float_bits(value)
+            self.count = 1
+            return
+
+        writer = self._writer
+        delta = ts - self.last_ts
+        dod = delta - self._delta
+        self.last_ts, self._delta = ts, delta
+
+        if dod == 0:
+            writer.write(0, 1)
+        else:
+            for prefix, prefix_bits, width, low, high in _DOD_BUCKETS:
+                if low <= dod <= high:
+                    writer.write(prefix, prefix_bits)
+                    writer.write(dod, width)
+                    break
+            else:
+                writer.write(0b1111, 4)
+                writer.write(dod, _DOD_FALLBACK_BITS)
+
+        bits = _float_bits(value)
+        xor = bits ^ self._bits
+        self._bits = bits
+        self.count += 1
+        if xor == 0:
+            writer.write(0, 1)
+            return
+
+        lead = min(64 - xor.bit_length(), 31)
+        trail = (xor & -xor).bit_length() - 1
+        if self._leading <= lead and self._trailing <= trail:
+            writer.write(0b10, 2)
+            writer.write(xor >> self._trailing, 64 - self._leading - self._trailing)
+        else:
+            self._leading, self._trailing = lead, trail
+            length = 64 - lead - trail
+            writer.write(0b11, 2)
+            writer.write(lead, 5)
+            writer.write(length - 1, 6)
+            writer.write(xor >> trail, length)
+
+    def extend(self, points: Iterable[Point]) -> None:
+        for ts, value in points:
+            self.append(ts, value)
+
+    def getvalue(self) -> bytes:
+        if not self.count:
+            raise ValueError("Un bloque necesita al menos un punto")
+        return _header.pack(self.count, self._first_ts, self._first_value) + self._writer.getvalue()
+
+    def state(self) -> bytes:
+        return _tail.pack(
+            self.last_ts,
+            self._delta,
+            self._bits,
+            self._leading,
+            self._trailing,
+            self._writer._bits,
+        )
+
+
+def encode_block(points: Iterable[Point]) -> bytes:
+    """Comprime puntos (epoch_ms, value) ordenados por timestamp."""
+    encoder = BlockEncoder()
+    encoder.extend(points)
+    return encoder.getvalue()
+
+
+def block_count(data: bytes) -> int:
+    if len(data) < HEADER_SIZE:
+        raise CorruptBlockError("Bloque sin cabecera")
+    return _header.unpack_from(data)[0]
+
+
+def decode_block(data: bytes) -> Iterator[Point]:
+    """Itera los puntos (epoch_ms, value) del bloque sin materializarlos."""
+    count = block_count(data)
+    _, ts, value = _header.unpack_from(data)
+    yield ts, value
+
+    reader = BitReader(data, HEADER_SIZE)
+    delta = 0
+    bits = _float_bits(value)
+    leading = trailing = 0
+
+    for _ in range(count - 1):
+        if reader.read(1) == 0:
+            dod = 0
+        else:
+            # Cada '1' adicional del prefijo pasa al siguiente tramo
+            for bucket in _DOD_BUCKETS:
+                if reader.read(1) == 0:
+                    dod = reader.read_signed(bucket[2])
+                    break
+            else:
+                dod = reader.read_signed(_DOD_FALLBACK_BITS)
+        delta += dod
+        ts += delta
+
+        if reader.read(1) == 1:
+            if reader.read(1) == 1:
+                leading = reader.read(5)
+                trailing = 64 - leading - (reader.read(6) + 1)
+            bits ^= reader.read(64 - leading - trailing) << trailing
+
+        yield ts, _bits_float(bits)
+
+
+def decode_all(data: bytes) -> List[Point]:
+    return list(decode_block(data))
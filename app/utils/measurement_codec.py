@@ -0,0 +1,54 @@
+import math
+import struct
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Tuple
+
+# Formato binario de ingesta para gateways (little-endian, sin padding):
+#   sensor_id u32 | epoch_ms u64 | value f32   → 16 bytes por registro
+# epoch_ms = 0 significa "sin timestamp" (se usa la hora del servidor).
+RECORD_FORMAT = "<IQf"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+MEDIA_TYPE = "application/octet-stream"
+
+_EPOCH = datetime(1970, 1, 1)
+_record = struct.Struct(RECORD_FORMAT)
+
+
+class InvalidPayloadError(ValueError):
+    """El cuerpo no es una secuencia entera de registros."""
+
+
+def record_count(payload: bytes) -> int:
+    if len(payload) % RECORD_SIZE:
+        raise InvalidPayloadError(
+            f"El cuerpo ({len(payload)} bytes) no es múltiplo de {RECORD_SIZE} bytes"
+        )
+    return len(payload) // RECORD_SIZE
+
+
+def decode_records(payload: bytes) -> Iterator[Tuple[int, int, float]]:
+    """
+    Itera (sensor_id, epoch_ms, value) sin copiar el cuerpo:
+    struct.iter_unpack lee directamente sobre un memoryview.
+    """
+    record_count(payload)
+    return _record.iter_unpack(memoryview(payload))
+
+
+def encode_records(records: Iterable[Tuple[int, int, float]]) -> bytes:
+    """Empaqueta registros (sensor_id, epoch_ms, value); útil para gateways y pruebas."""
+    return b"".join(_record.pack(*r) for r in records)
+
+
+def epoch_ms_to_datetime(epoch_ms: int) -> datetime:
+    """epoch en milisegundos → datetime UTC naive (igual que datetime.utcnow())."""
+    return _EPOCH + timedelta(milliseconds=epoch_ms)
+
+
+def datetime_to_epoch_ms(value: datetime) -> int:
+    """datetime UTC naive → epoch en milisegundos (se truncan los microsegundos)."""
+    return (value - _EPOCH) // timedelta(milliseconds=1)
+
+
+def is_valid_value(value: float) -> bool:
+    return not (math.isnan(value) or math.isinf(value))
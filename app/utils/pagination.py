@@ -1,7 +1,11 @@
-from typing import Generic, List, Optional, TypeVar
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, List, Literal, Optional, Sequence, TypeVar
 
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Query
 
 T = TypeVar("T")
@@ -17,43 +21,248 @@ class PaginationParams(BaseModel):
     offset: int = Field(default=0, ge=0)
 
 
+# Cómo se calcula el total de un listado paginado:
+#   exact       COUNT(*) de la consulta sin paginar
+#   estimated   estimación del optimizador (EXPLAIN, que en MySQL sale de
+#               las estadísticas de la tabla) o un contador mantenido
+#               que pase el endpoint; en SQLite se cuenta exacto
+#   none        sin total; has_more se sabe leyendo limit + 1 filas
+TotalMode = Literal["exact", "estimated", "none"]
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """
-    Respuesta estándar paginada.
+    Respuesta estándar paginada. total es None con total_mode "none".
     """
     items: List[T]
-    total: int
+    total: Optional[int] = None
+    total_mode: TotalMode = "exact"
+    has_more: bool = False
     limit: int
     offset: int
 
     model_config = ConfigDict(from_attributes=True)
 
 
+def estimate_count(query: Query) -> Optional[int]:
+    """
+    Filas que el optimizador estima para la consulta, sin ejecutarla.
+    None si el motor no da estimaciones.
+    """
+    bind = query.session.get_bind()
+    dialect = bind.dialect.name
+    if dialect not in ("mysql", "postgresql"):
+        return None
+
+    compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+    params = compiled.params
+    if compiled.positional:
+        # pymysql usa %s: parámetros en el orden en que aparecen
+        params = tuple(params[name] for name in compiled.positiontup)
+    connection = query.session.connection()
+    if dialect == "mysql":
+        # rows sale de las estadísticas de InnoDB; filtered, del % que pasa el WHERE
+        plan = connection.exec_driver_sql("EXPLAIN " + compiled.string, params).mappings().first()
+        if plan is None or plan["rows"] is None:
+            return None
+        return int(plan["rows"] * float(plan.get("filtered") or 100) / 100)
+
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(
+    query: Query,
+    mode: TotalMode,
+    estimate: Optional[Callable[[], Optional[int]]] = None,
+) -> Optional[int]:
+    """
+    Total de la consulta según mode. estimate es un contador mantenido
+    propio del listado; si no se pasa (o devuelve None) se usa
+    estimate_count() y, si el motor no estima, el COUNT exacto.
+    """
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        total = estimate() if estimate is not None else None
+        if total is None:
+            total = estimate_count(query)
+        if total is not None:
+            return total
+    return query.order_by(None).count()  # eliminar ORDER BY para el count
+
+
 def paginate(
     query: Query,
     params: Optional[PaginationParams] = None,
-) -> (List, int):
+    total_mode: TotalMode = "exact",
+    estimate: Optional[Callable[[], Optional[int]]] = None,
+) -> Dict[str, Any]:
     """
     Aplica paginación a un SQLAlchemy Query.
 
-    Retorna:
+    Retorna un dict con la forma de PaginatedResponse:
     - items: lista de filas de la página actual
-    - total: número total de filas sin paginación
+    - total: número total de filas sin paginación, según total_mode
+    - has_more: si hay filas después de esta página
 
     Uso típico:
         params = PaginationParams(limit=10, offset=0)
-        items, total = paginate(db.query(User), params)
+        page = paginate(db.query(User), params, total_mode="estimated")
     """
     if params is None:
         params = PaginationParams()
 
-    total = query.order_by(None).count()  # eliminar ORDER BY para el count
+    total = count_total(query, total_mode, estimate)
 
+    # Una fila de más para saber si hay siguiente página sin contar
     items = (
         query
-        .limit(params.limit)
+        .limit(params.limit + 1)
         .offset(params.offset)
         .all()
     )
 
-    return items, total
+    return {
+        "items": items[: params.limit],
+        "total": total,
+        "total_mode": total_mode,
+        "has_more": len(items) > params.limit,
+        "limit": params.limit,
+        "offset": params.offset,
+    }
+
+
+# -----------------------
+# PAGINACIÓN POR CURSOR (KEYSET)
+# -----------------------
+class InvalidCursorError(ValueError):
+    """Cursor mal formado o de otro listado."""
+
+
+class CursorParams(BaseModel):
+    """
+    Parámetros de paginación por cursor:
+    - ?limit=50 para la primera página
+    - ?limit=50&cursor=<next_cursor> para las siguientes
+    """
+    limit: int = Field(default=50, ge=1)
+    cursor: Optional[str] = None
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Página de un listado paginado por cursor. next_cursor es None en la
+    última página; total es el del listado completo (no lo que queda)
+    y es None con total_mode "none".
+    """
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_mode: TotalMode = "none"
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+def encode_cursor(keys: Sequence[Any], values: Sequence[Any]) -> str:
+    """Cursor opaco con los valores de las claves de orden de la última fila."""
+    payload = {
+        "k": [key.key for key in keys],
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        names, values = payload["k"], payload["v"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Cursor no válido")
+    if names != [key.key for key in keys] or len(values) != len(keys):
+        raise InvalidCursorError("El cursor no corresponde a este listado")
+
+    out = []
+    for key, value in zip(keys, values):
+        if value is not None and key.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Cursor no válido")
+        out.append(value)
+    return out
+
+
+def _after(keys: Sequence[Any], values: Sequence[Any], descending: bool):
+    """
+    Filas posteriores a `values` en el orden de `keys`, como
+    k0 > v0 OR (k0 = v0 AND k1 > v1) OR ..., que los índices sobre
+    las claves resuelven como un rango.
+    """
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        beyond = key < value if descending else key > value
+        clauses.append(and_(*[k == v for k, v in zip(keys[:i], values[:i])], beyond))
+    return or_(*clauses)
+
+
+def paginate_keyset(
+    query: Query,
+    params: CursorParams,
+    keys: Sequence[Any],
+    descending: bool = False,
+    total_mode: TotalMode = "none",
+    estimate: Optional[Callable[[], Optional[int]]] = None,
+) -> Dict[str, Any]:
+    """
+    Aplica paginación por cursor (keyset) a un SQLAlchemy Query.
+
+    keys son las columnas de orden; la última debe ser única (el id)
+    para que el orden sea total. En lugar de OFFSET, cada página filtra
+    a partir de la última fila de la anterior, así que cualquier página
+    cuesta lo mismo que la primera. Se lee una fila de más para saber
+    si hay siguiente página; el total solo se calcula si total_mode lo pide.
+
+    Retorna un dict con la forma de CursorPage:
+    - items: lista de filas de la página actual
+    - next_cursor: cursor de la página siguiente, o None si es la última
+    - total: filas del listado completo según total_mode
+
+    Uso típico:
+        return paginate_keyset(
+            db.query(Alert), params, (Alert.created_at, Alert.id),
+            descending=True, total_mode="estimated",
+        )
+    """
+    total = count_total(query, total_mode, estimate)
+
+    if params.cursor:
+        values = decode_cursor(params.cursor, keys)
+        bounds = list(keys)
+        if query.session.get_bind().dialect.name == "sqlite":
+            # SQLite guarda las fechas como texto y CURRENT_TIMESTAMP (server_default)
+            # no usa el mismo formato que SQLAlchemy: se comparan como número
+            for i, key in enumerate(keys):
+                if key.type.python_type is datetime and values[i] is not None:
+                    bounds[i], values[i] = func.julianday(key), func.julianday(values[i])
+        query = query.filter(_after(bounds, values, descending))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    rows = query.order_by(None).order_by(*order).limit(params.limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        next_cursor = encode_cursor(keys, [getattr(rows[-1], key.key) for key in keys])
+    return {
+        "items": rows,
+        "limit": params.limit,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_mode": total_mode,
+    }
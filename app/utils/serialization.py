@@ -0,0 +1,42 @@
+from typing import Any, Dict, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Query, Session
+
+from app.utils.pagination import CursorPage
+
+# Respuestas JSON de los listados más pesados sin pasar por objetos ORM:
+# se seleccionan solo las columnas del esquema de respuesta, las tuplas
+# se validan como dicts con un TypeAdapter compilado una vez por esquema
+# y el JSON lo genera pydantic-core. FastAPI no vuelve a validar ni a
+# codificar la respuesta (response_model queda solo para OpenAPI).
+
+
+class PageSerializer:
+    """
+    Página CursorPage[schema] desde tuplas de columnas de `model`.
+
+    Los campos del esquema deben ser atributos del modelo con el mismo
+    nombre; los alias del esquema se respetan en el JSON.
+
+        serializer = PageSerializer(AlertModel, AlertSchema)
+        page = paginate_keyset(serializer.query(db), params, keys, ...)
+        return serializer.response(page)
+    """
+
+    def __init__(self, model: Any, schema: Type[BaseModel]):
+        self.names = tuple(schema.model_fields)
+        self.columns = tuple(getattr(model, name) for name in self.names)
+        self._adapter = TypeAdapter(CursorPage[schema])
+
+    def query(self, db: Session) -> Query:
+        return db.query(*self.columns)
+
+    def dump(self, page: Dict[str, Any]) -> bytes:
+        names = self.names
+        page = {**page, "items": [dict(zip(names, row)) for row in page["items"]]}
+        return self._adapter.dump_json(self._adapter.validate_python(page), by_alias=True)
+
+    def response(self, page: Dict[str, Any]) -> Response:
+        return Response(content=self.dump(page), media_type="application/json")
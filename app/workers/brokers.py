@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrokerMessage:
+    # Cuerpo: bytes/str JSON o un dict ya decodificado
+    payload: Any
+    # Hora de publicación (time.time()), para medir el lag del consumidor
+    published_at: float = field(default_factory=time.time)
+    # Identificador propio del broker (offset, delivery tag...) para el ack
+    ack_token: Any = None
+
+
+class Broker(ABC):
+    """
+    Interfaz mínima que consume el worker de ingesta.
+    Una implementación para Kafka, MQTT, Redis Streams, etc. solo tiene
+    que entregar lotes de mensajes y confirmarlos tras escribirlos.
+    """
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def receive(self, max_messages: int, timeout: float) -> List[BrokerMessage]:
+        """
+        Devuelve hasta max_messages mensajes; espera como mucho timeout
+        segundos a que llegue el primero y devuelve [] si no llega nada.
+        """
+
+    async def ack(self, messages: List[BrokerMessage]) -> None:
+        """Confirma mensajes ya escritos (sin efecto si el broker no lo necesita)."""
+
+    async def dead_letter(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Filas que no se pueden escribir nunca (p. ej. un valor que la base
+        de datos rechaza). Por defecto solo se registran; un broker con
+        cola de mensajes muertos puede publicarlas ahí.
+        """
+        for row in rows:
+            logger.error("Medición descartada: %s", json.dumps(row, default=str))
+
+    def lag(self) -> Optional[int]:
+        """Mensajes pendientes de consumir, o None si el broker no lo sabe."""
+        return None
+
+
+class InMemoryBroker(Broker):
+    """
+    Broker en proceso sobre asyncio.Queue: sirve para desarrollo, pruebas
+    y para alimentar el worker desde el mismo proceso sin broker externo.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self._queue: "asyncio.Queue[BrokerMessage]" = asyncio.Queue(maxsize=maxsize)
+
+    async def publish(self, payload: Any) -> None:
+        await self._queue.put(BrokerMessage(payload=payload))
+
+    def publish_nowait(self, payload: Any) -> None:
+        self._queue.put_nowait(BrokerMessage(payload=payload))
+
+    async def receive(self, max_messages: int, timeout: float) -> List[BrokerMessage]:
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        messages = [first]
+        while len(messages) < max_messages and not self._queue.empty():
+            messages.append(self._queue.get_nowait())
+        return messages
+
+    def lag(self) -> Optional[int]:
+        return self._queue.qsize()
+
+
+def get_broker(url: str) -> Broker:
+    """
+    Crea el broker a partir de INGEST_BROKER_URL:
+    - memory://               → InMemoryBroker
+    - paquete.modulo:Clase    → Clase(), para brokers externos
+    """
+    if url.startswith("memory://"):
+        return InMemoryBroker()
+
+    module_path, _, class_name = url.partition(":")
+    if not class_name:
+        raise ValueError(f"Broker no soportado: {url!r}")
+    broker_cls = getattr(importlib.import_module(module_path), class_name)
+    return broker_cls()
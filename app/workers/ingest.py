@@ -0,0 +1,347 @@
+"""
+Worker de ingesta: consume mediciones de un broker, las agrupa en lotes
+y las escribe por la misma ruta que POST /measurements/bulk
+(MeasurementService.insert_rows: INSERT en lote, deduplicación por
+sensor_id + timestamp y evaluación de umbrales/reglas).
+
+    python -m app.workers.ingest                       # broker de INGEST_BROKER_URL
+    python -m app.workers.ingest --demo 10000          # broker en memoria con datos de prueba
+
+Los mensajes se confirman (ack) solo tras escribirse; si la escritura
+falla se reintenta el lote. La entrega es "al menos una vez" y los
+reintentos no duplican filas gracias al índice único de measurements.
+Un lote que falla max_attempts veces por sus datos (no por la conexión)
+se parte en mitades hasta aislar las filas que no se pueden escribir;
+esas van a Broker.dead_letter y el resto se escribe y se confirma.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import signal
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.sensor import Sensor
+from app.schemas.measurement import IngestWorkerMetrics, MeasurementCreate
+from app.services.measurement_service import MeasurementService
+from app.workers.brokers import Broker, BrokerMessage, InMemoryBroker, get_broker
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima entre reintentos de escritura
+_MAX_RETRY_DELAY = 30.0
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Errores de conexión, bloqueo o pool: el lote se reintenta sin límite."""
+    return isinstance(exc, (OperationalError, InterfaceError, PoolTimeoutError)) or bool(
+        getattr(exc, "connection_invalidated", False)
+    )
+
+
+class IngestWorker:
+    """
+    Bucle de consumo: junta hasta batch_size filas o lo que llegue en
+    max_wait_ms desde el primer mensaje, y escribe el lote en un hilo
+    para no bloquear el event loop del broker.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 500,
+        max_wait_ms: int = 200,
+        report_seconds: int = 10,
+        max_attempts: int = 5,
+    ):
+        self.broker = broker
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.report_seconds = report_seconds
+        self.max_attempts = max_attempts
+
+        # Métricas
+        self._started_at = time.monotonic()
+        self._messages = 0
+        self._inserted = 0
+        self._duplicated = 0
+        self._rejected = 0
+        self._batches = 0
+        self._retries = 0
+        self._dead_lettered = 0
+        self._lag_seconds = 0.0
+        self._last_batch_ms = 0.0
+        self._total_batch_ms = 0.0
+        self._report_at = self._started_at
+        self._report_rows = 0
+        self._recent_rows_per_s = 0.0
+
+    # ========================================================
+    # BUCLE PRINCIPAL
+    # ========================================================
+    async def run(self, stop: asyncio.Event, stop_when_drained: bool = False) -> None:
+        await self.broker.connect()
+        try:
+            while not stop.is_set():
+                messages = await self._collect(stop)
+                if messages:
+                    await self.process(messages, stop)
+                elif stop_when_drained and self.broker.lag() == 0:
+                    break
+                self._maybe_report()
+        finally:
+            await self.broker.close()
+            self._report()
+
+    async def _collect(self, stop: asyncio.Event) -> List[BrokerMessage]:
+        loop = asyncio.get_running_loop()
+        wait = self.max_wait_ms / 1000.0
+        deadline: Optional[float] = None
+        batch: List[BrokerMessage] = []
+
+        while len(batch) < self.batch_size and not stop.is_set():
+            timeout = wait if deadline is None else deadline - loop.time()
+            if timeout <= 0:
+                break
+            received = await self.broker.receive(self.batch_size - len(batch), timeout)
+            if not received:
+                break
+            if deadline is None:
+                deadline = loop.time() + wait
+            batch.extend(received)
+
+        return batch
+
+    async def process(self, messages: List[BrokerMessage], stop: Optional[asyncio.Event] = None) -> None:
+        started = time.perf_counter()
+        rows, rejected = self.decode(messages)
+
+        delay = 0.5
+        attempts = 0
+        dead: List[Dict[str, Any]] = []
+        while True:
+            try:
+                inserted, handled = await asyncio.to_thread(self._write, rows)
+                break
+            except Exception as exc:
+                attempts += 1
+                if attempts >= self.max_attempts and not _is_transient(exc):
+                    logger.warning(
+                        "Lote de %s mediciones fallido %s veces; aislando filas", len(rows), attempts
+                    )
+                    try:
+                        inserted, handled, dead = await asyncio.to_thread(self._write_isolating, rows)
+                        break
+                    except Exception:
+                        # Error de conexión a mitad: se vuelve a reintentar el lote
+                        pass
+                logger.exception("Error escribiendo lote de %s mediciones; reintentando", len(rows))
+                self._retries += 1
+                if stop is not None and stop.is_set():
+                    # Sin ack: el broker volverá a entregar el lote
+                    return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RETRY_DELAY)
+
+        if dead:
+            await self.broker.dead_letter(dead)
+        await self.broker.ack(messages)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._messages += len(messages)
+        self._inserted += inserted
+        self._duplicated += handled - inserted
+        self._rejected += rejected + len(rows) - handled - len(dead)
+        self._dead_lettered += len(dead)
+        self._batches += 1
+        self._lag_seconds = max(0.0, time.time() - min(m.published_at for m in messages))
+        self._last_batch_ms = elapsed_ms
+        self._total_batch_ms += elapsed_ms
+        self._report_rows += handled
+
+    # ========================================================
+    # DECODIFICACIÓN Y ESCRITURA
+    # ========================================================
+    @staticmethod
+    def decode(messages: List[BrokerMessage]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Cada mensaje es una medición o una lista de mediciones con el
+        formato de MeasurementCreate. Devuelve (filas válidas, rechazadas).
+        """
+        rows: List[Dict[str, Any]] = []
+        rejected = 0
+
+        for message in messages:
+            payload = message.payload
+            try:
+                if isinstance(payload, (bytes, bytearray, str)):
+                    payload = json.loads(payload)
+            except ValueError:
+                rejected += 1
+                continue
+
+            for item in payload if isinstance(payload, list) else [payload]:
+                try:
+                    rows.append(MeasurementService.to_row(MeasurementCreate.model_validate(item)))
+                except ValidationError:
+                    rejected += 1
+
+        return rows, rejected
+
+    def _write(self, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Devuelve (filas nuevas, filas con sensor existente)."""
+        if not rows:
+            return 0, 0
+
+        db = self.session_factory()
+        try:
+            service = MeasurementService(db)
+            known = service.existing_sensor_ids(r["sensor_id"] for r in rows)
+            valid = [r for r in rows if r["sensor_id"] in known]
+            return service.insert_rows(valid), len(valid)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _write_isolating(self, rows: List[Dict[str, Any]]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """
+        Escribe un lote que falla partiéndolo en mitades hasta aislar las
+        filas que no se pueden escribir. Devuelve (filas nuevas, filas con
+        sensor existente, filas descartadas). Un error transitorio se
+        propaga: lo ya escrito no se duplica al reintentar el lote.
+        """
+        inserted = handled = 0
+        dead: List[Dict[str, Any]] = []
+        pending = [rows]
+        while pending:
+            chunk = pending.pop()
+            try:
+                chunk_inserted, chunk_handled = self._write(chunk)
+            except Exception as exc:
+                if _is_transient(exc):
+                    raise
+                if len(chunk) == 1:
+                    logger.error("Medición imposible de escribir: %s", exc)
+                    dead.extend(chunk)
+                else:
+                    mid = len(chunk) // 2
+                    pending.extend([chunk[mid:], chunk[:mid]])
+                continue
+            inserted += chunk_inserted
+            handled += chunk_handled
+        return inserted, handled, dead
+
+    # ========================================================
+    # MÉTRICAS
+    # ========================================================
+    def metrics(self) -> IngestWorkerMetrics:
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        batches = self._batches
+        return IngestWorkerMetrics(
+            messages_consumed=self._messages,
+            rows_inserted=self._inserted,
+            rows_duplicated=self._duplicated,
+            rows_rejected=self._rejected,
+            batches=batches,
+            write_retries=self._retries,
+            rows_dead_lettered=self._dead_lettered,
+            lag_messages=self.broker.lag(),
+            lag_seconds=round(self._lag_seconds, 3),
+            last_batch_ms=round(self._last_batch_ms, 3),
+            avg_batch_ms=round(self._total_batch_ms / batches, 3) if batches else 0.0,
+            throughput_rows_per_s=round((self._inserted + self._duplicated) / uptime, 1),
+            recent_rows_per_s=round(self._recent_rows_per_s, 1),
+        )
+
+    def _maybe_report(self) -> None:
+        if time.monotonic() - self._report_at >= self.report_seconds:
+            self._report()
+
+    def _report(self) -> None:
+        now = time.monotonic()
+        elapsed = max(now - self._report_at, 1e-9)
+        self._recent_rows_per_s = self._report_rows / elapsed
+        self._report_at = now
+        self._report_rows = 0
+        logger.info("ingest-worker %s", self.metrics().model_dump_json())
+
+
+# ========================================================
+# ENTRADA: python -m app.workers.ingest
+# ========================================================
+def _publish_demo(broker: InMemoryBroker, count: int) -> None:
+    """Carga el broker en memoria con lecturas sintéticas de los sensores existentes."""
+    db = SessionLocal()
+    try:
+        sensor_ids = [sensor_id for (sensor_id,) in db.query(Sensor.id).all()]
+    finally:
+        db.close()
+    if not sensor_ids:
+        raise SystemExit("No hay sensores para generar mediciones de prueba")
+
+    base_ms = int(time.time() * 1000)
+    for i in range(count):
+        broker.publish_nowait(
+            json.dumps({
+                "sensor_id": sensor_ids[i % len(sensor_ids)],
+                "value": round(random.uniform(10, 35), 2),
+                "timestamp": base_ms / 1000.0 + i // len(sensor_ids),
+            })
+        )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    broker = InMemoryBroker() if args.demo else get_broker(args.broker)
+    worker = IngestWorker(
+        broker,
+        batch_size=args.batch_size,
+        max_wait_ms=args.max_wait_ms,
+        report_seconds=args.report_seconds,
+        max_attempts=args.max_attempts,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if args.demo:
+        _publish_demo(broker, args.demo)
+
+    await worker.run(stop, stop_when_drained=bool(args.demo))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Worker de ingesta de mediciones desde broker")
+    parser.add_argument("--broker", default=settings.INGEST_BROKER_URL)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_WORKER_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=int, default=settings.INGEST_WORKER_MAX_WAIT_MS)
+    parser.add_argument("--report-seconds", type=int, default=settings.INGEST_WORKER_REPORT_SECONDS)
+    parser.add_argument("--max-attempts", type=int, default=settings.INGEST_WORKER_MAX_ATTEMPTS)
+    parser.add_argument(
+        "--demo",
+        type=int,
+        default=0,
+        help="publica N mediciones sintéticas en un broker en memoria y termina al vaciarlo",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
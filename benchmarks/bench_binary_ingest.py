@@ -0,0 +1,108 @@
+"""
+Benchmark: ingesta JSON vs formato binario compacto.
+
+Mide bytes de uplink por registro y CPU de parseo hasta obtener las
+filas que recibe MeasurementService.insert_rows (sin base de datos).
+
+Uso:
+    python -m benchmarks.bench_binary_ingest --records 100000 --repeat 5
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.schemas.measurement import MeasurementCreate
+from app.services.measurement_service import MeasurementService
+from app.utils.measurement_codec import encode_records
+
+
+def build_payloads(records: int, sensors: int):
+    start = datetime(2026, 1, 1)
+    epoch_start = int((start - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+    items = []
+    packed = []
+    for i in range(records):
+        sensor_id = random.randint(1, sensors)
+        value = round(random.uniform(10.0, 35.0), 2)
+        items.append(
+            {
+                "value": value,
+                "unit": "°C",
+                "status": "normal",
+                "sensor_id": sensor_id,
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            }
+        )
+        packed.append((sensor_id, epoch_start + i * 1000, value))
+
+    json_body = json.dumps(items).encode("utf-8")
+    binary_body = encode_records(packed)
+    return json_body, binary_body
+
+
+def parse_json(body: bytes):
+    # Lo que hace POST /measurements/bulk: json → MeasurementCreate → fila
+    return [
+        MeasurementService.to_row(MeasurementCreate.model_validate(item))
+        for item in json.loads(body)
+    ]
+
+
+def parse_binary(body: bytes):
+    rows, _ = MeasurementService.rows_from_binary(body, unit="°C", status="normal")
+    return rows
+
+
+def best_of(fn, body: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(body)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--sensors", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    random.seed(42)
+    json_body, binary_body = build_payloads(args.records, args.sensors)
+
+    results = {}
+    for name, fn, body in (
+        ("json", parse_json, json_body),
+        ("binary", parse_binary, binary_body),
+    ):
+        seconds = best_of(fn, body, args.repeat)
+        results[name] = {
+            "bytes": len(body),
+            "bytes_per_record": round(len(body) / args.records, 2),
+            "parse_seconds": round(seconds, 6),
+            "records_per_second": round(args.records / seconds, 1),
+        }
+
+    report = {
+        "benchmark": "binary_ingest",
+        "records": args.records,
+        "sensors": args.sensors,
+        "results": results,
+        "speedup": round(
+            results["json"]["parse_seconds"] / results["binary"]["parse_seconds"], 2
+        ),
+        "size_ratio": round(results["json"]["bytes"] / results["binary"]["bytes"], 2),
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Benchmark: measurements (una fila por lectura) frente a measurement_blocks
+(un BLOB comprimido por sensor y hora).
+
+Llena measurements con --rows lecturas, las compacta en bloques y mide:
+    footprint   bytes por lectura de cada tabla (tamaño de tabla + índices
+                cuando el motor lo expone; siempre, bytes del BLOB)
+    range       lecturas de una ventana de tiempo de un sensor al azar,
+                en orden cronológico, desde cada almacenamiento
+
+Uso:
+    python -m benchmarks.bench_blocks --rows 1000000 --sensors 100
+    python -m benchmarks.bench_blocks --database-url mysql+pymysql://u:p@localhost/bench_db --rows 10000000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from benchmarks import common
+from benchmarks.bench_query_scaling import fill
+
+
+def table_bytes(db, table: str) -> Optional[int]:
+    """Datos + índices de la tabla, si el motor lo permite."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    from app.db.session import engine
+
+    if engine.dialect.name == "mysql":
+        db.execute(text(f"ANALYZE TABLE {table}"))
+        return db.execute(
+            text(
+                "SELECT DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+            ),
+            {"table": table},
+        ).scalar()
+    if engine.dialect.name == "sqlite":
+        # dbstat solo existe si SQLite se compiló con SQLITE_ENABLE_DBSTAT_VTAB
+        try:
+            return db.execute(
+                text(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = :table "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = :table AND type = 'index')"
+                ),
+                {"table": table},
+            ).scalar()
+        except DBAPIError:
+            db.rollback()
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="por defecto, SQLite temporal")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--window-minutes", type=int, default=24 * 60, help="ventana de la consulta range")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    url = common.configure_database(args.database_url)
+
+    from sqlalchemy import func
+
+    from app.db.session import SessionLocal
+    from app.models.measurement import Measurement
+    from app.models.measurement_block import MeasurementBlock
+    from app.services.block_service import BlockService
+
+    fixture = common.seed(args.sensors, rules=False)
+    sensor_ids = fixture["sensor_ids"]
+    start = datetime(2020, 1, 1)
+    minutes = max(args.rows // len(sensor_ids), 1)
+    end = start + timedelta(minutes=minutes)
+    rng = random.Random(7)
+
+    results: List[Dict[str, Any]] = []
+    db = SessionLocal()
+    try:
+        fill(db, Measurement.__table__, sensor_ids, start, 0, args.rows)
+
+        t0 = time.perf_counter()
+        blocks = BlockService(db).rebuild(start, end)
+        compact_s = time.perf_counter() - t0
+        print(f"compact {args.rows} filas → {blocks} bloques en {compact_s:.1f}s", file=sys.stderr)
+
+        payload = db.query(func.sum(func.length(MeasurementBlock.data))).scalar() or 0
+        for name, table in (("rows", "measurements"), ("blocks", "measurement_blocks")):
+            size = table_bytes(db, table)
+            entry = {
+                "storage": name,
+                "metric": "footprint",
+                "table_bytes": size,
+                "bytes_per_reading": round(size / args.rows, 2) if size else None,
+            }
+            if name == "blocks":
+                entry["blocks"] = blocks
+                entry["payload_bytes"] = payload
+                entry["payload_bytes_per_reading"] = round(payload / args.rows, 2)
+                entry["compact_seconds"] = round(compact_s, 2)
+            results.append(entry)
+
+        def rows_range(sensor_id: int, since: datetime):
+            return (
+                db.query(Measurement.timestamp, Measurement.value)
+                .filter(Measurement.sensor_id == sensor_id)
+                .filter(Measurement.timestamp >= since)
+                .filter(Measurement.timestamp < since + timedelta(minutes=args.window_minutes))
+                .order_by(Measurement.timestamp.asc())
+                .all()
+            )
+
+        def blocks_range(sensor_id: int, since: datetime):
+            return list(
+                BlockService(db).points(
+                    sensor_id, since, since + timedelta(minutes=args.window_minutes)
+                )
+            )
+
+        windows = [
+            (rng.choice(sensor_ids), start + timedelta(minutes=rng.randrange(minutes)))
+            for _ in range(args.queries)
+        ]
+        for name, run in (("rows", rows_range), ("blocks", blocks_range)):
+            recorder = common.LatencyRecorder()
+            returned = 0
+            for sensor_id, since in windows:
+                returned += len(recorder.time(run, sensor_id, since))
+                db.expunge_all()
+            entry = {"storage": name, "metric": "range"}
+            entry.update(recorder.summary(returned))
+            results.append(entry)
+            print(
+                f"range  {name:6s} p50={entry['p50_ms']}ms p99={entry['p99_ms']}ms",
+                file=sys.stderr,
+            )
+    finally:
+        db.close()
+
+    params = {
+        "database_url": url.split("@")[-1],
+        "rows": args.rows,
+        "sensors": args.sensors,
+        "window_minutes": args.window_minutes,
+        "queries": args.queries,
+    }
+    common.emit("blocks", params, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
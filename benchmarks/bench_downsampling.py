@@ -0,0 +1,100 @@
+"""
+Benchmark: reducción LTTB de series largas para gráficas.
+
+Mide por separado, para una serie de --points lecturas de un sensor:
+    lttb       solo el algoritmo (NumPy) sobre arrays ya en memoria
+    fetch      lectura de la serie desde la base de datos a arrays
+    endpoint   GET /sensors/{id}/measurements?max_points=N completo
+El objetivo es que lttb quede muy por debajo de 100 ms con 1M puntos;
+fetch depende sobre todo del driver y del motor.
+
+Uso:
+    python -m benchmarks.bench_downsampling --points 1000000 --max-points 1000
+    python -m benchmarks.bench_downsampling --database-url mysql+pymysql://u:p@localhost/bench_db
+"""
+import argparse
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks import common
+from benchmarks.bench_query_scaling import fill
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="por defecto, SQLite temporal")
+    parser.add_argument("--points", type=int, default=1000000)
+    parser.add_argument("--max-points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-endpoint", action="store_true", help="no medir la petición HTTP completa")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    url = common.configure_database(args.database_url)
+
+    import numpy as np
+
+    from app.db.session import SessionLocal
+    from app.models.measurement import Measurement
+    from app.services.downsampling_service import DownsamplingService
+    from app.utils.downsampling import lttb_indices
+
+    fixture = common.seed(1, rules=False)
+    sensor_id = fixture["sensor_ids"][0]
+
+    results: List[Dict[str, Any]] = []
+
+    # Solo el algoritmo, con un pico que el promedio ocultaría
+    rng = np.random.default_rng(42)
+    x = np.arange(args.points, dtype=np.float64) * 60.0
+    y = np.cumsum(rng.normal(size=args.points))
+    spike = args.points // 3
+    y[spike] += 1000.0
+    recorder = common.LatencyRecorder()
+    for _ in range(args.repeat):
+        idx = recorder.time(lttb_indices, x, y, args.max_points)
+    entry = {"stage": "lttb", "points": args.points, "spike_kept": bool(spike in set(idx.tolist()))}
+    entry.update(recorder.summary(args.points * args.repeat))
+    results.append(entry)
+    print(f"lttb     p50={entry['p50_ms']}ms", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        fill(db, Measurement.__table__, [sensor_id], datetime(2020, 1, 1), 0, args.points)
+
+        service = DownsamplingService(db)
+        recorder = common.LatencyRecorder()
+        for _ in range(args.repeat):
+            recorder.time(service.series, sensor_id)
+        entry = {"stage": "fetch", "points": args.points}
+        entry.update(recorder.summary(args.points * args.repeat))
+        results.append(entry)
+        print(f"fetch    p50={entry['p50_ms']}ms", file=sys.stderr)
+    finally:
+        db.close()
+
+    if not args.skip_endpoint:
+        client = common.make_client()
+        path = f"/api/v1/sensors/{sensor_id}/measurements"
+        recorder = common.LatencyRecorder()
+        for _ in range(args.repeat):
+            response = recorder.time(client.get, path, params={"max_points": args.max_points})
+            response.raise_for_status()
+        entry = {"stage": "endpoint", "points": args.points, "returned": len(response.json())}
+        entry.update(recorder.summary(args.points * args.repeat))
+        results.append(entry)
+        print(f"endpoint p50={entry['p50_ms']}ms", file=sys.stderr)
+
+    params = {
+        "database_url": url.split("@")[-1],
+        "points": args.points,
+        "max_points": args.max_points,
+        "repeat": args.repeat,
+    }
+    common.emit("downsampling", params, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
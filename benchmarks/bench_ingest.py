@@ -0,0 +1,228 @@
+"""
+Benchmark: throughput de ingesta de mediciones por worker de API.
+
+Escenarios (todos contra la base de datos configurada):
+    single    POST /measurements/              una petición por lectura
+    bulk      POST /measurements/bulk          batch_size lecturas por petición
+    stream    POST /measurements/stream        batch_size líneas NDJSON por petición
+    binary    POST /measurements/binary        batch_size registros por petición
+    device    POST /devices/{id}/readings      un ciclo de gateway (una lectura por sensor)
+    service   MeasurementService.insert_rows   sin HTTP: INSERT + pipeline
+    pipeline  IngestionPipeline.process        solo evaluación de umbrales/reglas
+
+Las peticiones van por TestClient (en proceso): se mide FastAPI +
+validación + base de datos, sin red. Cada escenario reporta rows/s y
+latencia p50/p90/p99 por petición (o por lote en service/pipeline).
+
+Uso:
+    python -m benchmarks.bench_ingest --rows 5000 --sensors 10,100 --batch-sizes 100,1000
+    python -m benchmarks.bench_ingest --database-url mysql+pymysql://u:p@localhost/bench_db
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks import common
+
+SCENARIOS = ("single", "bulk", "stream", "binary", "device", "service", "pipeline")
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+# ========================================================
+# ESCENARIOS HTTP
+# ========================================================
+def run_single(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    recorder = common.LatencyRecorder()
+    for item in factory.items(rows):
+        resp = recorder.time(client.post, "/api/v1/measurements/", json=item)
+        resp.raise_for_status()
+    return recorder.summary(rows)
+
+
+def run_bulk(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    recorder = common.LatencyRecorder()
+    for _ in range(rows // batch_size):
+        resp = recorder.time(client.post, "/api/v1/measurements/bulk", json=factory.items(batch_size))
+        resp.raise_for_status()
+    return recorder.summary(rows // batch_size * batch_size)
+
+
+def run_stream(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    recorder = common.LatencyRecorder()
+    for _ in range(rows // batch_size):
+        body = "\n".join(json.dumps(item) for item in factory.items(batch_size)).encode("utf-8")
+        resp = recorder.time(
+            client.post,
+            "/api/v1/measurements/stream",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        resp.raise_for_status()
+    return recorder.summary(rows // batch_size * batch_size)
+
+
+def run_binary(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    from app.utils.measurement_codec import MEDIA_TYPE, encode_records
+
+    epoch = datetime(1970, 1, 1)
+    recorder = common.LatencyRecorder()
+    for _ in range(rows // batch_size):
+        body = encode_records(
+            (
+                item["sensor_id"],
+                int((datetime.fromisoformat(item["timestamp"]) - epoch).total_seconds() * 1000),
+                item["value"],
+            )
+            for item in factory.items(batch_size)
+        )
+        resp = recorder.time(
+            client.post,
+            "/api/v1/measurements/binary",
+            content=body,
+            headers={"Content-Type": MEDIA_TYPE},
+        )
+        resp.raise_for_status()
+    return recorder.summary(rows // batch_size * batch_size)
+
+
+def run_device(client, factory, rows: int, batch_size: int, device_id: int) -> Dict[str, Any]:
+    sensors = len(factory.sensor_ids)
+    cycles = max(rows // sensors, 1)
+    recorder = common.LatencyRecorder()
+    for _ in range(cycles):
+        resp = recorder.time(client.post, f"/api/v1/devices/{device_id}/readings", json=factory.cycle())
+        resp.raise_for_status()
+    return recorder.summary(cycles * sensors)
+
+
+# ========================================================
+# ESCENARIOS DE SERVICIO (SIN HTTP)
+# ========================================================
+def _rows(factory, count: int) -> List[Dict[str, Any]]:
+    from app.schemas.measurement import MeasurementCreate
+    from app.services.measurement_service import MeasurementService
+
+    return [
+        MeasurementService.to_row(MeasurementCreate.model_validate(item))
+        for item in factory.items(count)
+    ]
+
+
+def run_service(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    from app.db.session import SessionLocal
+    from app.services.measurement_service import MeasurementService
+
+    recorder = common.LatencyRecorder()
+    db = SessionLocal()
+    try:
+        service = MeasurementService(db)
+        for _ in range(rows // batch_size):
+            recorder.time(service.insert_rows, _rows(factory, batch_size))
+    finally:
+        db.close()
+    return recorder.summary(rows // batch_size * batch_size)
+
+
+def run_pipeline(client, factory, rows: int, batch_size: int) -> Dict[str, Any]:
+    from app.db.session import SessionLocal
+    from app.services.ingestion_pipeline import IngestionPipeline, measurements_from_rows
+
+    recorder = common.LatencyRecorder()
+    db = SessionLocal()
+    try:
+        pipeline = IngestionPipeline(db)
+        for _ in range(rows // batch_size):
+            measurements = measurements_from_rows(_rows(factory, batch_size))
+            recorder.time(pipeline.process, measurements)
+            # Solo se mide la evaluación: alertas y logs no se guardan
+            db.rollback()
+    finally:
+        db.close()
+    return recorder.summary(rows // batch_size * batch_size)
+
+
+RUNNERS = {
+    "single": run_single,
+    "bulk": run_bulk,
+    "stream": run_stream,
+    "binary": run_binary,
+    "service": run_service,
+    "pipeline": run_pipeline,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="por defecto, SQLite temporal")
+    parser.add_argument("--rows", type=int, default=5000, help="lecturas por escenario")
+    parser.add_argument(
+        "--single-rows",
+        type=int,
+        default=1000,
+        help="lecturas para el escenario single (una petición por lectura)",
+    )
+    parser.add_argument("--sensors", type=_int_list, default=[30])
+    parser.add_argument("--batch-sizes", type=_int_list, default=[100, 1000])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--no-rules", action="store_true", help="sin umbrales ni reglas")
+    parser.add_argument("--output", default=None, help="guardar también el JSON en un fichero")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"escenarios desconocidos: {sorted(unknown)}")
+
+    url = common.configure_database(args.database_url)
+
+    results = []
+    with common.make_client() as client:
+        for sensors in args.sensors:
+            fixture = common.seed(sensors, rules=not args.no_rules)
+            factory = common.ReadingFactory(fixture["sensor_ids"])
+
+            for scenario in scenarios:
+                if scenario == "single":
+                    runs = [(None, lambda: run_single(client, factory, args.single_rows, 1))]
+                elif scenario == "device":
+                    runs = [(None, lambda: run_device(client, factory, args.rows, sensors, fixture["device_id"]))]
+                else:
+                    runs = [
+                        (bs, lambda bs=bs, fn=RUNNERS[scenario]: fn(client, factory, args.rows, bs))
+                        for bs in args.batch_sizes
+                    ]
+
+                for batch_size, run in runs:
+                    entry = {
+                        "scenario": scenario,
+                        "sensors": sensors,
+                        "batch_size": batch_size if batch_size is not None else (sensors if scenario == "device" else 1),
+                    }
+                    entry.update(run())
+                    results.append(entry)
+                    print(
+                        f"{scenario:9s} sensors={sensors:<5d} batch={entry['batch_size']:<6d} "
+                        f"{entry['rows_per_s']:>10.1f} rows/s  p50={entry['p50_ms']}ms p99={entry['p99_ms']}ms",
+                        file=sys.stderr,
+                    )
+
+    params = {
+        "database_url": url.split("@")[-1],
+        "rows": args.rows,
+        "single_rows": args.single_rows,
+        "sensors": args.sensors,
+        "batch_sizes": args.batch_sizes,
+        "scenarios": scenarios,
+        "rules": not args.no_rules,
+    }
+    common.emit("ingest", params, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Benchmark: latencia de lecturas por sensor al crecer measurements.
+
+Llena la tabla por etapas hasta cada tamaño de --sizes y en cada etapa
+mide las dos consultas calientes sobre un sensor al azar:
+    latest   últimas N lecturas (como GET /sensors/{id}/measurements)
+    range    lecturas de una ventana de tiempo, en orden cronológico
+Con el índice (sensor_id, timestamp) la latencia debe mantenerse plana
+aunque la tabla crezca; el informe incluye el plan de cada consulta.
+
+Uso:
+    python -m benchmarks.bench_query_scaling --sizes 100000,1000000,10000000
+    python -m benchmarks.bench_query_scaling --database-url mysql+pymysql://u:p@localhost/bench_db \\
+        --sizes 1000000,10000000,100000000
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks import common
+
+# Filas por INSERT al llenar la tabla
+FILL_CHUNK = 20000
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def fill(db, table, sensor_ids: List[int], start: datetime, have: int, target: int) -> None:
+    """Añade filas hasta `target`: un sensor tras otro cada minuto."""
+    from sqlalchemy import insert
+
+    stmt = insert(table)
+    sensors = len(sensor_ids)
+    rng = random.Random(have)
+    while have < target:
+        size = min(FILL_CHUNK, target - have)
+        db.execute(
+            stmt,
+            [
+                {
+                    "sensor_id": sensor_ids[i % sensors],
+                    "timestamp": start + timedelta(minutes=i // sensors),
+                    "value": round(rng.uniform(10.0, 35.0), 2),
+                    "unit": "°C",
+                    "status": "normal",
+                }
+                for i in range(have, have + size)
+            ],
+        )
+        db.commit()
+        have += size
+
+
+def query_plan(db, query) -> List[str]:
+    from sqlalchemy import text
+
+    from app.db.session import engine
+
+    sql = str(query.statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    return [" | ".join(str(c) for c in row) for row in db.execute(text(prefix + sql))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="por defecto, SQLite temporal")
+    parser.add_argument("--sizes", type=_int_list, default=[10000, 100000, 1000000])
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=50, help="N de la consulta latest")
+    parser.add_argument("--window-minutes", type=int, default=60, help="ventana de la consulta range")
+    parser.add_argument("--queries", type=int, default=200, help="consultas por etapa")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    url = common.configure_database(args.database_url)
+
+    from app.db.session import SessionLocal
+    from app.models.measurement import Measurement
+
+    fixture = common.seed(args.sensors, rules=False)
+    sensor_ids = fixture["sensor_ids"]
+    start = datetime(2020, 1, 1)
+    rng = random.Random(7)
+
+    def latest(db, sensor_id: int, _: datetime):
+        return (
+            db.query(Measurement)
+            .filter(Measurement.sensor_id == sensor_id)
+            .order_by(Measurement.timestamp.desc())
+            .limit(args.limit)
+        )
+
+    def window(db, sensor_id: int, since: datetime):
+        return (
+            db.query(Measurement)
+            .filter(Measurement.sensor_id == sensor_id)
+            .filter(Measurement.timestamp >= since)
+            .filter(Measurement.timestamp < since + timedelta(minutes=args.window_minutes))
+            .order_by(Measurement.timestamp.asc())
+        )
+
+    results: List[Dict[str, Any]] = []
+    db = SessionLocal()
+    try:
+        have = 0
+        for size in sorted(args.sizes):
+            fill(db, Measurement.__table__, sensor_ids, start, have, size)
+            have = size
+            minutes = max(size // len(sensor_ids), 1)
+
+            for name, build in (("latest", latest), ("range", window)):
+                recorder = common.LatencyRecorder()
+                rows = 0
+                for _ in range(args.queries):
+                    sensor_id = rng.choice(sensor_ids)
+                    since = start + timedelta(minutes=rng.randrange(minutes))
+                    rows += len(recorder.time(build(db, sensor_id, since).all))
+                    db.expunge_all()
+
+                entry = {"query": name, "table_rows": size}
+                entry.update(recorder.summary(rows))
+                entry["plan"] = query_plan(db, build(db, sensor_ids[0], start))
+                results.append(entry)
+                print(
+                    f"{name:6s} rows={size:<11d} p50={entry['p50_ms']}ms p99={entry['p99_ms']}ms",
+                    file=sys.stderr,
+                )
+    finally:
+        db.close()
+
+    params = {
+        "database_url": url.split("@")[-1],
+        "sizes": sorted(args.sizes),
+        "sensors": args.sensors,
+        "limit": args.limit,
+        "window_minutes": args.window_minutes,
+        "queries": args.queries,
+    }
+    common.emit("query_scaling", params, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
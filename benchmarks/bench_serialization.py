@@ -0,0 +1,223 @@
+"""
+Benchmark: serialización de los listados más pesados (antes / después).
+
+Para mediciones, alertas, notificaciones e imágenes, con páginas de
+--limit filas, mide la consulta + la generación del JSON:
+    orm        objetos ORM completos validados con from_attributes contra
+               CursorPage[esquema] y codificados como lo hace FastAPI con
+               response_model (el camino anterior)
+    rows       solo las columnas del esquema, como tuplas, con
+               PageSerializer (TypeAdapter precompilado → JSON)
+    endpoint   GET del listado completo, ya con el camino rápido
+Comprueba además que los dos caminos producen el mismo JSON.
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 20000 --limit 500
+    python -m benchmarks.bench_serialization --database-url mysql+pymysql://u:p@localhost/bench_db
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks import common
+from benchmarks.bench_query_scaling import fill
+
+FILL_CHUNK = 5000
+
+
+def _insert(db, table, rows_for) -> None:
+    from sqlalchemy import insert
+
+    stmt = insert(table)
+    for offset in range(0, len(rows_for), FILL_CHUNK):
+        db.execute(stmt, rows_for[offset : offset + FILL_CHUNK])
+        db.commit()
+
+
+def populate(db, fixture: Dict[str, Any], rows: int) -> int:
+    """Filas de mediciones, alertas, notificaciones e imágenes; devuelve el id de usuario."""
+    from app.models import Alert, Camera, Image, Measurement, Notification, User
+
+    zone_id = fixture["zone_id"]
+    sensor_id = fixture["sensor_ids"][0]
+    start = datetime(2020, 1, 1)
+
+    user = User(full_name="bench", email="bench-serialization@example.com", hashed_password="x")
+    camera = Camera(name="bench", camera_type="rgb", zone_id=zone_id)
+    db.add_all([user, camera])
+    db.commit()
+
+    fill(db, Measurement.__table__, fixture["sensor_ids"], start, 0, rows)
+    _insert(
+        db,
+        Alert.__table__,
+        [
+            {
+                "message": f"Temperatura alta ({i})",
+                "details": "Supera el umbral máximo configurado",
+                "severity": "warning",
+                "zone_id": zone_id,
+                "sensor_id": sensor_id,
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    _insert(
+        db,
+        Notification.__table__,
+        [
+            {
+                "title": "Alerta",
+                "message": f"Temperatura alta ({i})",
+                "notification_type": "alert",
+                "channel": "internal",
+                "user_id": user.id,
+                "zone_id": zone_id,
+                "sensor_id": sensor_id,
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    _insert(
+        db,
+        Image.__table__,
+        [
+            {
+                "file_path": f"/data/images/{i}.jpg",
+                "image_type": "ndvi",
+                "metadata": {"altitude_m": 40, "drone": "bench"},
+                "camera_id": camera.id,
+                "captured_at": start + timedelta(minutes=i),
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    return user.id
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="por defecto, SQLite temporal")
+    parser.add_argument("--rows", type=int, default=20000, help="filas por tabla")
+    parser.add_argument("--limit", type=int, default=500, help="filas por página")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-endpoint", action="store_true", help="no medir la petición HTTP completa")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    url = common.configure_database(args.database_url)
+
+    from types import SimpleNamespace
+
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+
+    from app.api.deps import get_current_active_user
+    from app.db.session import SessionLocal
+    from app.main import create_app
+    from app.models import Alert, Image, Measurement, Notification
+    from app.schemas import Alert as AlertSchema
+    from app.schemas import Image as ImageSchema
+    from app.schemas import Measurement as MeasurementSchema
+    from app.schemas import Notification as NotificationSchema
+    from app.utils.pagination import CursorPage, CursorParams, paginate_keyset
+    from app.utils.serialization import PageSerializer
+
+    fixture = common.seed(1, rules=False)
+    db = SessionLocal()
+    try:
+        user_id = populate(db, fixture, args.rows)
+    finally:
+        db.close()
+
+    # (listado, modelo, esquema, claves de orden, filtro como en el endpoint)
+    cases = [
+        ("measurements", Measurement, MeasurementSchema, (Measurement.timestamp, Measurement.id), None),
+        ("alerts", Alert, AlertSchema, (Alert.created_at, Alert.id), None),
+        (
+            "notifications",
+            Notification,
+            NotificationSchema,
+            (Notification.created_at, Notification.id),
+            Notification.user_id == user_id,
+        ),
+        ("images", Image, ImageSchema, (Image.created_at, Image.id), None),
+    ]
+    params = CursorParams(limit=args.limit)
+
+    def filtered(query, where):
+        return query if where is None else query.filter(where)
+
+    def orm_path(model, schema, keys, where) -> bytes:
+        # Lo que hacía FastAPI con response_model: validar los objetos,
+        # volcarlos a tipos JSON y codificarlos con json.dumps
+        adapter = adapters[schema]
+        session = SessionLocal()
+        try:
+            page = paginate_keyset(filtered(session.query(model), where), params, keys, descending=True)
+            value = adapter.validate_python(page, from_attributes=True)
+            content = adapter.dump_python(value, mode="json", by_alias=True)
+            return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        finally:
+            session.close()
+
+    def rows_path(serializer, keys, where) -> bytes:
+        session = SessionLocal()
+        try:
+            page = paginate_keyset(filtered(serializer.query(session), where), params, keys, descending=True)
+            return serializer.dump(page)
+        finally:
+            session.close()
+
+    adapters = {schema: TypeAdapter(CursorPage[schema]) for _, _, schema, _, _ in cases}
+    results: List[Dict[str, Any]] = []
+    for name, model, schema, keys, where in cases:
+        serializer = PageSerializer(model, schema)
+        same = json.loads(orm_path(model, schema, keys, where)) == json.loads(
+            rows_path(serializer, keys, where)
+        )
+
+        for stage, fn, fn_args in (
+            ("orm", orm_path, (model, schema, keys, where)),
+            ("rows", rows_path, (serializer, keys, where)),
+        ):
+            recorder = common.LatencyRecorder()
+            for _ in range(args.repeat):
+                recorder.time(fn, *fn_args)
+            entry = {"resource": name, "stage": stage, "same_output": same}
+            entry.update(recorder.summary(args.limit * args.repeat))
+            results.append(entry)
+            print(f"{name:<14} {stage:<8} p50={entry['p50_ms']}ms", file=sys.stderr)
+
+    if not args.skip_endpoint:
+        app = create_app()
+        user = SimpleNamespace(id=user_id, is_active=True, is_superuser=True)
+        app.dependency_overrides[get_current_active_user] = lambda: user
+        client = TestClient(app)
+        for name, *_ in cases:
+            recorder = common.LatencyRecorder()
+            for _ in range(args.repeat):
+                response = recorder.time(client.get, f"/api/v1/{name}/", params={"limit": args.limit})
+                response.raise_for_status()
+            entry = {"resource": name, "stage": "endpoint", "returned": len(response.json()["items"])}
+            entry.update(recorder.summary(args.limit * args.repeat))
+            results.append(entry)
+            print(f"{name:<14} endpoint p50={entry['p50_ms']}ms", file=sys.stderr)
+
+    report_params = {
+        "database_url": url.split("@")[-1],
+        "rows": args.rows,
+        "limit": args.limit,
+        "repeat": args.repeat,
+    }
+    common.emit("serialization", report_params, results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
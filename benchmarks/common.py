@@ -0,0 +1,253 @@
+"""
+Utilidades compartidas por los benchmarks que usan base de datos.
+
+configure_database() debe llamarse antes de importar nada de app.*:
+settings lee SQLALCHEMY_DATABASE_URL al importarse y el engine se crea
+con esa URL. Por defecto se usa un SQLite temporal que se recrea en
+cada ejecución; con --database-url se puede apuntar a un MySQL de
+pruebas (solo se añaden filas, no se borra nada).
+"""
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), "agrodrone_bench.db")
+
+
+# ========================================================
+# BASE DE DATOS
+# ========================================================
+def configure_database(url: Optional[str]) -> str:
+    if not url:
+        if os.path.exists(DEFAULT_SQLITE_PATH):
+            os.remove(DEFAULT_SQLITE_PATH)
+        url = f"sqlite:///{DEFAULT_SQLITE_PATH}"
+
+    os.environ["SQLALCHEMY_DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.db import base as models_base
+    from app.db.session import engine
+
+    models_base.Base.metadata.create_all(bind=engine)
+    return url
+
+
+def dialect_name() -> str:
+    from app.db.session import engine
+
+    return engine.dialect.name
+
+
+def make_client():
+    """TestClient sobre la app real; la autenticación se sustituye por un usuario fijo."""
+    from types import SimpleNamespace
+
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_current_active_user
+    from app.main import create_app
+
+    app = create_app()
+    user = SimpleNamespace(id=1, is_active=True, is_superuser=True)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
+
+
+def seed(sensors: int, rules: bool = True) -> Dict[str, Any]:
+    """
+    Crea finca → parcela → zona con `sensors` sensores y un gateway.
+    Con rules=True añade un umbral por sensor y una regla con actuador
+    en la zona, para que el pipeline de evaluación haga trabajo real.
+    """
+    from app.db.session import SessionLocal
+    from app.models import (
+        Actuator,
+        AutomationRule,
+        CultivationZone,
+        Device,
+        Farm,
+        Parcel,
+        RuleActuatorMap,
+        Sensor,
+        ThresholdConfig,
+    )
+
+    db = SessionLocal()
+    try:
+        farm = Farm(name="bench")
+        db.add(farm)
+        db.flush()
+        parcel = Parcel(name="bench", farm_id=farm.id)
+        db.add(parcel)
+        db.flush()
+        zone = CultivationZone(name=f"bench-{sensors}", parcel_id=parcel.id)
+        db.add(zone)
+        db.flush()
+
+        sensor_objs = [
+            Sensor(name=f"s{i}", sensor_type="temp", unit="°C", zone_id=zone.id)
+            for i in range(sensors)
+        ]
+        db.add_all(sensor_objs)
+        db.flush()
+        sensor_ids = [s.id for s in sensor_objs]
+
+        device = Device(name="bench-gw", device_type="gateway", zone_id=zone.id)
+        db.add(device)
+
+        if rules:
+            for sensor_id in sensor_ids:
+                db.add(
+                    ThresholdConfig(
+                        parameter="temp",
+                        min_value=5,
+                        max_value=32,
+                        warn_max=30,
+                        sensor_id=sensor_id,
+                        zone_id=zone.id,
+                    )
+                )
+            actuator = Actuator(name="fan", actuator_type="fan", zone_id=zone.id)
+            db.add(actuator)
+            db.flush()
+            rule = AutomationRule(
+                name="bench-fan",
+                condition=json.dumps({"type": "measurement", "operator": ">", "value": 31}),
+                zone_id=zone.id,
+            )
+            db.add(rule)
+            db.flush()
+            db.add(RuleActuatorMap(rule_id=rule.id, actuator_id=actuator.id, desired_state=True))
+
+        db.commit()
+        return {"zone_id": zone.id, "sensor_ids": sensor_ids, "device_id": device.id}
+    finally:
+        db.close()
+
+
+# ========================================================
+# DATOS
+# ========================================================
+class ReadingFactory:
+    """
+    Genera lecturas con (sensor_id, timestamp) siempre distintos, para
+    que la deduplicación no descarte filas entre escenarios.
+    """
+
+    def __init__(self, sensor_ids: Sequence[int], start: Optional[datetime] = None):
+        self.sensor_ids = list(sensor_ids)
+        self.start = start or datetime(2026, 1, 1)
+        self._tick = 0
+        self._random = random.Random(42)
+
+    def items(self, count: int) -> List[Dict[str, Any]]:
+        out = []
+        for _ in range(count):
+            sensor_id = self.sensor_ids[self._tick % len(self.sensor_ids)]
+            ts = self.start + timedelta(seconds=self._tick // len(self.sensor_ids))
+            self._tick += 1
+            out.append(
+                {
+                    "value": round(self._random.uniform(10.0, 35.0), 2),
+                    "unit": "°C",
+                    "status": "normal",
+                    "sensor_id": sensor_id,
+                    "timestamp": ts.isoformat(),
+                }
+            )
+        return out
+
+    def cycle(self) -> Dict[str, Any]:
+        """Un ciclo de gateway: una lectura por sensor con el mismo timestamp."""
+        ts = self.start + timedelta(seconds=self._tick // len(self.sensor_ids))
+        self._tick += len(self.sensor_ids)
+        return {
+            "timestamp": ts.isoformat(),
+            "readings": [
+                {"sensor_id": sensor_id, "value": round(self._random.uniform(10.0, 35.0), 2)}
+                for sensor_id in self.sensor_ids
+            ],
+        }
+
+
+# ========================================================
+# MEDICIÓN
+# ========================================================
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    low = int(k)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (k - low)
+
+
+def summarize(latencies: Sequence[float], rows: int, seconds: float) -> Dict[str, Any]:
+    """latencias en segundos → rows/s y percentiles en ms."""
+    ordered = sorted(latencies)
+    return {
+        "rows": rows,
+        "requests": len(ordered),
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(rows / seconds, 1) if seconds else 0.0,
+        "requests_per_s": round(len(ordered) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self._started = time.perf_counter()
+
+    def time(self, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.latencies.append(time.perf_counter() - t0)
+        return result
+
+    def summary(self, rows: int) -> Dict[str, Any]:
+        return summarize(self.latencies, rows, time.perf_counter() - self._started)
+
+
+# ========================================================
+# SALIDA
+# ========================================================
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def emit(benchmark: str, params: Dict[str, Any], results: List[Dict[str, Any]], output: Optional[str] = None) -> None:
+    """Escribe el informe JSON en stdout y, opcionalmente, en un fichero."""
+    report = {
+        "benchmark": benchmark,
+        "commit": git_revision(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "database": dialect_name(),
+        "params": params,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    sys.stdout.write(text + "\n")
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
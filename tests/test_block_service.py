@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from app.services.block_service import build_block, points_by_ms
+from app.utils.gorilla import decode_all
+from app.utils.measurement_codec import datetime_to_epoch_ms
+
+HOUR = datetime(2026, 1, 1, 12)
+
+
+def test_points_keep_millisecond_resolution():
+    readings = [(HOUR.replace(second=s, microsecond=250_000), float(s)) for s in range(10)]
+    points = points_by_ms(readings)
+    assert sorted(points.items()) == [(datetime_to_epoch_ms(ts), v) for ts, v in readings]
+
+
+def test_same_millisecond_collapses_to_latest_timestamp():
+    # measurements guarda las tres (microsegundos distintos); el bloque, un punto
+    readings = [
+        (HOUR.replace(microsecond=1_900), 3.0),
+        (HOUR.replace(microsecond=1_100), 1.0),
+        (HOUR.replace(microsecond=1_500), 2.0),
+        (HOUR.replace(microsecond=2_000), 4.0),
+    ]
+    points = points_by_ms(readings)
+    epoch_ms = datetime_to_epoch_ms(HOUR)
+    assert points == {epoch_ms + 1: 3.0, epoch_ms + 2: 4.0}
+
+    block = build_block(1, HOUR, points)
+    assert block["samples"] == 2
+    assert decode_all(block["data"]) == [(epoch_ms + 1, 3.0), (epoch_ms + 2, 4.0)]
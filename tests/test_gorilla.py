@@ -0,0 +1,79 @@
+import math
+import random
+import struct
+
+import pytest
+
+from app.utils.gorilla import (
+    BlockEncoder,
+    CorruptBlockError,
+    decode_all,
+    encode_block,
+)
+
+BASE_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def _random_walk(count, step_ms=1000, jitter_ms=0, seed=0):
+    rng = random.Random(seed)
+    points, ts, value = [], BASE_MS, 20.0
+    for _ in range(count):
+        points.append((ts, value))
+        ts += step_ms + rng.randint(-jitter_ms, jitter_ms)
+        value = round(value + rng.uniform(-0.5, 0.5), 2)
+    return points
+
+
+def test_round_trip_regular_series():
+    points = _random_walk(3600)
+    assert decode_all(encode_block(points)) == points
+
+
+def test_round_trip_single_point():
+    assert decode_all(encode_block([(BASE_MS, 12.5)])) == [(BASE_MS, 12.5)]
+
+
+def test_round_trip_every_delta_of_delta_bucket():
+    # Saltos que caen en cada tramo de delta-of-delta, incluidos los límites
+    offsets = [0, 1000, 2000, 2063, 2000, 2255, 1700, 3747, 1700, 100_000, 100_001, 5]
+    points, ts = [], BASE_MS
+    for i, offset in enumerate(offsets):
+        ts += offset
+        points.append((ts, float(i)))
+    assert decode_all(encode_block(points)) == points
+
+
+def test_round_trip_special_values():
+    values = [0.0, -0.0, 1e-300, -1e300, math.inf, -math.inf, 1.5, 1.5, 2.0 ** 53, -7.25, math.nan]
+    points = [(BASE_MS + i * 1000, v) for i, v in enumerate(values)]
+    decoded = decode_all(encode_block(points))
+    assert [ts for ts, _ in decoded] == [ts for ts, _ in points]
+    # Bit a bit: distingue 0.0 de -0.0 y compara NaN
+    assert [struct.pack("<d", v) for _, v in decoded] == [struct.pack("<d", v) for v in values]
+
+
+@pytest.mark.parametrize("split", [1, 2, 7, 8, 1799, 3599])
+def test_resumed_encoder_matches_single_pass(split):
+    points = _random_walk(3600, jitter_ms=40, seed=split)
+
+    encoder = BlockEncoder()
+    encoder.extend(points[:split])
+    resumed = BlockEncoder.resume(encoder.getvalue(), encoder.state())
+    resumed.extend(points[split:])
+
+    assert resumed.getvalue() == encode_block(points)
+    assert resumed.count == len(points)
+    assert decode_all(resumed.getvalue()) == points
+
+
+def test_empty_block_is_rejected():
+    with pytest.raises(ValueError):
+        encode_block([])
+
+
+def test_truncated_block_is_detected():
+    data = encode_block(_random_walk(100))
+    with pytest.raises(CorruptBlockError):
+        decode_all(data[:-8])
+    with pytest.raises(CorruptBlockError):
+        decode_all(data[:5])